@@ -0,0 +1,321 @@
+# backend/benchmarks/load_benchmark.py
+#
+# Teste de carga da API, em processo e sem rede.
+#
+# A aplicação roda no próprio processo (httpx + ASGI, com o lifespan real) usando:
+#   - a fonte de dados "replay" (fixtures em disco, ver src/tools/market_data_providers.py);
+#   - o stub de IA (respostas sintéticas com latência configurável, ver src/tools/llm_stub.py);
+#   - um cache OHLCV novo, em um diretório temporário.
+#
+# Para cada cenário (/data, /info, /analyze) mede a vazão (requisições/s), as latências p50/p99 e a
+# memória por requisição (pico alocado e memória retida, via tracemalloc, em uma amostra sequencial).
+#
+# Uso (a partir de backend/):
+#   python benchmarks/load_benchmark.py                              # fixtures sintéticas
+#   python benchmarks/load_benchmark.py --fixtures benchmarks/fixtures --requests 500 --concurrency 32
+#   python benchmarks/load_benchmark.py --llm-latency 0.5 --llm-jitter 0.2 --no-ai-cache
+#   python benchmarks/load_benchmark.py --max-p99-ms data=50,info=20 --json
+#
+# Sem fixtures gravadas (benchmarks/record_fixtures.py), são geradas séries sintéticas em um diretório
+# temporário. Com limites informados, o script termina com código 1 se algum for ultrapassado (útil no CI).
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURES_DIR = os.path.join(BACKEND_DIR, "benchmarks", "fixtures")
+DEFAULT_TICKERS = ("AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "JPM", "V", "BTC-USD", "ETH-USD")
+SCENARIOS = ("data", "info", "analyze")
+
+
+def generate_fixtures(fixtures_dir: str, tickers: list[str], seed: int = 7) -> None:
+    """
+    Grava fixtures sintéticas (passeio aleatório): 5 anos de barras diárias e 60 dias de barras de 5 minutos
+    por ticker (cripto negocia todos os dias, 24h), mais o .info e duas notícias de cada um.
+    """
+    import numpy as np
+    import pandas as pd
+    from src.tools.market_data_providers import fixture_path
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now(tz="America/New_York").normalize().tz_localize(None)
+
+    for ticker in tickers:
+        crypto = ticker.endswith("-USD")
+        tz = "UTC" if crypto else "America/New_York"
+        daily = (pd.date_range(end=today, periods=5 * 365, freq="D") if crypto
+                 else pd.bdate_range(end=today, periods=5 * 252)).tz_localize(tz)
+        sessions = pd.date_range(end=today, periods=60, freq="D") if crypto else pd.bdate_range(end=today, periods=42)
+        minutes = range(0, 24 * 60, 5) if crypto else range(9 * 60 + 30, 16 * 60, 5)
+        intraday = pd.DatetimeIndex([s + pd.Timedelta(minutes=m) for s in sessions for m in minutes]).tz_localize(tz)
+
+        for interval, index, scale in (("1d", daily, 0.02), ("5m", intraday, 0.002)):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, scale, len(index))))
+            spread = np.abs(rng.normal(0, scale / 2, len(index))) * close
+            bars = pd.DataFrame({
+                "Open": close * (1 + rng.normal(0, scale / 4, len(index))),
+                "High": close + spread,
+                "Low": close - spread,
+                "Close": close,
+                "Volume": rng.integers(1_000, 1_000_000, len(index)).astype(float),
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            }, index=index.rename("Date" if interval == "1d" else "Datetime"))
+            bars["High"] = bars[["Open", "High", "Close"]].max(axis=1)
+            bars["Low"] = bars[["Open", "Low", "Close"]].min(axis=1)
+            bars.to_parquet(fixture_path(fixtures_dir, ticker, interval))
+
+        info = {"symbol": ticker, "shortName": f"{ticker} Inc.", "longName": f"{ticker} Incorporated",
+                "sector": "Technology", "industry": "Software", "fullTimeEmployees": 1000,
+                "website": "https://example.com", "marketCap": 1_000_000_000, "country": "United States",
+                "regularMarketPrice": float(close[-1])}
+        with open(fixture_path(fixtures_dir, ticker), "w", encoding="utf-8") as f:
+            json.dump(info, f)
+
+        published = pd.Timestamp.now(tz="UTC").floor("h")
+        news = [
+            {"id": f"{ticker}-{i}", "content": {
+                "title": f"{ticker}: notícia sintética {i + 1}",
+                "summary": "Texto de teste gerado pelo benchmark.",
+                "pubDate": (published - pd.Timedelta(hours=6 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "provider": {"displayName": "Fixture"},
+                "canonicalUrl": {"url": f"https://example.com/{ticker.lower()}/{i}"},
+            }}
+            for i in range(2)
+        ]
+        with open(fixture_path(fixtures_dir, ticker, kind="news"), "w", encoding="utf-8") as f:
+            json.dump(news, f)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo (q entre 0 e 100) de uma lista já ordenada.
+    """
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _request(client, scenario: str, ticker: str, args):
+    if scenario == "data":
+        return client.get(f"/api/v1/stocks/data/{ticker}", params={"period": args.period, "interval": args.interval})
+    if scenario == "info":
+        return client.get(f"/api/v1/stocks/info/{ticker}")
+    return client.post(f"/api/v1/stocks/analyze/{ticker}", json={"model_id": args.model_id, "mode": args.analysis_mode})
+
+
+async def run_load(client, scenario: str, tickers: list[str], args) -> dict:
+    """
+    Dispara 'requests' requisições com 'concurrency' em paralelo e mede vazão e latências.
+    """
+    latencies, errors = [], 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < args.requests:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await _request(client, scenario, tickers[i % len(tickers)], args)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": args.requests,
+        "errors": errors,
+        "throughput_rps": args.requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+async def run_memory(client, scenario: str, tickers: list[str], args) -> dict:
+    """
+    Memória por requisição em uma amostra sequencial: o pico alocado durante a requisição e o que
+    continua alocado depois dela (ex: entradas de cache), pelo tracemalloc.
+    """
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(args.memory_samples):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await _request(client, scenario, tickers[i % len(tickers)], args)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "memory_peak_kib": statistics.median(peaks) / 1024,
+        "memory_retained_kib": statistics.median(retained) / 1024,
+    }
+
+
+async def run_benchmark(tickers: list[str], args) -> dict:
+    import httpx
+    import main
+
+    results = {}
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            with quiet:
+                for scenario in args.scenarios:
+                    # Aquecimento (não medido): importações, cache OHLCV e times de agentes
+                    for ticker in tickers[:args.warmup]:
+                        await _request(client, scenario, ticker, args)
+                    results[scenario] = await run_load(client, scenario, tickers, args)
+                    results[scenario].update(await run_memory(client, scenario, tickers, args))
+    return results
+
+
+def _parse_limits(value: str | None) -> dict[str, float]:
+    """
+    "data=50,info=20" -> {"data": 50.0, "info": 20.0}
+    """
+    if not value:
+        return {}
+    limits = {}
+    for item in value.split(","):
+        name, _, limit = item.partition("=")
+        if name.strip() not in SCENARIOS or not limit:
+            raise argparse.ArgumentTypeError(f"Limite inválido: {item} (use cenário=valor, ex: data=50)")
+        limits[name.strip()] = float(limit)
+    return limits
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga da API em processo, sem rede.")
+    parser.add_argument("--fixtures", default=None,
+                        help="Diretório das fixtures (padrão: benchmarks/fixtures, ou sintéticas se vazio)")
+    parser.add_argument("--synthetic", action="store_true", help="Usa fixtures sintéticas mesmo com gravadas")
+    parser.add_argument("--tickers", default=",".join(DEFAULT_TICKERS), help="Tickers, separados por vírgula")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Cenários: data, info, analyze")
+    parser.add_argument("--requests", type=int, default=200, help="Requisições por cenário (padrão: 200)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requisições simultâneas (padrão: 16)")
+    parser.add_argument("--warmup", type=int, default=len(DEFAULT_TICKERS),
+                        help="Requisições de aquecimento por cenário, não medidas (padrão: uma por ticker)")
+    parser.add_argument("--memory-samples", type=int, default=20,
+                        help="Requisições sequenciais medidas com tracemalloc (padrão: 20)")
+    parser.add_argument("--period", default="6mo", help="Período pedido em /data (padrão: 6mo)")
+    parser.add_argument("--interval", default="1d", help="Intervalo pedido em /data (padrão: 1d)")
+    parser.add_argument("--model-id", default="llama-3.1-8b-instant", help="Modelo pedido em /analyze")
+    parser.add_argument("--analysis-mode", default="agents", choices=("agents", "context"),
+                        help="Modo da análise em /analyze: time de agentes ou chamada única com contexto")
+    parser.add_argument("--data-latency", type=float, default=0.0,
+                        help="Latência simulada de cada chamada à fonte de dados, em segundos")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Latência do stub de IA, em segundos")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Latência aleatória extra do stub de IA")
+    parser.add_argument("--no-ai-cache", action="store_true",
+                        help="Desativa o cache de análises (toda requisição de /analyze chama o modelo)")
+    parser.add_argument("--max-p99-ms", type=_parse_limits, default={},
+                        help="Falha se o p99 de um cenário passar do limite (ex: data=50,info=20)")
+    parser.add_argument("--min-rps", type=_parse_limits, default={},
+                        help="Falha se a vazão de um cenário ficar abaixo do limite (ex: data=500)")
+    parser.add_argument("--verbose", action="store_true", help="Mostra os logs da aplicação")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(unknown)}")
+
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    workdir = tempfile.TemporaryDirectory(prefix="load_benchmark_")
+
+    fixtures_dir = args.fixtures or DEFAULT_FIXTURES_DIR
+    synthetic = args.synthetic or not os.path.isdir(fixtures_dir) or not os.listdir(fixtures_dir)
+    if synthetic:
+        fixtures_dir = os.path.join(workdir.name, "fixtures")
+
+    # As configurações são lidas na importação da aplicação: precisam estar no ambiente antes dela
+    os.environ.update({
+        "MARKET_DATA_PROVIDER": "replay",
+        "MARKET_DATA_REPLAY_DIR": fixtures_dir,
+        "MARKET_DATA_REPLAY_LATENCY_SECONDS": str(args.data_latency),
+        "AI_PROVIDER": "stub",
+        "AI_STUB_LATENCY_SECONDS": str(args.llm_latency),
+        "AI_STUB_LATENCY_JITTER_SECONDS": str(args.llm_jitter),
+        "AI_CACHE_DIR": "",
+        "OHLCV_CACHE_DIR": os.path.join(workdir.name, "ohlcv"),
+        "SHARED_CACHE_DIR": os.path.join(workdir.name, "shared"),
+        # Os logs da aplicação vão para o stdout por uma thread própria (fora do redirecionamento abaixo)
+        "LOG_LEVEL": "INFO" if args.verbose else "WARNING",
+    })
+    if args.no_ai_cache:
+        os.environ["AI_CACHE_TTL_SECONDS"] = "0"
+
+    if synthetic:
+        generate_fixtures(fixtures_dir, tickers)
+
+    try:
+        results = asyncio.run(run_benchmark(tickers, args))
+    finally:
+        workdir.cleanup()
+
+    result = {
+        "fixtures": "synthetic" if synthetic else fixtures_dir,
+        "tickers": len(tickers),
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+    try:
+        import resource
+        # ru_maxrss é em KiB no Linux e em bytes no macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["max_rss_mib"] = max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        pass  # Windows
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{'cenário':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'máx ms':>10}"
+              f"{'pico KiB':>11}{'retido KiB':>12}{'erros':>7}")
+        for scenario, r in results.items():
+            print(f"{scenario:<10}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+                  f"{r['max_ms']:>10.2f}{r['memory_peak_kib']:>11.1f}{r['memory_retained_kib']:>12.1f}{r['errors']:>7}")
+        if "max_rss_mib" in result:
+            print(f"memória máxima do processo: {result['max_rss_mib']:.1f} MiB")
+
+    failed = False
+    for scenario, limit in args.max_p99_ms.items():
+        if scenario in results and results[scenario]["p99_ms"] > limit:
+            print(f"FALHA: p99 de {scenario} acima de {limit}ms")
+            failed = True
+    for scenario, limit in args.min_rps.items():
+        if scenario in results and results[scenario]["throughput_rps"] < limit:
+            print(f"FALHA: vazão de {scenario} abaixo de {limit} req/s")
+            failed = True
+    for scenario, r in results.items():
+        if r["errors"]:
+            print(f"FALHA: {r['errors']} requisições de {scenario} com erro")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# backend/benchmarks/record_fixtures.py
+#
+# Grava fixtures para a fonte de dados "replay" (ver src/tools/market_data_providers.py) a partir do
+# Yahoo Finance: as barras dos intervalos pedidos, o .info e as notícias (.news) de cada ticker. Precisa de rede só aqui;
+# depois, o benchmark de carga e a API (MARKET_DATA_PROVIDER=replay) rodam offline.
+#
+# Uso (a partir de backend/):
+#   python benchmarks/record_fixtures.py --tickers AAPL,MSFT,BTC-USD
+#   python benchmarks/record_fixtures.py --tickers AAPL --intervals 1d,5m --period 5y --out benchmarks/fixtures
+#
+# Para intervalos intradiários o Yahoo limita o histórico (7 dias para 1m, 60 dias para os demais):
+# o período é reduzido automaticamente nesses casos.
+
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Período máximo aceito pelo Yahoo por intervalo intradiário
+INTRADAY_MAX_PERIOD = {"1m": "7d", "2m": "60d", "5m": "60d", "15m": "60d", "30m": "60d", "90m": "60d",
+                       "60m": "730d", "1h": "730d"}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Grava fixtures do Yahoo Finance para a fonte 'replay'.")
+    parser.add_argument("--tickers", required=True, help="Tickers, separados por vírgula")
+    parser.add_argument("--intervals", default="1d", help="Intervalos, separados por vírgula (padrão: 1d)")
+    parser.add_argument("--period", default="5y", help="Período das barras diárias ou mais longas (padrão: 5y)")
+    parser.add_argument("--out", default=os.path.join(BACKEND_DIR, "benchmarks", "fixtures"),
+                        help="Diretório das fixtures (padrão: benchmarks/fixtures)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from src.tools.market_data_providers import RecordingProvider, YFinanceProvider
+
+    provider = RecordingProvider(YFinanceProvider(), args.out)
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    failed = []
+
+    for interval in [i.strip() for i in args.intervals.split(",") if i.strip()]:
+        period = INTRADAY_MAX_PERIOD.get(interval, args.period)
+        frames = provider.download(tickers, interval, period=period)
+        print(f"{interval} ({period}): {len(frames)} de {len(tickers)} tickers gravados")
+        failed += [f"{t} ({interval})" for t in tickers if t not in frames]
+
+    for ticker in tickers:
+        if not provider.info(ticker):
+            failed.append(f"{ticker} (info)")
+        # Notícias são opcionais (nem todo ticker tem)
+        provider.news(ticker)
+
+    if failed:
+        print(f"Sem dados para: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
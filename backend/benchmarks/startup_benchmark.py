@@ -0,0 +1,144 @@
+# backend/benchmarks/startup_benchmark.py
+#
+# Benchmark do tempo de inicialização da API.
+#
+# Mede, sempre em processos Python novos (sem cache de módulos em memória):
+#   - o tempo de "import main" e quais dependências pesadas ele carrega;
+#   - o tempo entre iniciar o uvicorn e a primeira resposta de "/" e de "/docs".
+#
+# Uso (a partir de backend/):
+#   python benchmarks/startup_benchmark.py --runs 5
+#   python benchmarks/startup_benchmark.py --max-import-seconds 1.0 --max-first-request-seconds 2.0
+#
+# Com os limites informados, o script termina com código 1 se a mediana passar deles (útil no CI).
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependências que não devem ser carregadas pela importação de main.py
+HEAVY_MODULES = ("pandas", "numpy", "yfinance", "pyarrow", "phi", "groq", "duckduckgo_search")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import() -> dict:
+    """
+    Importa main.py em um interpretador novo e devolve o tempo e as dependências pesadas carregadas.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT.format(heavy=HEAVY_MODULES)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    # A última linha da saída é o JSON (avisos da aplicação podem vir antes)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _wait_for(url: str, started: float, timeout: float) -> float:
+    """
+    Consulta a URL até receber HTTP 200 e devolve os segundos desde 'started'.
+    """
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"Sem resposta de {url} após {timeout}s")
+
+
+def measure_first_request(timeout: float) -> dict:
+    """
+    Inicia o uvicorn e mede o tempo até a primeira resposta de "/" e, em seguida, de "/docs".
+    """
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        root = _wait_for(f"http://127.0.0.1:{port}/", started, timeout)
+        docs = _wait_for(f"http://127.0.0.1:{port}/docs", started, timeout)
+        return {"root_seconds": root, "docs_seconds": docs}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def _summary(values: list[float]) -> dict:
+    return {"median": statistics.median(values), "min": min(values), "max": max(values)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização da API.")
+    parser.add_argument("--runs", type=int, default=5, help="Repetições de cada medição (padrão: 5)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Tempo máximo de espera pelo servidor")
+    parser.add_argument("--max-import-seconds", type=float, default=None,
+                        help="Falha se a mediana do 'import main' passar deste valor")
+    parser.add_argument("--max-first-request-seconds", type=float, default=None,
+                        help="Falha se a mediana até a primeira resposta de '/' passar deste valor")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    requests = [measure_first_request(args.timeout) for _ in range(args.runs)]
+
+    result = {
+        "runs": args.runs,
+        "import_seconds": _summary([r["seconds"] for r in imports]),
+        "heavy_modules_on_import": sorted({m for r in imports for m in r["heavy_modules"]}),
+        "first_request_seconds": _summary([r["root_seconds"] for r in requests]),
+        "first_docs_request_seconds": _summary([r["docs_seconds"] for r in requests]),
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"import main:            mediana {result['import_seconds']['median']:.3f}s "
+              f"(min {result['import_seconds']['min']:.3f}s, max {result['import_seconds']['max']:.3f}s)")
+        print(f"primeira resposta '/':  mediana {result['first_request_seconds']['median']:.3f}s")
+        print(f"primeira resposta /docs: mediana {result['first_docs_request_seconds']['median']:.3f}s")
+        print(f"módulos pesados na importação: {', '.join(result['heavy_modules_on_import']) or 'nenhum'}")
+
+    failed = False
+    if args.max_import_seconds is not None and result["import_seconds"]["median"] > args.max_import_seconds:
+        print(f"FALHA: import main acima de {args.max_import_seconds}s")
+        failed = True
+    if (args.max_first_request_seconds is not None
+            and result["first_request_seconds"]["median"] > args.max_first_request_seconds):
+        print(f"FALHA: primeira resposta acima de {args.max_first_request_seconds}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
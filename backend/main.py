@@ -1,8 +1,45 @@
 # backend/main.py
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware # Importa o middleware CORS
 from src.routers import stock_routes # Importa o router de ações
+from src.services import ai_job_queue # Fila de jobs de análise de IA
+from src.services import live_bars_service # Pollers do streaming ao vivo
+from src.services import warmup_scheduler # Aquecimento agendado das watchlists
+from src.utils import process_pool # Pool de processos (backtesting, screener)
+from src.utils.warmup import warm_up # Aquecimento em segundo plano (módulos pesados e agentes de IA)
+from src.utils import metrics # Métricas no formato do Prometheus (/metrics)
+from src.utils.compression import CompressionMiddleware # Compressão brotli/gzip das respostas
+from src.utils.logging_config import configure_logging, shutdown_logging # Logs em fila (texto ou JSON)
+
+# Configura os logs antes de qualquer mensagem da aplicação
+configure_logging()
+
+
+# --- Ciclo de Vida da Aplicação ---
+# Código executado na inicialização (antes do yield) e no encerramento (depois do yield)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sem efeito se os logs já estiverem configurados (reabre a fila após um encerramento anterior)
+    configure_logging()
+    # O aquecimento roda em segundo plano: "/" e "/docs" respondem sem esperar por ele
+    warmup_task = asyncio.create_task(warm_up())
+    # Atualiza as watchlists de WARMUP_TICKERS nos horários de WARMUP_TIMES
+    warmup_scheduler.start()
+    yield
+    warmup_task.cancel()
+    # Encerra o agendador, os workers da fila de jobs de IA, os pollers do streaming ao vivo e o pool de processos
+    await warmup_scheduler.shutdown()
+    await ai_job_queue.shutdown()
+    await live_bars_service.shutdown()
+    await process_pool.shutdown()
+    # Esvazia a fila de logs
+    shutdown_logging()
+# --- Fim Ciclo de Vida ---
+
 
 # Cria a instância principal da aplicação FastAPI
 app = FastAPI(
@@ -10,7 +47,8 @@ app = FastAPI(
     description="API para análise financeira com dados yfinance e IA phi-agents", # Descrição
     version="1.0.0", # Versão da API
     docs_url="/docs", # URL para a documentação interativa (Swagger UI)
-    redoc_url="/redoc" # URL para a documentação alternativa (ReDoc)
+    redoc_url="/redoc", # URL para a documentação alternativa (ReDoc)
+    lifespan=lifespan # Inicialização/encerramento (ver acima)
 )
 
 # --- Configuração CORS ---
@@ -23,9 +61,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"], # Métodos HTTP permitidos
     allow_headers=["*"], # Permite todos os cabeçalhos na requisição
+    expose_headers=["ETag"], # Permite ao frontend ler a ETag (requisições condicionais)
 )
 # --- Fim Configuração CORS ---
 
+# Compressão das respostas JSON grandes (brotli, se instalado, ou gzip)
+app.add_middleware(CompressionMiddleware)
+
+# Duração das requisições por rota e status (ver src/utils/metrics.py)
+app.add_middleware(metrics.MetricsMiddleware)
+
 
 # --- Inclusão de Routers ---
 # Inclui o router de ações na aplicação principal
@@ -46,6 +91,17 @@ async def read_root():
 # --- Fim Endpoint Raiz ---
 
 
+# --- Métricas ---
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """
+    Métricas da aplicação no formato de texto do Prometheus (duração por etapa, acertos dos caches,
+    requisições em andamento e duração por rota).
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+# --- Fim Métricas ---
+
+
 # --- Configuração para Execução com Uvicorn ---
 # Este bloco permite rodar o app usando 'python main.py' (embora 'uvicorn main:app' seja o usual)
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 # backend/src/config/config.py
 
+import logging
 import os
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Carrega as variáveis do arquivo .env (se existir)
 # load_dotenv() busca pelo arquivo .env no diretório atual e nos pais
 load_dotenv()
@@ -17,10 +20,222 @@ class Settings:
     # Validação simples para garantir que a chave GROQ está presente
     if not GROQ_API_KEY:
         # Em um ambiente de produção, você pode querer logar isso ou lidar de forma diferente
-        print("ERRO: Variável de ambiente GROQ_API_KEY não configurada!")
+        logger.error("Variável de ambiente GROQ_API_KEY não configurada!")
         # Opcional: exit(1) para parar a aplicação se a chave for essencial
         # Neste exemplo, a API pode iniciar, mas as funcionalidades de IA falharão sem a chave.
 
+    # --- Logs ---
+    # Nível mínimo dos logs da aplicação (DEBUG, INFO, WARNING, ERROR) e formato ("text" ou "json")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+
+    # --- Fontes externas ---
+    # Dados de mercado: "yfinance" (Yahoo, padrão) ou "replay" (fixtures gravadas em disco, sem rede)
+    MARKET_DATA_PROVIDER: str = os.getenv("MARKET_DATA_PROVIDER", "yfinance").lower()
+    # Diretório das fixtures do modo "replay" e latência simulada (em segundos) de cada chamada
+    MARKET_DATA_REPLAY_DIR: str = os.getenv("MARKET_DATA_REPLAY_DIR", os.path.join("benchmarks", "fixtures"))
+    MARKET_DATA_REPLAY_LATENCY_SECONDS: float = float(os.getenv("MARKET_DATA_REPLAY_LATENCY_SECONDS", "0"))
+    # Modelos de IA: "groq" (padrão) ou "stub" (respostas sintéticas, sem rede e sem GROQ_API_KEY)
+    AI_PROVIDER: str = os.getenv("AI_PROVIDER", "groq").lower()
+    # Latência de cada resposta do stub: fixa + aleatória entre 0 e o jitter (em segundos)
+    AI_STUB_LATENCY_SECONDS: float = float(os.getenv("AI_STUB_LATENCY_SECONDS", "1.0"))
+    AI_STUB_LATENCY_JITTER_SECONDS: float = float(os.getenv("AI_STUB_LATENCY_JITTER_SECONDS", "0"))
+
+    # --- Cache local de barras OHLCV ---
+    # Liga/desliga o cache em disco usado por get_historical_data
+    OHLCV_CACHE_ENABLED: bool = os.getenv("OHLCV_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    # Diretório onde os arquivos Arrow (um por ticker+intervalo) são gravados
+    OHLCV_CACHE_DIR: str = os.getenv("OHLCV_CACHE_DIR", os.path.join(".cache", "ohlcv"))
+    # Tempo (em segundos) que as barras em disco são consideradas atuais, por intervalo.
+    # Intervalos curtos expiram rápido; barras diárias/semanais podem ficar mais tempo.
+    OHLCV_CACHE_TTL_SECONDS: dict = {
+        "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+        "60m": 3600, "90m": 3600, "1h": 3600,
+        "1d": 900, "5d": 3600, "1wk": 6 * 3600, "1mo": 24 * 3600, "3mo": 24 * 3600,
+    }
+    # TTL usado para intervalos que não estão no dicionário acima
+    OHLCV_CACHE_DEFAULT_TTL_SECONDS: int = int(os.getenv("OHLCV_CACHE_DEFAULT_TTL_SECONDS", "900"))
+    # Arquivos do cache mantidos já convertidos em memória por worker (as colunas apontam para os
+    # arquivos mapeados, compartilhados entre os workers pelo cache de páginas do sistema)
+    OHLCV_CACHE_MEMORY_ENTRIES: int = int(os.getenv("OHLCV_CACHE_MEMORY_ENTRIES", "256"))
+    # Deriva intervalos mais grossos (ex: 5m, 1h, 1d) das barras mais finas já em cache do mesmo ticker,
+    # em vez de baixar cada intervalo separadamente do Yahoo
+    OHLCV_RESAMPLE_ENABLED: bool = os.getenv("OHLCV_RESAMPLE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # --- Cache compartilhado entre workers ---
+    # Informações e notícias de empresas e análises de IA em um SQLite local comum a todos os workers do
+    # host, e travas entre processos para que só um worker atualize cada chave (barras OHLCV inclusive)
+    SHARED_CACHE_ENABLED: bool = os.getenv("SHARED_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    # Diretório do SQLite e dos arquivos de trava (precisa estar em disco local, não em rede)
+    SHARED_CACHE_DIR: str = os.getenv("SHARED_CACHE_DIR", os.path.join(".cache", "shared"))
+    # Tempo máximo (em segundos) de espera pela trava de uma chave; depois disso o worker segue sem ela
+    SHARED_CACHE_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("SHARED_CACHE_LOCK_TIMEOUT_SECONDS", "30"))
+    # Tempo (em segundos) que as informações de uma empresa são reaproveitadas
+    COMPANY_INFO_CACHE_TTL_SECONDS: int = int(os.getenv("COMPANY_INFO_CACHE_TTL_SECONDS", str(6 * 3600)))
+    # e as notícias de um ticker
+    COMPANY_NEWS_CACHE_TTL_SECONDS: int = int(os.getenv("COMPANY_NEWS_CACHE_TTL_SECONDS", "900"))
+
+    # --- Cache HTTP e compressão ---
+    # Pregão de referência para o Cache-Control das séries (fuso e horários de abertura/fechamento)
+    MARKET_TIMEZONE: str = os.getenv("MARKET_TIMEZONE", "America/New_York")
+    MARKET_OPEN_TIME: str = os.getenv("MARKET_OPEN_TIME", "09:30")
+    MARKET_CLOSE_TIME: str = os.getenv("MARKET_CLOSE_TIME", "16:00")
+    # Validade máxima (em segundos) das séries no cliente com o pregão fechado (elas só mudam na abertura)
+    HTTP_CACHE_MAX_AGE_CLOSED_SECONDS: int = int(os.getenv("HTTP_CACHE_MAX_AGE_CLOSED_SECONDS", "3600"))
+    # Validade (em segundos) das informações de empresas no cliente
+    HTTP_CACHE_INFO_MAX_AGE_SECONDS: int = int(os.getenv("HTTP_CACHE_INFO_MAX_AGE_SECONDS", "3600"))
+    # Respostas JSON/texto a partir deste tamanho (em bytes) são comprimidas (brotli, se instalado, ou gzip)
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+    # --- Resiliência das chamadas externas (Yahoo e Groq) ---
+    # Prazo total (em segundos) de uma chamada ao Yahoo, incluindo novas tentativas, e de cada tentativa
+    MARKET_DATA_DEADLINE_SECONDS: float = float(os.getenv("MARKET_DATA_DEADLINE_SECONDS", "20"))
+    MARKET_DATA_ATTEMPT_TIMEOUT_SECONDS: float = float(os.getenv("MARKET_DATA_ATTEMPT_TIMEOUT_SECONDS", "8"))
+    # Novas tentativas após uma falha ou estouro de prazo
+    MARKET_DATA_RETRIES: int = int(os.getenv("MARKET_DATA_RETRIES", "2"))
+    # Espera (em segundos) antes de disparar uma requisição duplicada quando a primeira demora (0 = desligado).
+    # Com latências suficientes registradas, a espera passa a ser o percentil UPSTREAM_HEDGE_QUANTILE delas
+    MARKET_DATA_HEDGE_AFTER_SECONDS: float = float(os.getenv("MARKET_DATA_HEDGE_AFTER_SECONDS", "2"))
+    # O mesmo para as chamadas aos modelos de IA (duplicar uma chamada ao modelo custa tokens: desligado)
+    AI_DEADLINE_SECONDS: float = float(os.getenv("AI_DEADLINE_SECONDS", "120"))
+    AI_ATTEMPT_TIMEOUT_SECONDS: float = float(os.getenv("AI_ATTEMPT_TIMEOUT_SECONDS", "60"))
+    AI_RETRIES: int = int(os.getenv("AI_RETRIES", "1"))
+    AI_HEDGE_AFTER_SECONDS: float = float(os.getenv("AI_HEDGE_AFTER_SECONDS", "0"))
+    # Percentil das latências recentes usado como espera das requisições duplicadas
+    UPSTREAM_HEDGE_QUANTILE: float = float(os.getenv("UPSTREAM_HEDGE_QUANTILE", "0.95"))
+    # Espera entre tentativas: aleatória entre 0 e base * 2^tentativa, limitada ao máximo (em segundos)
+    UPSTREAM_RETRY_BASE_SECONDS: float = float(os.getenv("UPSTREAM_RETRY_BASE_SECONDS", "0.25"))
+    UPSTREAM_RETRY_MAX_SECONDS: float = float(os.getenv("UPSTREAM_RETRY_MAX_SECONDS", "4"))
+    # Falhas seguidas que abrem o circuito (chamadas recusadas na hora, servindo dados antigos do cache)
+    # e tempo (em segundos) até uma chamada de teste
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+    # Threads das chamadas ao Yahoo (uma chamada que estoura o prazo segue ocupando a sua até terminar)
+    UPSTREAM_MAX_WORKERS: int = int(os.getenv("UPSTREAM_MAX_WORKERS", "16"))
+    # Por quanto tempo (em segundos) entradas expiradas do cache compartilhado ainda servem de reserva
+    # quando a fonte externa está falhando
+    STALE_MAX_AGE_SECONDS: int = int(os.getenv("STALE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
+    # --- Pool de workers para dados de mercado ---
+    # Número máximo de chamadas simultâneas ao yfinance fora do event loop
+    MARKET_DATA_MAX_WORKERS: int = int(os.getenv("MARKET_DATA_MAX_WORKERS", "8"))
+
+    # --- Pool de processos (backtesting, screener) ---
+    # Processos usados nos cálculos pesados em CPU (padrão: um por núcleo)
+    PROCESS_POOL_MAX_WORKERS: int = int(os.getenv("PROCESS_POOL_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+    # --- Backtesting ---
+    # Combinações avaliadas por tarefa enviada a um processo (matrizes combinações x barras)
+    BACKTEST_CHUNK_SIZE: int = int(os.getenv("BACKTEST_CHUNK_SIZE", "250"))
+    # Limites por varredura: combinações de parâmetros e tickers
+    BACKTEST_MAX_COMBINATIONS: int = int(os.getenv("BACKTEST_MAX_COMBINATIONS", "2000"))
+    BACKTEST_MAX_TICKERS: int = int(os.getenv("BACKTEST_MAX_TICKERS", "100"))
+
+    # --- Screener ---
+    # Tickers por tarefa enviada a um processo (universos menores são avaliados de uma vez, sem outro processo)
+    SCREENER_CHUNK_SIZE: int = int(os.getenv("SCREENER_CHUNK_SIZE", "200"))
+    # Número máximo de tickers por consulta
+    SCREENER_MAX_TICKERS: int = int(os.getenv("SCREENER_MAX_TICKERS", "2000"))
+
+    # --- Análise de carteiras ---
+    # Índice de referência padrão para o beta
+    PORTFOLIO_BENCHMARK: str = os.getenv("PORTFOLIO_BENCHMARK", "^GSPC")
+    # Número máximo de ativos por carteira
+    PORTFOLIO_MAX_TICKERS: int = int(os.getenv("PORTFOLIO_MAX_TICKERS", "500"))
+    # Janelas de covariância mantidas em memória para atualização incremental (descarte LRU) e por quanto tempo
+    PORTFOLIO_STATE_MAX_ENTRIES: int = int(os.getenv("PORTFOLIO_STATE_MAX_ENTRIES", "64"))
+    PORTFOLIO_STATE_TTL_SECONDS: int = int(os.getenv("PORTFOLIO_STATE_TTL_SECONDS", "3600"))
+
+    # --- Modelos de IA ---
+    # IDs dos modelos Groq aceitos nas requisições, separados por vírgula. Pools de agentes, limites,
+    # disjuntores e métricas são mantidos por modelo: IDs fora desta lista são recusados (422)
+    AI_MODELS: list = [m.strip() for m in os.getenv(
+        "AI_MODELS", "llama-3.1-8b-instant,llama-3.1-70b-versatile,deepseek-r1-distill-llama-70b"
+    ).split(",") if m.strip()]
+
+    # --- Análise de IA com contexto ---
+    # Modo padrão da análise: "agents" (time de agentes com ferramentas, que busca os dados por conta
+    # própria) ou "context" (uma única chamada ao modelo com os dados já em cache no prompt)
+    AI_ANALYSIS_MODE: str = os.getenv("AI_ANALYSIS_MODE", "agents").lower()
+    # Período e indicadores resumidos no contexto, fechamentos recentes listados e notícias incluídas
+    AI_CONTEXT_PERIOD: str = os.getenv("AI_CONTEXT_PERIOD", "6mo")
+    AI_CONTEXT_INDICATORS: str = os.getenv("AI_CONTEXT_INDICATORS", "sma_20,ema_20,rsi_14,macd_12_26_9")
+    AI_CONTEXT_RECENT_CLOSES: int = int(os.getenv("AI_CONTEXT_RECENT_CLOSES", "10"))
+    AI_CONTEXT_NEWS_ITEMS: int = int(os.getenv("AI_CONTEXT_NEWS_ITEMS", "8"))
+    # Limite de tokens da resposta do modelo no modo "context"
+    AI_CONTEXT_MAX_TOKENS: int = int(os.getenv("AI_CONTEXT_MAX_TOKENS", "800"))
+
+    # --- Cache de análises de IA ---
+    # Tempo (em segundos) que uma análise (ticker, modelo, pregão) é reaproveitada
+    AI_CACHE_TTL_SECONDS: int = int(os.getenv("AI_CACHE_TTL_SECONDS", "1800"))
+    # Com SHARED_CACHE_ENABLED desligado: número máximo de análises mantidas em memória (descarte LRU)
+    AI_CACHE_MAX_ENTRIES: int = int(os.getenv("AI_CACHE_MAX_ENTRIES", "256"))
+    # e diretório para espelhar esse cache em disco (vazio = apenas em memória)
+    AI_CACHE_DIR: str = os.getenv("AI_CACHE_DIR", "")
+
+    # --- Fila de jobs de análise de IA ---
+    # Número de workers que executam jobs de análise em paralelo
+    AI_JOB_WORKERS: int = int(os.getenv("AI_JOB_WORKERS", "4"))
+    # Tamanho máximo da fila (novos jobs são recusados acima disso)
+    AI_JOB_MAX_QUEUED: int = int(os.getenv("AI_JOB_MAX_QUEUED", "1000"))
+    # Tempo (em segundos) que jobs concluídos ficam disponíveis para consulta
+    AI_JOB_RETENTION_SECONDS: int = int(os.getenv("AI_JOB_RETENTION_SECONDS", "3600"))
+    # Limites padrão por modelo Groq: execuções simultâneas, requisições por minuto e rajada
+    AI_MODEL_MAX_CONCURRENCY: int = int(os.getenv("AI_MODEL_MAX_CONCURRENCY", "2"))
+    AI_MODEL_REQUESTS_PER_MINUTE: float = float(os.getenv("AI_MODEL_REQUESTS_PER_MINUTE", "30"))
+    AI_MODEL_BURST: int = int(os.getenv("AI_MODEL_BURST", "3"))
+    # Limites específicos por modelo (sobrescrevem os padrões acima)
+    # Ex: {"llama-3.1-8b-instant": {"concurrency": 4, "requests_per_minute": 30, "burst": 5}}
+    AI_MODEL_LIMITS: dict = {}
+
+    # --- Pool de agentes de IA ---
+    # Times de agentes ociosos mantidos por modelo para reutilização entre requisições
+    AI_AGENT_POOL_MAX_IDLE: int = int(os.getenv("AI_AGENT_POOL_MAX_IDLE", "4"))
+    # Modelos pré-aquecidos na inicialização, separados por vírgula (vazio = nenhum)
+    AI_WARMUP_MODELS: list = [m.strip() for m in os.getenv("AI_WARMUP_MODELS", "").split(",") if m.strip()]
+
+    # --- Inicialização ---
+    # Importa as dependências pesadas (yfinance, pandas, phi, Groq) em segundo plano logo após a
+    # inicialização, para que a primeira requisição de dados/IA não pague esse custo
+    STARTUP_PRELOAD_MODULES: bool = os.getenv("STARTUP_PRELOAD_MODULES", "true").lower() in ("1", "true", "yes")
+
+    # --- Aquecimento agendado de watchlists ---
+    # Tickers atualizados em segundo plano nos horários abaixo, separados por vírgula (vazio = desligado)
+    WARMUP_TICKERS: list = [t.strip().upper() for t in os.getenv("WARMUP_TICKERS", "").split(",") if t.strip()]
+    # Horários das atualizações ("HH:MM" no fuso MARKET_TIMEZONE, de segunda a sexta):
+    # logo após a abertura e logo após o fechamento, por padrão
+    WARMUP_TIMES: list = [t.strip() for t in os.getenv("WARMUP_TIMES", "09:35,16:05").split(",") if t.strip()]
+    # Período, intervalos e indicadores pré-calculados (os padrões de /data)
+    WARMUP_PERIOD: str = os.getenv("WARMUP_PERIOD", "6mo")
+    WARMUP_INTERVALS: list = [i.strip() for i in os.getenv("WARMUP_INTERVALS", "1d").split(",") if i.strip()]
+    WARMUP_INDICATORS: str = os.getenv("WARMUP_INDICATORS", "sma_20,ema_20")
+    # Modelos (de AI_MODELS) usados para gerar as análises de IA da watchlist, separados por vírgula
+    # (vazio = nenhuma). As análises entram na fila de jobs com prioridade "batch" e valem por AI_CACHE_TTL_SECONDS
+    WARMUP_ANALYSIS_MODELS: list = [m.strip() for m in os.getenv("WARMUP_ANALYSIS_MODELS", "").split(",") if m.strip()]
+    # Tickers atualizados ao mesmo tempo e atraso aleatório máximo (em segundos) antes de cada um
+    # e de cada rodada, para espalhar as consultas ao Yahoo
+    WARMUP_CONCURRENCY: int = int(os.getenv("WARMUP_CONCURRENCY", "2"))
+    WARMUP_JITTER_SECONDS: float = float(os.getenv("WARMUP_JITTER_SECONDS", "30"))
+
+    # --- Streaming ao vivo (WebSocket) ---
+    # Intervalo (em segundos) entre consultas ao Yahoo de cada ticker acompanhado (uma consulta por
+    # ticker+intervalo, independentemente do número de clientes inscritos)
+    LIVE_POLL_SECONDS: float = float(os.getenv("LIVE_POLL_SECONDS", "15"))
+    # Histórico consultado para o cálculo dos indicadores das barras ao vivo, por intervalo
+    # (respeitando os limites do Yahoo: 7 dias para 1m, 60 dias para os demais intradiários)
+    LIVE_HISTORY_PERIOD: dict = {
+        "1m": "5d", "2m": "1mo", "5m": "1mo", "15m": "1mo", "30m": "1mo",
+        "60m": "3mo", "90m": "1mo", "1h": "3mo", "1d": "1y",
+    }
+    # Número de barras enviadas no snapshot inicial de cada inscrição
+    LIVE_SNAPSHOT_BARS: int = int(os.getenv("LIVE_SNAPSHOT_BARS", "200"))
+    # Máximo de tickers acompanhados por conexão
+    LIVE_MAX_TICKERS_PER_CONNECTION: int = int(os.getenv("LIVE_MAX_TICKERS_PER_CONNECTION", "50"))
+    # Mensagens pendentes por conexão; um cliente lento que passa disso é ressincronizado com um snapshot
+    LIVE_MAX_PENDING_MESSAGES: int = int(os.getenv("LIVE_MAX_PENDING_MESSAGES", "500"))
+
 
 # Instância global das configurações
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,28 @@
+# backend/src/config/universes.py
+
+# Universos de tickers disponíveis no screener (os mesmos das listas do frontend:
+# frontend/src/constants/tickers.js e cryptoTickers.js)
+
+STOCK_TICKERS = [
+    "AAPL", "MSFT", "GOOG", "AMZN", "TSLA", "NVDA", "META",  # Tech Giants
+    "BRK-B", "JPM", "V", "MA", "BAC", "WFC",  # Finance
+    "JNJ", "UNH", "PFE", "ABBV", "MRK",  # Healthcare
+    "XOM", "CVX", "SHEL", "BHP",  # Energy
+    "WMT", "HD", "PG", "KO", "PEP",  # Consumer Staples/Discretionary
+    "BABA", "TCEHY", "TM", "SONY",  # International
+    "NFLX", "ADBE", "CRM", "INTC", "AMD", "QCOM",  # More Tech
+    "VZ", "T", "TMUS",  # Telecom
+]
+
+CRYPTO_TICKERS = [
+    "BTC-USD", "ETH-USD", "DOGE-USD", "XRP-USD", "ADA-USD",
+    "SOL-USD", "DOT-USD", "LTC-USD", "BCH-USD", "LINK-USD",
+    "XLM-USD", "TRX-USD", "VET-USD", "ETC-USD", "FIL-USD",
+]
+
+# Nome do universo -> tickers
+UNIVERSES = {
+    "stocks": STOCK_TICKERS,
+    "crypto": CRYPTO_TICKERS,
+    "all": STOCK_TICKERS + CRYPTO_TICKERS,
+}
@@ -1,23 +1,74 @@
 # backend/src/models/ai_models.py
 
-from pydantic import BaseModel # Importa a classe base para modelos
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field # Importa a classe base para modelos e validações de campo
+
+# Importa as configurações (modelos de IA aceitos)
+from src.config.config import settings
+
+
+def validate_model_id(model_id: str) -> str:
+    """
+    Aceita apenas os modelos configurados em AI_MODELS: pools de agentes, limites, disjuntores e
+    métricas são criados por modelo, e IDs arbitrários os fariam crescer sem limite.
+
+    Raises:
+        ValueError: Se o modelo não estiver na lista (a requisição é recusada com 422).
+    """
+    if model_id not in settings.AI_MODELS:
+        raise ValueError(f"Modelo de IA não suportado: {model_id}. Modelos aceitos: {', '.join(settings.AI_MODELS)}")
+    return model_id
+
+
+# ID de modelo validado contra AI_MODELS (usado nos corpos das requisições e na query do streaming)
+ModelId = Annotated[str, AfterValidator(validate_model_id)]
 
 class AIAnalysisRequest(BaseModel):
     """
     Modelo Pydantic para validar a requisição POST para análise de IA.
     Define os dados esperados no corpo da requisição.
     """
-    # Campo para o ID do modelo LLM a ser usado na análise
-    model_id: str
+    # Campo para o ID do modelo LLM a ser usado na análise (um dos modelos de AI_MODELS)
+    model_id: ModelId
+
+    # Modo da análise: "agents" (time de agentes com ferramentas) ou "context" (uma chamada ao modelo
+    # com os dados em cache no prompt). Omitido, vale o padrão do servidor (AI_ANALYSIS_MODE)
+    mode: str | None = Field(None, pattern="^(agents|context)$")
 
     # Exemplo de como você poderia adicionar outros campos no futuro:
     # additional_params: dict | None = None # Parâmetros adicionais para a chamada da IA
 
     class Config:
         # Configurações opcionais para o modelo Pydantic
-        # schema_extra é útil para a documentação Swagger/OpenAPI, fornecendo um exemplo
-        schema_extra = {
+        # json_schema_extra é útil para a documentação Swagger/OpenAPI, fornecendo um exemplo
+        json_schema_extra = {
             "example": {
                 "model_id": "deepseek-r1-distill-llama-70b"
             }
-        }
\ No newline at end of file
+        }
+
+class AIWatchlistJobRequest(BaseModel):
+    """
+    Modelo Pydantic para a submissão de jobs de análise de IA para uma watchlist inteira.
+    """
+    # Tickers da watchlist (um job por ticker)
+    tickers: list[str] = Field(..., min_length=1, max_length=200)
+
+    # Campo para o ID do modelo LLM a ser usado nas análises (um dos modelos de AI_MODELS)
+    model_id: ModelId
+
+    # Prioridade dos jobs: "batch" (padrão) ou "interactive"
+    priority: str = "batch"
+
+    # Modo das análises (ver AIAnalysisRequest)
+    mode: str | None = Field(None, pattern="^(agents|context)$")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT", "NVDA"],
+                "model_id": "llama-3.1-8b-instant",
+                "priority": "batch"
+            }
+        }
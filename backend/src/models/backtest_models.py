@@ -0,0 +1,71 @@
+# backend/src/models/backtest_models.py
+
+from pydantic import BaseModel, Field # Importa a classe base para modelos e validações de campo
+
+# Estratégias e métricas aceitas (os parâmetros de cada estratégia são validados em strategy_specs)
+STRATEGY_PATTERN = "^(sma_cross|ema_cross|rsi|breakout)$"
+RANK_METRIC_PATTERN = "^(sharpe|total_return|annual_return|max_drawdown)$"
+
+
+class BacktestRequest(BaseModel):
+    """
+    Modelo Pydantic para a execução de uma estratégia com um conjunto de parâmetros.
+    """
+    # Estratégia: "sma_cross", "ema_cross", "rsi" ou "breakout"
+    strategy: str = Field(..., pattern=STRATEGY_PATTERN)
+
+    # Parâmetros da estratégia (os omitidos usam os padrões)
+    params: dict[str, int | float] = {}
+
+    # Período e intervalo das barras (mesmos valores aceitos pelo yfinance)
+    period: str = "1y"
+    interval: str = "1d"
+
+    # Custo por operação (compra ou venda), em pontos-base
+    cost_bps: float = Field(0.0, ge=0, le=1000)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "strategy": "sma_cross",
+                "params": {"fast": 20, "slow": 50},
+                "period": "2y",
+                "interval": "1d",
+                "cost_bps": 5
+            }
+        }
+
+
+class BacktestSweepRequest(BaseModel):
+    """
+    Modelo Pydantic para a varredura de uma grade de parâmetros em vários tickers.
+    """
+    # Tickers avaliados (um backtest por ticker e combinação de parâmetros)
+    tickers: list[str] = Field(..., min_length=1)
+
+    # Estratégia: "sma_cross", "ema_cross", "rsi" ou "breakout"
+    strategy: str = Field(..., pattern=STRATEGY_PATTERN)
+
+    # Parâmetro -> valores a testar (produto cartesiano; combinações inválidas são descartadas)
+    grid: dict[str, list[int | float]] = {}
+
+    period: str = "1y"
+    interval: str = "1d"
+    cost_bps: float = Field(0.0, ge=0, le=1000)
+
+    # Quantidade de resultados devolvidos e métrica de ordenação
+    top: int = Field(20, ge=1, le=1000)
+    rank_by: str = Field("sharpe", pattern=RANK_METRIC_PATTERN)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT", "NVDA"],
+                "strategy": "sma_cross",
+                "grid": {"fast": [5, 10, 20], "slow": [50, 100, 200]},
+                "period": "5y",
+                "interval": "1d",
+                "top": 10,
+                "rank_by": "sharpe"
+            }
+        }
@@ -0,0 +1,37 @@
+# backend/src/models/portfolio_models.py
+
+from pydantic import BaseModel, Field # Importa a classe base para modelos e validações de campo
+
+
+class PortfolioRequest(BaseModel):
+    """
+    Modelo Pydantic para a análise de risco de uma carteira.
+    """
+    # Ativos da carteira e seus pesos, na mesma ordem (normalizados para somar 1; sem pesos = iguais)
+    tickers: list[str] = Field(..., min_length=1)
+    weights: list[float] | None = None
+
+    # Índice de referência do beta (None = padrão do servidor, "" = sem beta)
+    benchmark: str | None = None
+
+    # Janela das estatísticas móveis, em barras
+    window: int = Field(63, ge=2, le=1000)
+
+    # Período e intervalo das barras (mesmos valores aceitos pelo yfinance)
+    period: str = "1y"
+    interval: str = "1d"
+
+    # Inclui as matrizes de correlação das janelas móveis a cada N barras (0 = só a mais recente)
+    history_step: int = Field(0, ge=0, le=1000)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT", "NVDA", "JPM"],
+                "weights": [0.3, 0.3, 0.2, 0.2],
+                "benchmark": "^GSPC",
+                "window": 63,
+                "period": "1y",
+                "interval": "1d"
+            }
+        }
@@ -0,0 +1,36 @@
+# backend/src/models/screener_models.py
+
+from pydantic import BaseModel, Field # Importa a classe base para modelos e validações de campo
+
+
+class ScreenerRequest(BaseModel):
+    """
+    Modelo Pydantic para uma consulta do screener (filtro sobre um universo de tickers).
+    """
+    # Filtro avaliado na barra mais recente de cada ticker (ver src/tools/screener_specs.py)
+    expression: str = Field(..., min_length=1, max_length=500)
+
+    # Universo pré-definido ("stocks", "crypto", "all"); ignorado quando 'tickers' é informado
+    universe: str | None = "stocks"
+    tickers: list[str] | None = None
+
+    # Ordenação dos aprovados por uma expressão numérica (ex: "rsi_14", "change(close, 5)")
+    rank_by: str | None = Field(None, max_length=500)
+    ascending: bool = False
+
+    # Quantidade máxima de resultados
+    top: int = Field(50, ge=1, le=1000)
+
+    # Histórico carregado (precisa cobrir as janelas usadas no filtro) e intervalo das barras
+    period: str = "1y"
+    interval: str = "1d"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "expression": "close > SMA_20 and volume > 2 * avg(volume, 20)",
+                "universe": "stocks",
+                "rank_by": "change(close, 5)",
+                "top": 20
+            }
+        }
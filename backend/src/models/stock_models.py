@@ -0,0 +1,27 @@
+# backend/src/models/stock_models.py
+
+from pydantic import BaseModel, Field # Importa a classe base para modelos e validações de campo
+
+class BatchHistoricalDataRequest(BaseModel):
+    """
+    Modelo Pydantic para validar a requisição POST de dados históricos em lote.
+    Define os tickers e o período desejados.
+    """
+    # Lista de tickers a buscar em um único download
+    tickers: list[str] = Field(..., min_length=1, max_length=100)
+
+    # Período dos dados históricos (mesmos valores aceitos pelo yfinance)
+    period: str = "6mo"
+
+    # Intervalo das barras (ex: "1d", "1h", "5m")
+    interval: str = "1d"
+
+    class Config:
+        # Exemplo para a documentação Swagger/OpenAPI
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT", "BTC-USD"],
+                "period": "6mo",
+                "interval": "1d"
+            }
+        }
@@ -1,50 +1,218 @@
 # backend/src/routers/stock_routes.py
 
-from fastapi import APIRouter, HTTPException, Path, Body # Importa Body para ler o corpo da requisição
+import asyncio
+import json
+import logging
+import math
+from datetime import datetime, timedelta
 
-# Importa a ferramenta para buscar dados históricos diretamente
-from src.tools.yfinance_tool import get_historical_data
-from src.tools.yfinance_tool import get_company_info
+from fastapi import APIRouter, HTTPException, Path, Body, Query, Header, WebSocket, WebSocketDisconnect # Importa Body para ler o corpo da requisição
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Importa as versões assíncronas (pool de workers + single-flight) das buscas no yfinance
+from src.services.market_data_service import fetch_historical_frame
+from src.services.market_data_service import fetch_historical_data_batch
+from src.services.market_data_service import run_in_pool
+from src.services.market_data_service import fetch_company_info
 # Importa o serviço de IA
-from src.services.ai_service import get_ai_analysis
+from src.services.ai_service import AnalysisStreamError, get_ai_analysis, stream_ai_analysis
+# Limites por modelo compartilhados com a fila de jobs (429 quando o modelo está sem capacidade)
+from src.services.ai_model_limits import ModelBusyError
+# Fila de jobs de análise de IA
+from src.services import ai_job_queue
+# Streaming ao vivo de barras (um poller compartilhado por ticker)
+from src.services import live_bars_service
+# Backtesting de estratégias (varreduras no pool de processos)
+from src.services import backtest_service
+# Screener (filtros sobre um universo de tickers)
+from src.services import screener_service
+# Análise de risco de carteiras (covariância, volatilidade, beta)
+from src.services import portfolio_service
 # Importa o modelo Pydantic para a requisição de IA
-from src.models.ai_models import AIAnalysisRequest
+from src.models.ai_models import AIAnalysisRequest, AIWatchlistJobRequest, validate_model_id
+# Importa o modelo Pydantic para a requisição de dados em lote
+from src.models.stock_models import BatchHistoricalDataRequest
+# Modelos Pydantic das requisições de backtesting
+from src.models.backtest_models import BacktestRequest, BacktestSweepRequest
+# Modelo Pydantic da consulta do screener
+from src.models.screener_models import ScreenerRequest
+# Modelo Pydantic da análise de carteira
+from src.models.portfolio_models import PortfolioRequest
+# Universos de tickers pré-definidos
+from src.config.universes import UNIVERSES
+# Interpretação dos indicadores técnicos pedidos (sem carregar o motor de cálculo)
+from src.tools.indicator_specs import parse_specs, DEFAULT_INDICATORS
+# Negociação de formato e serialização das séries históricas
+from src.utils.serialization import negotiate_format, frame_response
+# ETags, requisições condicionais e Cache-Control
+from src.utils import http_cache
+# Contagem de requisições em andamento por rota
+from src.utils.metrics import MetricsRoute
+
+logger = logging.getLogger(__name__)
 
 # Cria uma instância do APIRouter com o prefixo
 router = APIRouter(
     prefix="/api/v1/stocks",
-    tags=["stocks"] # Mantém a tag para organização na documentação
+    tags=["stocks"], # Mantém a tag para organização na documentação
+    route_class=MetricsRoute # Conta as requisições em andamento por rota (/metrics)
 )
 
+def _parse_datetime(value: str | None, end_of_day: bool = False) -> datetime | None:
+    """
+    Interpreta uma data/hora ISO 8601 da query string. Com 'end_of_day', uma data sem hora
+    vale até o último instante do dia (o fim do intervalo inclui o dia inteiro).
+
+    Raises:
+        ValueError: Se o valor não for uma data ISO 8601 válida.
+    """
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Data inválida (use ISO 8601, ex: 2024-01-31): {value}")
+    if end_of_day and len(value) == 10:
+        moment += timedelta(days=1, microseconds=-1)
+    return moment
+
+
+def _model_busy(error: ModelBusyError) -> HTTPException:
+    """
+    Resposta 429 para um modelo sem vaga ou sem ficha, com o Retry-After em segundos inteiros.
+    """
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
+
+
 # ---  Endpoint para Dados Históricos (GET) ---
 @router.get("/data/{ticker}")
 async def get_stock_historical_data(
-    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1)
+    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1),
+    # Período no formato do yfinance (ignorado quando 'start' é informado)
+    period: str = Query("6mo", pattern=r"^(\d+(d|wk|mo|y)|ytd|max)$"),
+    interval: str = Query("1d", pattern="^(1m|2m|5m|15m|30m|60m|90m|1h|1d|5d|1wk|1mo|3mo)$"),
+    # Intervalo de datas (ISO 8601, ex: "2024-01-02" ou "2024-01-02T14:30:00"), inclusive
+    start: str | None = Query(None),
+    end: str | None = Query(None),
+    # Número aproximado de pontos desejado (resolução do gráfico); sem ele, todas as barras
+    points: int | None = Query(None, ge=3, le=20000),
+    # Método de redução: "lttb" (linha, barras reais) ou "ohlc" (candles, extremos preservados)
+    downsample: str = Query("lttb", pattern="^(lttb|ohlc)$"),
+    # Formato da resposta: "records" (padrão), "columns" ou "arrow". Tem prioridade sobre o Accept.
+    format: str | None = Query(None, pattern="^(records|columns|arrow)$"),
+    # Indicadores técnicos, separados por vírgula (ex: "sma_50,ema_20,rsi_14,macd,bbands_20_2,atr_14,vwap,obv")
+    indicators: str = Query(DEFAULT_INDICATORS),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None)
 ):
     """
     Retorna apenas dados históricos de ações para um dado ticker.
 
+    O formato da resposta é negociado pelo parâmetro 'format' ou pelo cabeçalho Accept:
+    - "records" (application/json): lista de objetos, um por barra (padrão).
+    - "columns" (application/vnd.daytrade.columns+json): um array por coluna.
+    - "arrow" (application/vnd.apache.arrow.stream): Arrow IPC binário.
+
+    Indicadores disponíveis (parâmetros opcionais após "_"): sma_N, ema_N, rsi_N, macd_F_S_SIG,
+    bbands_N_K, atr_N, vwap, obv. Cada um gera colunas como SMA_50, RSI_14, MACD_12_26_9, BB_UPPER_20_2.
+
+    Com 'points', séries longas (ex: "max" ou barras de 1 minuto) são reduzidas no servidor à resolução
+    do gráfico: "lttb" mantém as barras que preservam a forma do fechamento; "ohlc" agrega barras
+    consecutivas preservando máximas, mínimas e volume.
+
+    A resposta leva uma ETag do conteúdo das barras e um Cache-Control que depende do horário do pregão;
+    com If-None-Match igual à ETag atual, a resposta é um 304 sem corpo.
+
     Args:
         ticker (str): O símbolo do ticker da ação (ex: "MSFT", "AAPL").
+        period (str): O período dos dados (ex: "6mo", "1y", "max"). O padrão é "6mo".
+        interval (str): O intervalo das barras (ex: "1m", "1h", "1d"). O padrão é "1d".
+        start (str | None): Início do intervalo de datas (ISO 8601). Tem prioridade sobre 'period'.
+        end (str | None): Fim do intervalo de datas (ISO 8601). Uma data sem hora inclui o dia inteiro.
+        points (int | None): Número máximo de barras na resposta.
+        downsample (str): Método de redução ("lttb" ou "ohlc").
+        format (str | None): O formato da resposta.
+        indicators (str): Os indicadores técnicos a calcular. O padrão é "sma_20,ema_20".
+        accept (str | None): O cabeçalho Accept da requisição.
+        if_none_match (str | None): O cabeçalho If-None-Match (ETags já em poder do cliente).
 
     Returns:
-        dict: Um dicionário contendo 'historical_data' (list de dicts).
+        Response: 'historical_data' no formato negociado, ou 304 Not Modified.
 
     Raises:
+        HTTPException: 400 Bad Request se a lista de indicadores ou as datas forem inválidas.
         HTTPException: 404 Not Found se os dados para o ticker não forem encontrados.
     """
-    print(f"Recebida requisição GET por dados históricos para ticker: {ticker}")
+    logger.info("Recebida requisição GET por dados históricos para ticker: %s", ticker)
 
-    # Chama a função da ferramenta para obter apenas os dados históricos
-    historical_data = get_historical_data(ticker)
+    try:
+        indicator_specs = parse_specs(indicators)
+        start_at = _parse_datetime(start)
+        end_at = _parse_datetime(end, end_of_day=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if start_at and end_at and start_at.replace(tzinfo=None) > end_at.replace(tzinfo=None):
+        raise HTTPException(status_code=400, detail="'start' deve ser anterior a 'end'")
+
+    # Busca os dados históricos fora do event loop (requisições iguais compartilham a busca)
+    historical_frame = await fetch_historical_frame(
+        ticker, period, interval, indicator_specs,
+        start=start_at, end=end_at, points=points, downsample=downsample
+    )
 
     # Verifica se os dados foram encontrados
-    if historical_data is None:
-        print(f"Dados históricos não encontrados para o ticker: {ticker}")
+    if historical_frame is None:
+        logger.info("Dados históricos não encontrados para o ticker: %s", ticker)
         raise HTTPException(status_code=404, detail=f"Dados históricos não encontrados para: {ticker}")
 
-    print(f"Dados históricos encontrados para o ticker: {ticker}")
-    return {"historical_data": historical_data}
+    logger.info("Dados históricos encontrados para o ticker: %s", ticker)
+    response_format = negotiate_format(format, accept)
+    etag = await run_in_pool(http_cache.frame_etag, historical_frame, interval, response_format)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": http_cache.bars_cache_control(ticker, interval),
+        "Vary": "Accept",  # O formato também é negociado pelo Accept
+    }
+    if http_cache.etag_matches(if_none_match, etag):
+        return http_cache.not_modified(headers)
+
+    # A serialização (proporcional ao número de barras) também roda fora do event loop
+    response = await run_in_pool(frame_response, historical_frame, interval, response_format)
+    response.headers.update(headers)
+    return response
+
+# ---  Endpoint para Dados Históricos em Lote (POST /data/batch) ---
+@router.post("/data/batch")
+async def get_stock_historical_data_batch(
+    request_body: BatchHistoricalDataRequest = Body(...)
+):
+    """
+    Retorna dados históricos de vários tickers em uma única resposta.
+    Os tickers são baixados em um único lote e as médias móveis são calculadas para todas as séries juntas.
+
+    Args:
+        request_body (BatchHistoricalDataRequest): Corpo com a lista de tickers, o período e o intervalo.
+
+    Returns:
+        dict: Um dicionário contendo 'historical_data' (dict ticker -> list de dicts)
+              e 'not_found' (list dos tickers sem dados).
+    """
+    logger.info("Recebida requisição POST por dados históricos em lote para %s tickers", len(request_body.tickers))
+
+    historical_data = await fetch_historical_data_batch(
+        request_body.tickers, request_body.period, request_body.interval
+    )
+
+    # Tickers pedidos que não retornaram dados (inválidos ou sem histórico no período)
+    not_found = [t for t in dict.fromkeys(t.upper() for t in request_body.tickers) if t not in historical_data]
+    if not_found:
+        logger.info("Dados históricos não encontrados para os tickers: %s", not_found)
+
+    return {"historical_data": historical_data, "not_found": not_found}
 
 # ---  Endpoint para Análise de IA (POST) ---
 @router.post("/analyze/{ticker}")
@@ -58,61 +226,418 @@ async def get_stock_ai_analysis(
 
     Args:
         ticker (str): O símbolo do ticker da ação (ex: "MSFT", "AAPL").
-        request_body (AIAnalysisRequest): Corpo da requisição contendo o ID do modelo LLM.
+        request_body (AIAnalysisRequest): Corpo da requisição contendo o ID do modelo LLM e, opcionalmente,
+                                          o modo da análise ("agents" ou "context").
 
     Returns:
         dict: Um dicionário contendo 'ai_analysis' (str).
 
     Raises:
-        HTTPException: 500 Internal Server Error se ocorrer um erro durante a análise de IA.
+        HTTPException: 429 Too Many Requests (com Retry-After) se o modelo estiver sem capacidade.
                        (Observação: o serviço já retorna string de erro em caso de falha da IA)
     """
-    print(f"Recebida requisição POST por análise de IA para ticker: {ticker}")
+    logger.info("Recebida requisição POST por análise de IA para ticker: %s", ticker)
 
     # Extrai o ID do modelo do corpo da requisição validado pelo Pydantic
     model_id = request_body.model_id
-    print(f"Modelo de IA solicitado: {model_id}")
+    logger.info("Modelo de IA solicitado: %s", model_id)
 
 
     # Chama a função do serviço de IA com o ticker e o ID do modelo
     # O serviço já trata erros internos da IA e retorna uma string de erro
-    ai_analysis_result = await get_ai_analysis(ticker, model_id)
+    try:
+        ai_analysis_result = await get_ai_analysis(ticker, model_id, request_body.mode)
+    except ModelBusyError as e:
+        raise _model_busy(e)
 
     # O serviço retorna uma string (análise ou mensagem de erro).
     # Envolvemos a string em um dicionário para consistência do formato da resposta JSON.
     return {"ai_analysis": ai_analysis_result}
 
+# ---  Endpoint para Análise de IA em Streaming (GET /analyze/{ticker}/stream, Server-Sent Events) ---
+@router.get("/analyze/{ticker}/stream")
+async def stream_stock_ai_analysis(
+    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1),
+    # GET com o modelo na query permite consumir o stream direto com EventSource no navegador
+    model_id: str = Query(..., min_length=1),
+    # Modo da análise: time de agentes ou chamada única com o contexto em cache (padrão: AI_ANALYSIS_MODE)
+    mode: str | None = Query(None, pattern="^(agents|context)$")
+):
+    """
+    Envia a análise de IA em pedaços, via Server-Sent Events, à medida que o modelo os produz.
+
+    Eventos enviados:
+    - "chunk": {"text": "..."} com o próximo pedaço do texto (já limpo).
+    - "error": {"detail": "..."} se a geração falhar (inclusive no meio do texto); encerra o stream.
+    - "done": {} ao final de um stream bem-sucedido.
+
+    Args:
+        ticker (str): O símbolo do ticker da ação (ex: "MSFT", "AAPL").
+        model_id (str): O ID do modelo LLM Groq a ser usado (um dos modelos de AI_MODELS).
+        mode (str | None): "agents" ou "context".
+
+    Returns:
+        StreamingResponse: O stream text/event-stream.
+
+    Raises:
+        HTTPException: 422 Unprocessable Entity se o modelo não estiver em AI_MODELS.
+        HTTPException: 429 Too Many Requests (com Retry-After) se o modelo estiver sem capacidade.
+    """
+    logger.info("Recebida requisição GET por análise de IA em streaming para ticker: %s (modelo %s)", ticker, model_id)
+
+    # Mesma validação do corpo das rotas POST (feita antes de abrir o stream)
+    try:
+        validate_model_id(model_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # O primeiro pedaço é obtido antes de abrir o stream: sem capacidade no modelo a resposta é um 429
+    pieces = stream_ai_analysis(ticker, model_id, mode)
+    first_piece = first_error = None
+    try:
+        first_piece = await anext(pieces)
+    except ModelBusyError as e:
+        raise _model_busy(e)
+    except AnalysisStreamError as e:
+        first_error = e
+    except StopAsyncIteration:
+        pass
+
+    async def event_stream():
+        try:
+            if first_error is not None:
+                raise first_error
+            if first_piece is not None:
+                yield f"event: chunk\ndata: {json.dumps({'text': first_piece})}\n\n"
+                async for piece in pieces:
+                    yield f"event: chunk\ndata: {json.dumps({'text': piece})}\n\n"
+        except AnalysisStreamError as e:
+            # Evento próprio: o cliente não confunde a mensagem de erro com o texto da análise
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Evita que proxies (ex: Nginx) segurem o stream em buffer
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ---  Endpoints da Fila de Jobs de Análise de IA ---
+@router.post("/analyze/{ticker}/jobs", status_code=202)
+async def submit_stock_ai_analysis_job(
+    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1),
+    request_body: AIAnalysisRequest = Body(...),
+    # Jobs interativos saem da fila antes dos jobs em lote
+    priority: str = Query("interactive", pattern="^(interactive|batch)$")
+):
+    """
+    Enfileira uma análise de IA e retorna imediatamente o job (consultar em GET /analyze/jobs/{job_id}).
+
+    Args:
+        ticker (str): O símbolo do ticker da ação (ex: "MSFT", "AAPL").
+        request_body (AIAnalysisRequest): Corpo da requisição contendo o ID do modelo LLM.
+        priority (str): "interactive" (padrão) ou "batch".
+
+    Returns:
+        dict: O job criado (status "queued").
+
+    Raises:
+        HTTPException: 503 Service Unavailable se a fila estiver cheia.
+    """
+    logger.info("Recebida submissão de job de análise de IA para ticker: %s (modelo %s)", ticker, request_body.model_id)
+    try:
+        job = ai_job_queue.submit_job(ticker, request_body.model_id, priority, request_body.mode)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Fila de análises de IA cheia. Tente novamente mais tarde.")
+    return job.to_dict()
+
+
+@router.post("/analyze/jobs/batch", status_code=202)
+async def submit_watchlist_ai_analysis_jobs(
+    request_body: AIWatchlistJobRequest = Body(...)
+):
+    """
+    Enfileira uma análise de IA para cada ticker de uma watchlist.
+
+    Args:
+        request_body (AIWatchlistJobRequest): Corpo com os tickers, o ID do modelo LLM e a prioridade.
+
+    Returns:
+        dict: Um dicionário contendo 'jobs' (list dos jobs criados).
+
+    Raises:
+        HTTPException: 400 Bad Request se a prioridade for inválida.
+        HTTPException: 503 Service Unavailable se não houver espaço na fila para a watchlist.
+    """
+    logger.info("Recebida submissão de jobs de análise de IA para %s tickers", len(request_body.tickers))
+    try:
+        jobs = ai_job_queue.submit_watchlist(request_body.tickers, request_body.model_id, request_body.priority,
+                                             request_body.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Fila de análises de IA cheia. Tente novamente mais tarde.")
+    return {"jobs": [job.to_dict() for job in jobs]}
+
+
+@router.get("/analyze/jobs/{job_id}")
+async def get_ai_analysis_job(
+    job_id: str = Path(..., min_length=1),
+    # Long polling: aguarda até 'wait' segundos pelo término do job antes de responder
+    wait: float = Query(0, ge=0, le=60)
+):
+    """
+    Retorna o estado (e, quando concluído, o resultado) de um job de análise de IA.
+
+    Args:
+        job_id (str): O ID do job.
+        wait (float): Segundos para aguardar o término do job antes de responder (0 = responde na hora).
+
+    Returns:
+        dict: O job, com 'status' ("queued", "running", "done" ou "failed") e 'ai_analysis' quando concluído.
+
+    Raises:
+        HTTPException: 404 Not Found se o job não existir (ou já tiver expirado).
+    """
+    job = ai_job_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job não encontrado: {job_id}")
+
+    job = await ai_job_queue.wait_for_job(job, wait)
+    return job.to_dict()
+
+# ---  Endpoint de Barras ao Vivo (WebSocket /live) ---
+@router.websocket("/live")
+async def live_bars(websocket: WebSocket):
+    """
+    Streaming de barras intradiárias e indicadores via WebSocket.
+
+    Mensagens do cliente (JSON):
+    - {"action": "subscribe", "tickers": ["AAPL", "MSFT"], "interval": "1m", "indicators": "sma_20,rsi_14"}
+      ("interval" e "indicators" são opcionais; padrão "1m" e "sma_20,ema_20").
+    - {"action": "unsubscribe", "tickers": ["AAPL"], "interval": "1m"} ("interval" opcional: sem ele, todos).
+
+    Mensagens do servidor: "snapshot" com as últimas barras de cada ticker inscrito e, depois,
+    "bars" apenas com as barras novas ou alteradas (ver live_bars_service.LiveSubscriber).
+    Cada ticker+intervalo é consultado no Yahoo por um único poller, compartilhado por todas as conexões.
+    """
+    await websocket.accept()
+    subscriber = live_bars_service.LiveSubscriber()
+
+    async def send_loop():
+        while True:
+            message = await subscriber.queue.get()
+            await websocket.send_text(json.dumps(message))
+
+    sender = asyncio.create_task(send_loop())
+    try:
+        while True:
+            raw_message = await websocket.receive_text()
+            try:
+                message = json.loads(raw_message)
+                action = message.get("action")
+                tickers = message.get("tickers") or []
+                if not isinstance(tickers, list) or not all(isinstance(t, str) and t for t in tickers):
+                    raise ValueError("'tickers' deve ser uma lista de símbolos")
+
+                if action == "subscribe":
+                    interval = message.get("interval", "1m")
+                    specs = parse_specs(message.get("indicators") or DEFAULT_INDICATORS)
+                    for ticker in tickers:
+                        live_bars_service.subscribe(subscriber, ticker, interval, specs)
+                    logger.info("Inscrição ao vivo em %s (%s)", tickers, interval)
+                elif action == "unsubscribe":
+                    for ticker in tickers:
+                        live_bars_service.unsubscribe(subscriber, ticker, message.get("interval"))
+                else:
+                    raise ValueError(f"Ação desconhecida: {action}")
+            except (ValueError, AttributeError) as e:
+                # JSON inválido (json.JSONDecodeError é um ValueError), mensagem fora do formato ou limite atingido
+                subscriber.send({"type": "error", "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        live_bars_service.unsubscribe_all(subscriber)
+
+# ---  Endpoints de Backtesting ---
+@router.post("/backtest/sweep")
+async def sweep_backtest_parameters(
+    request_body: BacktestSweepRequest = Body(...)
+):
+    """
+    Avalia uma grade de parâmetros de uma estratégia em vários tickers e retorna as melhores combinações.
+
+    As combinações são calculadas em matrizes (todas de uma vez por ticker) e distribuídas
+    entre processos, então centenas de combinações em dezenas de tickers levam segundos.
+
+    Args:
+        request_body (BacktestSweepRequest): Tickers, estratégia, grade de parâmetros, período,
+                                             intervalo, custo, quantidade de resultados e métrica de ordenação.
+
+    Returns:
+        dict: 'results' (ticker, params e métricas de cada combinação, da melhor para a pior),
+              'evaluated', 'not_found' e 'elapsed_seconds'.
+
+    Raises:
+        HTTPException: 400 Bad Request se a grade, os parâmetros ou o número de tickers forem inválidos.
+    """
+    logger.info("Recebida varredura de backtesting (%s) para %s tickers", request_body.strategy, len(request_body.tickers))
+    try:
+        return await backtest_service.run_sweep(
+            request_body.tickers, request_body.strategy, request_body.grid,
+            request_body.period, request_body.interval, request_body.cost_bps,
+            request_body.top, request_body.rank_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/backtest/{ticker}")
+async def backtest_stock_strategy(
+    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1),
+    request_body: BacktestRequest = Body(...)
+):
+    """
+    Executa uma estratégia (cruzamento de médias, RSI ou rompimento) sobre o histórico em cache de um ticker.
+
+    Args:
+        ticker (str): O símbolo do ticker (ex: "AAPL").
+        request_body (BacktestRequest): Estratégia, parâmetros, período, intervalo e custo por operação.
+
+    Returns:
+        dict: 'params', 'metrics' (retorno, Sharpe, drawdown máximo, operações, taxa de acerto...),
+              'trades' e 'equity_curve' (Date, Close, Position, Equity, Drawdown por barra).
+
+    Raises:
+        HTTPException: 400 Bad Request se a estratégia ou os parâmetros forem inválidos.
+        HTTPException: 404 Not Found se os dados para o ticker não forem encontrados.
+    """
+    logger.info("Recebida requisição de backtesting (%s) para ticker: %s", request_body.strategy, ticker)
+    try:
+        result = await backtest_service.run_backtest(
+            ticker, request_body.strategy, request_body.params,
+            request_body.period, request_body.interval, request_body.cost_bps
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Dados históricos não encontrados para: {ticker}")
+    return result
+
+# ---  Endpoints do Screener ---
+@router.post("/screener")
+async def screen_stocks(
+    request_body: ScreenerRequest = Body(...)
+):
+    """
+    Avalia um filtro em todos os tickers de um universo e retorna os aprovados, ordenados.
+
+    Exemplos de filtro: "close > SMA_20 and volume > 2 * avg(volume, 20)", "RSI_14 < 30",
+    "close >= max(high, 20)". Campos: open, high, low, close, volume; indicadores como em /data
+    (sma_N, ema_N, rsi_N, atr_N, macd, bb_upper...); funções avg, max, min, prev, change e abs.
+
+    Args:
+        request_body (ScreenerRequest): Filtro, universo (ou tickers), ordenação, quantidade, período e intervalo.
+
+    Returns:
+        dict: 'matches' (ticker, close, rank_value e os valores citados no filtro), 'matched',
+              'evaluated', 'not_found' e 'elapsed_seconds'.
+
+    Raises:
+        HTTPException: 400 Bad Request se o filtro, a ordenação ou o universo forem inválidos.
+    """
+    logger.info("Recebida consulta do screener: %s", request_body.expression)
+    try:
+        return await screener_service.run_screen(
+            request_body.expression, request_body.universe, request_body.tickers,
+            request_body.rank_by, request_body.ascending, request_body.top,
+            request_body.period, request_body.interval
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/screener/universes")
+async def list_screener_universes():
+    """
+    Retorna os universos de tickers pré-definidos do screener.
+
+    Returns:
+        dict: 'universes' (nome -> lista de tickers).
+    """
+    return {"universes": UNIVERSES}
+
+# ---  Endpoint de Análise de Carteira ---
+@router.post("/portfolio")
+async def analyze_portfolio_risk(
+    request_body: PortfolioRequest = Body(...)
+):
+    """
+    Analisa o risco de uma carteira: covariância e correlação entre os ativos, volatilidade,
+    beta contra um índice e a contribuição de cada ativo para o risco total.
+
+    Args:
+        request_body (PortfolioRequest): Tickers, pesos, índice de referência, janela, período e intervalo.
+
+    Returns:
+        dict: 'volatility' e 'beta' da carteira, 'assets' (por ativo), 'covariance' e 'correlation'
+              (janela mais recente), 'rolling' (séries móveis da carteira) e, se pedido, 'correlation_history'.
+
+    Raises:
+        HTTPException: 400 Bad Request se os tickers, os pesos ou a janela forem inválidos ou faltarem dados.
+    """
+    logger.info("Recebida análise de carteira com %s ativos", len(request_body.tickers))
+    try:
+        return await portfolio_service.analyze_portfolio(
+            request_body.tickers, request_body.weights, request_body.benchmark,
+            request_body.window, request_body.period, request_body.interval,
+            request_body.history_step
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ---  Endpoint para Informações da Empresa (GET /info/{ticker}) ---
 @router.get("/info/{ticker}")
 async def get_stock_company_info(
-    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1)
+    ticker: str = Path(..., title="Stock Ticker Symbol", min_length=1),
+    if_none_match: str | None = Header(None)
 ):
     """
     Retorna informações básicas da empresa para um dado ticker.
+    Com If-None-Match igual à ETag atual, a resposta é um 304 sem corpo.
 
     Args:
         ticker (str): O símbolo do ticker da empresa (ex: "MSFT").
+        if_none_match (str | None): O cabeçalho If-None-Match (ETags já em poder do cliente).
 
     Returns:
-        dict: Um dicionário contendo 'company_info' (dict de informações selecionadas).
+        JSONResponse: 'company_info' (dict de informações selecionadas), ou 304 Not Modified.
 
     Raises:
         HTTPException: 404 Not Found se o ticker for inválido ou informações não forem encontradas.
     """
-    print(f"Recebida requisição GET por informações da empresa para ticker: {ticker}")
+    logger.info("Recebida requisição GET por informações da empresa para ticker: %s", ticker)
 
-    # Chama a nova função da ferramenta para obter informações da empresa
-    company_info = get_company_info(ticker)
+    # Busca as informações da empresa fora do event loop (requisições iguais compartilham a busca)
+    company_info = await fetch_company_info(ticker)
 
     # Verifica se as informações foram encontradas
     if company_info is None:
-        print(f"Informações da empresa não encontradas para o ticker: {ticker}")
+        logger.info("Informações da empresa não encontradas para o ticker: %s", ticker)
         # Retorna 404 se a ferramenta não encontrou info (ticker inválido, etc.)
         raise HTTPException(status_code=404, detail=f"Informações da empresa não encontradas para: {ticker}")
 
-    print(f"Informações da empresa encontradas para o ticker: {ticker}")
+    logger.info("Informações da empresa encontradas para o ticker: %s", ticker)
+    payload = {"company_info": company_info}
+    headers = {"ETag": http_cache.json_etag(payload), "Cache-Control": http_cache.info_cache_control()}
+    if http_cache.etag_matches(if_none_match, headers["ETag"]):
+        return http_cache.not_modified(headers)
     # Retorna as informações em um dicionário
-    return {"company_info": company_info}
+    return JSONResponse(content=payload, headers=headers)
 
 
 
@@ -0,0 +1,265 @@
+# backend/src/services/ai_job_queue.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import uuid
+
+# Execução da análise de IA (com cache e agrupamento de execuções idênticas)
+from src.services.ai_service import run_ai_analysis
+# Limites por modelo (execuções simultâneas e taxa), compartilhados com as rotas de análise direta
+from src.services import ai_model_limits
+# Importa as configurações (workers, limites por modelo, retenção)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prioridades: números menores saem da fila primeiro
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+class AIJob:
+    """
+    Um pedido de análise de IA (ticker + modelo) e o seu estado na fila.
+    Estados: "queued" -> "running" -> "done" | "failed".
+    """
+
+    def __init__(self, ticker: str, model_id: str, priority: str, mode: str | None = None):
+        self.id = uuid.uuid4().hex
+        self.ticker = ticker.upper()
+        self.model_id = model_id
+        self.priority = priority
+        # Modo da análise ("agents" ou "context")
+        self.mode = mode
+        self.status = "queued"
+        self.result: str | None = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        # Sinalizado quando o job termina (sucesso ou falha), para quem aguarda o resultado
+        self.finished = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "ticker": self.ticker,
+            "model_id": self.model_id,
+            "priority": self.priority,
+            "mode": self.mode,
+            "status": self.status,
+            "ai_analysis": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class _ModelQueue:
+    """
+    Jobs em espera de um modelo Groq. Um job só sai desta fila quando o modelo tem capacidade para
+    executá-lo (ver ai_model_limits: as análises diretas ocupam os mesmos limites).
+    """
+
+    def __init__(self, model_id: str):
+        self.limits = ai_model_limits.model_limits(model_id)
+        # Heap de (prioridade, sequência, job_id)
+        self.pending: list[tuple[int, int, str]] = []
+
+
+# Estado da fila (o despachante roda no event loop da aplicação)
+_model_queues: dict[str, _ModelQueue] = {}
+_jobs: dict[str, AIJob] = {}
+_running: set[asyncio.Task] = set()
+_dispatcher: asyncio.Task | None = None
+# Sinaliza ao despachante que há job novo ou capacidade liberada
+_wakeup: asyncio.Event | None = None
+_queued = 0
+# Desempate FIFO entre jobs de mesma prioridade
+_sequence = itertools.count()
+
+
+def _model_queue(model_id: str) -> _ModelQueue:
+    queue = _model_queues.get(model_id)
+    if queue is None:
+        queue = _model_queues[model_id] = _ModelQueue(model_id)
+    return queue
+
+
+async def _run_job(job: AIJob, queue: _ModelQueue) -> None:
+    job.status = "running"
+    job.started_at = time.time()
+    try:
+        job.result = await run_ai_analysis(job.ticker, job.model_id, job.mode)
+        job.status = "done"
+    except Exception as e:
+        logger.error("Erro no job de análise de IA %s (%s, %s): %s", job.id, job.ticker, job.model_id, e)
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        job.finished_at = time.time()
+        job.finished.set()
+        ai_model_limits.release(queue.limits)
+
+
+def _dispatch_ready() -> float | None:
+    """
+    Inicia, em ordem de prioridade, os jobs cujos modelos têm capacidade (execução livre e ficha no
+    token bucket), até AI_JOB_WORKERS execuções no total. Jobs de um modelo ocupado esperam na fila
+    do modelo sem ocupar uma execução, e não atrasam os jobs dos demais modelos.
+
+    Returns:
+        float | None: Segundos até a próxima ficha de um modelo que só espera pela taxa, ou None se
+                      não houver job aguardando ficha (o despachante espera por um novo sinal).
+    """
+    global _queued
+    retry_after = None
+    while len(_running) < settings.AI_JOB_WORKERS:
+        ready = [q for q in _model_queues.values() if q.pending and q.limits.running < q.limits.concurrency]
+        started = False
+        # Ordem global de prioridade: o job de menor (prioridade, sequência) entre os modelos livres
+        for queue in sorted(ready, key=lambda q: q.pending[0]):
+            wait_seconds = queue.limits.bucket.try_acquire()
+            if wait_seconds > 0:
+                retry_after = wait_seconds if retry_after is None else min(retry_after, wait_seconds)
+                continue
+            _, _, job_id = heapq.heappop(queue.pending)
+            _queued -= 1
+            job = _jobs.get(job_id)
+            if job is None:
+                continue
+            queue.limits.running += 1
+            task = asyncio.create_task(_run_job(job, queue))
+            _running.add(task)
+            task.add_done_callback(_running.discard)
+            started = True
+            break
+        if not started:
+            break
+    return retry_after
+
+
+async def _dispatch() -> None:
+    while True:
+        _wakeup.clear()
+        retry_after = _dispatch_ready()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), retry_after)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _wake() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def _ensure_started() -> None:
+    """
+    Cria o despachante na primeira utilização (dentro do event loop da aplicação).
+    """
+    global _dispatcher, _wakeup
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+        # Execuções liberadas pelas análises diretas também podem destravar jobs em espera
+        ai_model_limits.on_release(_wake)
+    if _dispatcher is None:
+        _dispatcher = asyncio.create_task(_dispatch())
+
+
+def _prune_finished() -> None:
+    """
+    Remove jobs concluídos há mais tempo que AI_JOB_RETENTION_SECONDS.
+    """
+    limit = time.time() - settings.AI_JOB_RETENTION_SECONDS
+    expired = [job_id for job_id, job in _jobs.items() if job.finished_at is not None and job.finished_at < limit]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def submit_job(ticker: str, model_id: str, priority: str = "interactive", mode: str | None = None) -> AIJob:
+    """
+    Enfileira uma análise de IA e devolve o job imediatamente (sem aguardar a execução).
+
+    Args:
+        ticker (str): O símbolo do ticker da ação.
+        model_id (str): O ID do modelo Groq a ser usado.
+        priority (str): "interactive" (padrão) ou "batch"; jobs interativos saem da fila antes.
+        mode (str | None): Modo da análise, "agents" ou "context". O padrão é settings.AI_ANALYSIS_MODE.
+
+    Returns:
+        AIJob: O job criado, com status "queued".
+
+    Raises:
+        ValueError: Se a prioridade for inválida.
+        asyncio.QueueFull: Se a fila estiver cheia.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Prioridade inválida: {priority}")
+
+    _ensure_started()
+    _prune_finished()
+
+    global _queued
+    if settings.AI_JOB_MAX_QUEUED and _queued >= settings.AI_JOB_MAX_QUEUED:
+        raise asyncio.QueueFull()
+
+    job = AIJob(ticker, model_id, priority, mode or settings.AI_ANALYSIS_MODE)
+    heapq.heappush(_model_queue(model_id).pending, (PRIORITIES[priority], next(_sequence), job.id))
+    _queued += 1
+    _jobs[job.id] = job
+    _wakeup.set()
+    return job
+
+
+def submit_watchlist(tickers: list[str], model_id: str, priority: str = "batch",
+                     mode: str | None = None) -> list[AIJob]:
+    """
+    Enfileira uma análise para cada ticker de uma watchlist (tickers repetidos são ignorados).
+
+    Raises:
+        ValueError: Se a prioridade for inválida.
+        asyncio.QueueFull: Se não houver espaço na fila para a watchlist inteira.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    _ensure_started()
+    if settings.AI_JOB_MAX_QUEUED and _queued + len(tickers) > settings.AI_JOB_MAX_QUEUED:
+        raise asyncio.QueueFull()
+    return [submit_job(ticker, model_id, priority, mode) for ticker in tickers]
+
+
+def get_job(job_id: str) -> AIJob | None:
+    """
+    Retorna o job pelo ID, ou None se ele não existir (ou já tiver sido removido).
+    """
+    return _jobs.get(job_id)
+
+
+async def wait_for_job(job: AIJob, timeout: float) -> AIJob:
+    """
+    Aguarda o término do job por até 'timeout' segundos (long polling) e devolve o job no estado atual.
+    """
+    if timeout > 0 and not job.finished.is_set():
+        try:
+            await asyncio.wait_for(job.finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return job
+
+
+async def shutdown() -> None:
+    """
+    Cancela o despachante e as execuções em andamento (usado no encerramento da aplicação).
+    """
+    global _dispatcher, _wakeup, _queued
+    tasks = [t for t in (_dispatcher, *_running) if t is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _running.clear()
+    _model_queues.clear()
+    _dispatcher = _wakeup = None
+    _queued = 0
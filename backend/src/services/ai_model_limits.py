@@ -0,0 +1,94 @@
+# backend/src/services/ai_model_limits.py
+
+import logging
+from contextlib import contextmanager
+from typing import Callable
+
+# Limitador de taxa por modelo
+from src.utils.rate_limit import TokenBucket
+# Importa as configurações (limites por modelo)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ModelBusyError(RuntimeError):
+    """
+    O modelo está sem execução livre ou sem ficha no token bucket; 'retry_after' indica em quantos
+    segundos vale tentar de novo.
+    """
+
+    def __init__(self, model_id: str, retry_after: float):
+        super().__init__(f"Limite de requisições do modelo {model_id} atingido. Tente novamente em instantes.")
+        self.model_id = model_id
+        self.retry_after = retry_after
+
+
+class ModelLimits:
+    """
+    Limites de um modelo Groq: execuções simultâneas e taxa de requisições (token bucket).
+    Compartilhados pela fila de jobs e pelas rotas de análise direta (POST e streaming).
+    """
+
+    def __init__(self, model_id: str):
+        limits = settings.AI_MODEL_LIMITS.get(model_id, {})
+        requests_per_minute = limits.get("requests_per_minute", settings.AI_MODEL_REQUESTS_PER_MINUTE)
+        burst = limits.get("burst", settings.AI_MODEL_BURST)
+
+        self.concurrency = limits.get("concurrency", settings.AI_MODEL_MAX_CONCURRENCY)
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.running = 0
+
+
+_limits: dict[str, ModelLimits] = {}
+# Chamadas a cada execução liberada (ex: o despachante da fila de jobs, que pode ter jobs aguardando)
+_release_listeners: list[Callable[[], None]] = []
+
+
+def model_limits(model_id: str) -> ModelLimits:
+    """
+    Retorna (criando na primeira utilização) os limites do modelo.
+    """
+    limits = _limits.get(model_id)
+    if limits is None:
+        limits = _limits[model_id] = ModelLimits(model_id)
+    return limits
+
+
+def on_release(listener: Callable[[], None]) -> None:
+    """
+    Registra uma função chamada sempre que uma execução de modelo é liberada.
+    """
+    if listener not in _release_listeners:
+        _release_listeners.append(listener)
+
+
+def release(limits: ModelLimits) -> None:
+    """
+    Libera uma execução ocupada no modelo e avisa quem aguarda capacidade.
+    """
+    limits.running -= 1
+    for listener in _release_listeners:
+        listener()
+
+
+@contextmanager
+def model_slot(model_id: str):
+    """
+    Ocupa, sem esperar, uma execução e uma ficha do modelo durante o bloco.
+
+    Raises:
+        ModelBusyError: Se o modelo estiver com todas as execuções ocupadas ou sem fichas.
+    """
+    limits = model_limits(model_id)
+    if limits.running >= limits.concurrency:
+        raise ModelBusyError(model_id, 1.0)
+    wait_seconds = limits.bucket.try_acquire()
+    if wait_seconds > 0:
+        raise ModelBusyError(model_id, wait_seconds)
+
+    limits.running += 1
+    try:
+        yield
+    finally:
+        release(limits)
@@ -1,64 +1,504 @@
 # backend/src/services/ai_service.py
 
+import logging
 import re
-# Importa Groq para criar uma instância de modelo com o ID fornecido
-from phi.model.groq import Groq
-# Importa a instância do time de agentes (ainda precisamos dela para a configuração base e instruções)
-from src.tools.phi_agent_setup import multi_ai_agent
-# Importa as configurações para obter a API KEY
+from contextlib import nullcontext
+from datetime import datetime
+from zoneinfo import ZoneInfo
+# Pool de times de agentes por modelo (clientes Groq reutilizados entre requisições) e chamada única ao modelo
+from src.tools.phi_agent_setup import agent_team, complete, is_ai_configured
+# Execução no pool de workers de dados de mercado (montagem do contexto, que lê os caches)
+from src.services.market_data_service import run_in_pool
+# Importa as configurações para obter os parâmetros do cache
 from src.config.config import settings
+# Cache com expiração/LRU e agrupamento de chamadas concorrentes
+from src.utils.ttl_cache import TTLCache
+from src.utils.singleflight import SingleFlight
+# Cache e travas compartilhados entre os workers do host
+from src.utils import shared_cache
+# Métricas de duração das etapas e de acerto dos caches
+from src.utils import metrics
+# Prazos, novas tentativas e disjuntor por modelo das chamadas à Groq
+from src.utils import resilience
+# Execuções simultâneas e taxa por modelo (as mesmas da fila de jobs)
+from src.services.ai_model_limits import ModelBusyError, model_slot
+
+logger = logging.getLogger(__name__)
+
+
+# Análises já geradas, chaveadas por (ticker, modelo, modo, pregão): no cache compartilhado pelos workers
+# do host ou, com ele desligado, em memória (opcionalmente espelhadas em AI_CACHE_DIR)
+if settings.SHARED_CACHE_ENABLED:
+    _analysis_cache = shared_cache.SharedCache("ai_analysis", settings.AI_CACHE_TTL_SECONDS)
+else:
+    _analysis_cache = TTLCache(
+        max_entries=settings.AI_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.AI_CACHE_TTL_SECONDS,
+        disk_dir=settings.AI_CACHE_DIR or None,
+    )
+
+# Execuções do time de agentes em andamento, compartilhadas entre requisições idênticas
+_single_flight = SingleFlight()
+
+# Modos da análise: o time de agentes busca os dados com as próprias ferramentas; no modo "context"
+# os dados em cache vão direto no prompt de uma única chamada ao modelo
+ANALYSIS_MODES = ("agents", "context")
+
+# Instruções do modo "context" (as mesmas do time de agentes, restritas aos dados fornecidos)
+_CONTEXT_INSTRUCTIONS = (
+    "Você é um analista financeiro. Com base apenas nos dados fornecidos pelo usuário, resuma a "
+    "recomendação dos analistas, a situação do preço e dos indicadores técnicos e as últimas notícias. "
+    "Use tabelas para mostrar os dados e sempre inclua as fontes das notícias. Se a recomendação ou "
+    "as notícias não estiverem nos dados, indique isso claramente."
+)
+
+# Resposta quando o modelo não devolve texto
+_EMPTY_ANALYSIS = "Análise de IA concluída, mas nenhum resumo detalhado foi gerado."
+
+
+def _trading_day() -> str:
+    """
+    Data do pregão corrente (horário de Nova York), usada para não reaproveitar análises de outro dia.
+    """
+    return datetime.now(ZoneInfo("America/New_York")).date().isoformat()
+
+
+def _resolve_mode(mode: str | None) -> str:
+    """
+    Modo da análise pedido, ou o padrão (AI_ANALYSIS_MODE).
+
+    Raises:
+        ValueError: Se o modo for desconhecido.
+    """
+    mode = (mode or settings.AI_ANALYSIS_MODE).lower()
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Modo de análise inválido: {mode}")
+    return mode
+
+
+def _cache_key(ticker: str, model_id: str, mode: str) -> tuple:
+    return (ticker, model_id, mode, _trading_day())
+
+
+def _ai_context():
+    """
+    Montagem do contexto (pandas), importada no primeiro uso.
+    """
+    from src.tools import ai_context
+    return ai_context
+
+
+async def _context_messages(ticker: str) -> list[dict]:
+    """
+    Mensagens da chamada única do modo "context": as instruções e o contexto montado dos caches.
+
+    Raises:
+        ValueError: Se não houver dados do ticker.
+    """
+    with metrics.stage("ai_context"):
+        context = await run_in_pool(_ai_context().build_context, ticker)
+    if context is None:
+        raise ValueError(f"Dados não encontrados para {ticker}")
+    return [{"role": "system", "content": _CONTEXT_INSTRUCTIONS}, {"role": "user", "content": context}]
+
+
+def _clean_analysis(raw_analysis_content: str) -> str:
+    """
+    Remove da resposta do time de agentes os logs de execução ("Running: ...") e de transferência de tarefa.
+    """
+    return re.sub(
+        r"(Running:[\s\S]*?\n\n)|(^transfer_task_to_finance_ai_agent.*\n?)",
+        "",
+        raw_analysis_content,
+        flags=re.MULTILINE
+    ).strip()
+
+
+async def _run_ai_analysis(ticker: str, model_id: str, mode: str) -> str:
+    """
+    Executa o time de agentes (ou, no modo "context", a chamada única ao modelo) e limpa a resposta.
+    As chamadas ao modelo têm prazo, novas tentativas e disjuntor (ver resilience.llm).
+    Erros são propagados para o chamador.
+    """
+    upstream = resilience.llm(model_id)
+    if mode == "context":
+        messages = await _context_messages(ticker)
+        with metrics.stage("llm_completion"):
+            analysis = await upstream.call_async(
+                lambda: complete(model_id, messages, settings.AI_CONTEXT_MAX_TOKENS)
+            )
+        return analysis.strip() or _EMPTY_ANALYSIS
+
+    prompt = f"Resumir a recomendação do analista e compartilhar as últimas notícias para {ticker}"
+
+    async def run_team():
+        # Empresta do pool um time coordenado pelo modelo pedido (criado no primeiro uso e reaproveitado)
+        # e o executa de forma assíncrona, sem bloquear o event loop; cada tentativa usa o seu time
+        with agent_team(model_id) as team:
+            return await team.arun(prompt)
+
+    with metrics.stage("llm_agent"):
+        ai_response = await upstream.call_async(run_team)
+
+    raw_analysis_content = ai_response.content
+
+    # Limpa a resposta (a regex permanece a mesma)
+    clean_response = _clean_analysis(raw_analysis_content)
+
+    return clean_response if clean_response else _EMPTY_ANALYSIS
+
+
+async def _run_and_cache(key: tuple, ticker: str, model_id: str, mode: str, reserve: bool) -> str:
+    """
+    Executa a análise e grava o resultado no cache (apenas execuções bem-sucedidas são gravadas).
+    Com o cache compartilhado, só um worker do host executa o time de agentes para cada chave;
+    os demais esperam a trava e leem a análise gravada por ele.
+
+    Com 'reserve', a execução ocupa uma vaga e uma ficha do modelo (a fila de jobs já as reserva
+    ao despachar o job).
+    """
+    if not settings.SHARED_CACHE_ENABLED:
+        with model_slot(model_id) if reserve else nullcontext():
+            analysis = await _run_ai_analysis(ticker, model_id, mode)
+        _analysis_cache.set(key, analysis)
+        return analysis
+
+    async with shared_cache.async_file_lock(f"ai:{key!r}"):
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            return analysis
+        with model_slot(model_id) if reserve else nullcontext():
+            analysis = await _run_ai_analysis(ticker, model_id, mode)
+        _analysis_cache.set(key, analysis)
+        return analysis
+
+
+# Mensagem devolvida quando a IA não está configurada
+AI_UNAVAILABLE_MESSAGE = "A análise de IA não está disponível. Verifique a configuração da API KEY."
+
+
+def is_ai_available() -> bool:
+    """
+    Indica se a API KEY está configurada (os times de agentes são criados sob demanda).
+    """
+    return is_ai_configured()
+
+
+async def run_ai_analysis(ticker: str, model_id: str, mode: str | None = None, reserve: bool = False) -> str:
+    """
+    Executa a análise de IA (com cache e agrupamento de execuções idênticas), propagando os erros.
+    Usada por quem precisa distinguir falha de sucesso (ex: a fila de jobs); as rotas usam get_ai_analysis.
+
+    Args:
+        ticker (str): O símbolo do ticker da ação.
+        model_id (str): O ID do modelo Groq a ser usado para esta análise.
+        mode (str | None): "agents" ou "context" (ver ANALYSIS_MODES). O padrão é settings.AI_ANALYSIS_MODE.
+        reserve (bool): Ocupa uma vaga e uma ficha do modelo ao executar (chamadas fora da fila de jobs).
+
+    Returns:
+        str: O texto da análise gerada pela IA.
+
+    Raises:
+        RuntimeError: Se a IA não estiver configurada.
+        ValueError: Se o modo for inválido ou, no modo "context", não houver dados do ticker.
+        ModelBusyError: Com 'reserve', se o modelo estiver sem vaga ou sem ficha.
+        resilience.UpstreamError: Se o modelo falhar em todas as tentativas, estourar o prazo ou estiver
+                                  com o circuito aberto, e não houver análise antiga do pregão em cache.
+        Exception: Qualquer erro da execução do time de agentes (API Groq, modelo inválido, etc.).
+    """
+    if not is_ai_available():
+        raise RuntimeError(AI_UNAVAILABLE_MESSAGE)
+
+    mode = _resolve_mode(mode)
+    ticker = ticker.upper()
+    key = _cache_key(ticker, model_id, mode)
+
+    cached_analysis = _analysis_cache.get(key)
+    metrics.cache_result("ai_analysis", "miss" if cached_analysis is None else "hit")
+    if cached_analysis is not None:
+        logger.info("Análise de IA servida do cache para %s com modelo %s", ticker, model_id)
+        return cached_analysis
+
+    try:
+        return await _single_flight.do(key, lambda: _run_and_cache(key, ticker, model_id, mode, reserve))
+    except resilience.UpstreamError as e:
+        stale_analysis = _stale_analysis(key)
+        if stale_analysis is None:
+            raise
+        logger.warning("Servindo análise de IA antiga do cache para %s com modelo %s: %s", ticker, model_id, e)
+        return stale_analysis
+
+
+def _stale_analysis(key: tuple) -> str | None:
+    """
+    Análise expirada do mesmo pregão, servida quando o modelo está indisponível
+    (só com o cache compartilhado, que guarda os valores expirados).
+    """
+    if not settings.SHARED_CACHE_ENABLED:
+        return None
+    stale_analysis = _analysis_cache.get(key, allow_stale=True)
+    if stale_analysis is not None:
+        metrics.cache_result("ai_analysis", "stale")
+    return stale_analysis
 
 
 # A função agora aceita 'model_id'
-async def get_ai_analysis(ticker: str, model_id: str) -> str:
+async def get_ai_analysis(ticker: str, model_id: str, mode: str | None = None) -> str:
     """
     Executa a análise de IA para um ticker, usando o time de agentes e um modelo LLM específico.
 
+    O resultado é reaproveitado por (ticker, model_id, modo, pregão) durante AI_CACHE_TTL_SECONDS, e
+    requisições idênticas simultâneas aguardam a mesma execução do time de agentes.
+
+    No modo "context" o time de agentes não é usado: preço, indicadores, fundamentos, consenso dos
+    analistas e notícias saem dos caches locais e vão em um prompt compacto para uma única chamada
+    ao modelo, sem as idas e vindas das ferramentas.
+
     Args:
         ticker (str): O símbolo do ticker da ação.
         model_id (str): O ID do modelo Groq a ser usado para esta análise (ex: "llama-3.1-70b-versatile").
+        mode (str | None): "agents" ou "context". O padrão é settings.AI_ANALYSIS_MODE.
 
     Returns:
         str: O texto da análise gerada pela IA, ou uma mensagem de erro/indisponibilidade.
+
+    Raises:
+        ModelBusyError: Se o modelo estiver sem vaga ou sem ficha (os limites são os da fila de jobs).
     """
-    # Embora o agente base tenha sido inicializado, ainda verificamos a API_KEY
-    # Se a API_KEY não estiver configurada, phi_agent_setup pode ter deixado multi_ai_agent como None
-    # Ou a chave pode ser inválida, causando erro na chamada run().
-    if multi_ai_agent is None or not settings.GROQ_API_KEY:
-        return "A análise de IA não está disponível. Verifique a configuração da API KEY."
+    # Sem a API_KEY os agentes não são criados; uma chave inválida causa erro na execução.
+    if not is_ai_available():
+        return AI_UNAVAILABLE_MESSAGE
 
     try:
-        prompt = f"Resumir a recomendação do analista e compartilhar as últimas notícias para {ticker}"
+        return await run_ai_analysis(ticker, model_id, mode, reserve=True)
+
+    except ModelBusyError:
+        raise
+
+    except Exception as e:
+        # Captura erros durante a execução do agente (erro da API Groq, modelo inválido, etc.)
+        logger.error("Erro durante a execução do Agente de IA para %s com modelo %s: %s", ticker, model_id, e)
+        # Retorna uma mensagem de erro mais específica
+        return f"Ocorreu um erro ao gerar a análise de IA para {ticker} com modelo {model_id}: {e}"
+
+
+class AnalysisStreamError(RuntimeError):
+    """
+    Falha na geração de uma análise em streaming; a mensagem pode ser mostrada ao usuário.
+    """
+
+
+class _StreamCleaner:
+    """
+    Aplica, de forma incremental, a mesma limpeza da regex de _run_ai_analysis sobre um stream de texto:
+    remove blocos "Running: ..." até a próxima linha em branco e linhas "transfer_task_to_finance_ai_agent...".
+
+    Só é emitido o texto que nenhum pedaço futuro pode alterar; o restante fica retido até chegar
+    mais texto (ou até finish()).
+    """
+
+    _RUNNING = "Running:"
+    _TRANSFER = "transfer_task_to_finance_ai_agent"
+
+    def __init__(self):
+        self._buffer = ""
+        self._skipping = False      # Dentro de um bloco "Running:" (aguardando a linha em branco)
+        self._line_start = True     # O buffer começa no início de uma linha
+        self._started = False       # Já emitiu texto não vazio (para o strip() inicial)
+        self._trailing = ""         # Espaços finais retidos (para o strip() final)
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        text = self._trailing + text
+        emitted = text.rstrip()
+        self._trailing = text[len(emitted):]
+        return emitted
+
+    def feed(self, chunk: str) -> str:
+        """
+        Recebe um pedaço do stream e devolve o texto limpo que já pode ser enviado ao cliente.
+        """
+        self._buffer += chunk
+        out = []
+
+        while self._buffer:
+            if self._skipping:
+                end = self._buffer.find("\n\n")
+                if end < 0:
+                    # Bloco ainda aberto: tudo fica retido (se o stream acabar sem fechá-lo,
+                    # a regex original também não o removeria e finish() devolve o texto)
+                    break
+                self._buffer = self._buffer[end + 2:]
+                self._skipping = False
+                self._line_start = True
+                continue
+
+            newline = self._buffer.find("\n")
+            line = self._buffer if newline < 0 else self._buffer[:newline + 1]
+
+            if self._line_start and line.startswith(self._TRANSFER):
+                if newline < 0:
+                    break  # Linha a descartar ainda incompleta
+                self._buffer = self._buffer[newline + 1:]
+                continue
 
-        # --- MODIFICAÇÃO CHAVE ---
-        # Criamos uma nova instância do modelo Groq com o model_id fornecido
-        # e passamos ela para o argumento 'model' do método run().
-        # Isso sobrescreve o modelo padrão configurado no agente apenas para esta execução.
-        llm_for_run = Groq(id=model_id, api_key=settings.GROQ_API_KEY)
+            running = line.find(self._RUNNING)
+            if running >= 0:
+                out.append(line[:running])
+                self._buffer = self._buffer[running:]
+                self._skipping = True
+                continue
 
-        # Executa o time de agentes, usando o modelo LLM especificado para esta rodada
-        ai_response = await multi_ai_agent.run(prompt, model=llm_for_run)
-        # --- FIM MODIFICAÇÃO CHAVE ---
+            if newline >= 0:
+                out.append(line)
+                self._buffer = self._buffer[newline + 1:]
+                self._line_start = True
+                continue
 
+            # Linha incompleta: retém o que ainda pode virar "transfer_task..." (no início da linha)
+            # ou o início de um "Running:" no final do texto
+            if self._line_start and self._TRANSFER.startswith(line):
+                break
+            hold = next((k for k in range(len(self._RUNNING) - 1, 0, -1)
+                         if line.endswith(self._RUNNING[:k])), 0)
+            out.append(line[:len(line) - hold])
+            self._buffer = line[len(line) - hold:]
+            self._line_start = self._line_start and not line[:len(line) - hold]
+            break
 
-        raw_analysis_content = ai_response.content
+        return self._emit("".join(out))
 
-        # Limpa a resposta (a regex permanece a mesma)
-        clean_response = re.sub(
-            r"(Running:[\s\S]*?\n\n)|(^transfer_task_to_finance_ai_agent.*\n?)",
-            "",
-            raw_analysis_content,
-            flags=re.MULTILINE
-        ).strip()
+    def finish(self) -> str:
+        """
+        Fim do stream: devolve o texto ainda retido (blocos não terminados não são removidos, como na regex).
+        """
+        if self._skipping:
+            # Bloco "Running:" sem linha em branco: a regex não o removeria (só as linhas de transferência)
+            text = re.sub(r"^transfer_task_to_finance_ai_agent.*\n?", "", self._buffer, flags=re.MULTILINE)
+        else:
+            text = "" if (self._line_start and self._buffer.startswith(self._TRANSFER)) else self._buffer
+        self._buffer = ""
+        return self._emit(text)
 
-        return clean_response if clean_response else "Análise de IA concluída, mas nenhum resumo detalhado foi gerado."
 
+async def _stream_agents(ticker: str, model_id: str, raw_parts: list[str]):
+    """
+    Pedaços já limpos da resposta do time de agentes; o texto bruto é acumulado em 'raw_parts'.
+    """
+    prompt = f"Resumir a recomendação do analista e compartilhar as últimas notícias para {ticker}"
+    cleaner = _StreamCleaner()
+
+    # O time e a vaga do modelo ficam ocupados até o fim do stream (a duração medida inclui o envio
+    # ao cliente). Um stream não é repetido: passa só pelo disjuntor do modelo
+    with (
+        model_slot(model_id),
+        resilience.llm(model_id).guard(),
+        agent_team(model_id) as team,
+        metrics.stage("llm_agent"),
+    ):
+        response_stream = await team.arun(prompt, stream=True)
+
+        async for chunk in response_stream:
+            content = getattr(chunk, "content", chunk)
+            if not isinstance(content, str) or not content:
+                continue
+            raw_parts.append(content)
+            clean_piece = cleaner.feed(content)
+            if clean_piece:
+                yield clean_piece
+
+    tail = cleaner.finish()
+    if tail:
+        yield tail
+
+
+async def _stream_context(ticker: str, model_id: str, raw_parts: list[str]):
+    """
+    Pedaços da resposta da chamada única do modo "context" (sem limpeza: não há logs de ferramentas).
+    """
+    messages = await _context_messages(ticker)
+    with model_slot(model_id), resilience.llm(model_id).guard(), metrics.stage("llm_completion"):
+        async for piece in await complete(model_id, messages, settings.AI_CONTEXT_MAX_TOKENS, stream=True):
+            if piece:
+                raw_parts.append(piece)
+                yield piece
+
+
+async def stream_ai_analysis(ticker: str, model_id: str, mode: str | None = None):
+    """
+    Versão em streaming de get_ai_analysis: gera o texto da análise em pedaços, à medida que o
+    modelo os produz (no modo "agents", já com a limpeza aplicada de forma incremental).
+
+    Se a análise já estiver em cache ela é enviada de uma vez. Ao final de uma execução
+    bem-sucedida o texto completo é gravado no cache, como em get_ai_analysis.
+
+    Args:
+        ticker (str): O símbolo do ticker da ação.
+        model_id (str): O ID do modelo Groq a ser usado para esta análise.
+        mode (str | None): "agents" ou "context". O padrão é settings.AI_ANALYSIS_MODE.
+
+    Yields:
+        str: Pedaços do texto da análise (ou uma única mensagem de indisponibilidade).
+
+    Raises:
+        ModelBusyError: Se o modelo estiver sem vaga ou sem ficha (antes de qualquer texto).
+        AnalysisStreamError: Se a geração falhar (inclusive depois de parte do texto já ter sido enviada).
+    """
+    if not is_ai_available():
+        yield AI_UNAVAILABLE_MESSAGE
+        return
+
+    try:
+        mode = _resolve_mode(mode)
+    except ValueError as e:
+        raise AnalysisStreamError(str(e)) from e
+
+    ticker = ticker.upper()
+    key = _cache_key(ticker, model_id, mode)
+
+    cached_analysis = _analysis_cache.get(key)
+    metrics.cache_result("ai_analysis", "miss" if cached_analysis is None else "hit")
+    if cached_analysis is not None:
+        logger.info("Análise de IA servida do cache para %s com modelo %s", ticker, model_id)
+        yield cached_analysis
+        return
+
+    raw_parts = []
+    stream = _stream_context if mode == "context" else _stream_agents
+
+    try:
+        async for piece in stream(ticker, model_id, raw_parts):
+            yield piece
+
+    except ModelBusyError:
+        raise
+
+    except resilience.UpstreamError as e:
+        logger.warning("Modelo %s indisponível para %s: %s", model_id, ticker, e)
+        # Circuito do modelo aberto: serve a última análise do pregão, mesmo expirada, se houver
+        # (só se nada foi enviado ainda; não se emenda uma análise antiga num texto parcial)
+        stale_analysis = None if raw_parts else _stale_analysis(key)
+        if stale_analysis:
+            yield stale_analysis
+            return
+        raise AnalysisStreamError(
+            f"Ocorreu um erro ao gerar a análise de IA para {ticker} com modelo {model_id}: {e}"
+        ) from e
 
     except Exception as e:
-        # Captura erros durante a execução do agente (erro da API Groq, modelo inválido, etc.)
-        print(f"ERRO durante a execução do Agente de IA para {ticker} com modelo {model_id}: {e}")
-        # Retorna uma mensagem de erro mais específica
-        return f"Ocorreu um erro ao gerar a análise de IA para {ticker} com modelo {model_id}: {e}"
+        logger.error("Erro durante o streaming do Agente de IA para %s com modelo %s: %s", ticker, model_id, e)
+        raise AnalysisStreamError(
+            f"Ocorreu um erro ao gerar a análise de IA para {ticker} com modelo {model_id}: {e}"
+        ) from e
+
+    # Grava no cache o texto completo limpo com a mesma regex da versão sem streaming
+    clean_response = _clean_analysis("".join(raw_parts))
+    if clean_response:
+        _analysis_cache.set(key, clean_response)
+    else:
+        yield _EMPTY_ANALYSIS
 
 # O bloco if __name__ == "__main__": precisaria ser atualizado para testar
 # passando um model_id válido. Exemplo (adaptado do anterior):
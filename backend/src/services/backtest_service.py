@@ -0,0 +1,126 @@
+# backend/src/services/backtest_service.py
+
+import asyncio
+import logging
+import time
+
+# Barras OHLCV (cache + yfinance) e execução no pool de threads
+from src.services.market_data_service import fetch_price_bars, fetch_price_bars_batch, run_in_pool
+# Pool de processos compartilhado (cálculos pesados em CPU)
+from src.utils.process_pool import run_in_process
+# Validação das estratégias (sem carregar NumPy/pandas)
+from src.tools.strategy_specs import parse_params, expand_grid
+# Importa as configurações (tamanho dos blocos, limites)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _backtesting():
+    """
+    Motor de backtesting (NumPy/pandas), importado no primeiro uso.
+    """
+    from src.tools import backtesting
+    return backtesting
+
+
+def _run_backtest(bars, strategy: str, params: dict, cost_bps: float, interval: str) -> dict:
+    """
+    Executa o backtest e converte a curva de capital para registros (roda no pool de threads).
+    """
+    from src.utils.serialization import frame_to_records
+
+    result = _backtesting().backtest(bars, strategy, params, cost_bps)
+    result["equity_curve"] = frame_to_records(result["equity_curve"], interval)
+    return result
+
+
+async def run_backtest(ticker: str, strategy: str, params: dict | None = None, period: str = "1y",
+                       interval: str = "1d", cost_bps: float = 0.0) -> dict | None:
+    """
+    Executa uma estratégia com um conjunto de parâmetros sobre o histórico de um ticker.
+
+    Args:
+        ticker (str): O símbolo do ticker.
+        strategy (str): A estratégia (ver strategy_specs.STRATEGIES).
+        params (dict | None): Os parâmetros (os omitidos usam os padrões).
+        period (str): O período do histórico. O padrão é "1y".
+        interval (str): O intervalo das barras. O padrão é "1d".
+        cost_bps (float): Custo por operação, em pontos-base.
+
+    Returns:
+        dict | None: 'ticker', 'strategy', 'params', 'metrics', 'trades' e 'equity_curve'
+                     (registros com Date, Close, Position, Equity, Drawdown), ou None sem dados.
+
+    Raises:
+        ValueError: Se a estratégia ou os parâmetros forem inválidos.
+    """
+    params = parse_params(strategy, params)
+    bars = await fetch_price_bars(ticker, period, interval)
+    if bars is None:
+        return None
+
+    result = await run_in_pool(_run_backtest, bars, strategy, params, cost_bps, interval)
+    return {"ticker": ticker.upper(), "strategy": strategy, **result}
+
+
+async def run_sweep(tickers: list[str], strategy: str, grid: dict[str, list] | None = None,
+                    period: str = "1y", interval: str = "1d", cost_bps: float = 0.0,
+                    top: int = 20, rank_by: str = "sharpe") -> dict:
+    """
+    Avalia todas as combinações de uma grade de parâmetros em todos os tickers e devolve as melhores.
+
+    Cada tarefa (um ticker x um bloco de até BACKTEST_CHUNK_SIZE combinações) roda em um processo
+    do pool compartilhado, com todas as combinações do bloco calculadas de uma vez em matrizes.
+
+    Args:
+        tickers (list[str]): Os símbolos dos tickers.
+        strategy (str): A estratégia.
+        grid (dict[str, list] | None): Parâmetro -> valores a testar (os demais usam os padrões).
+        period (str): O período do histórico. O padrão é "1y".
+        interval (str): O intervalo das barras. O padrão é "1d".
+        cost_bps (float): Custo por operação, em pontos-base.
+        top (int): Número de resultados devolvidos.
+        rank_by (str): Métrica de ordenação (decrescente; "max_drawdown" é o drawdown menos negativo).
+
+    Returns:
+        dict: 'results' (os 'top' melhores pares ticker+parâmetros, com as métricas), 'evaluated'
+              (total de backtests), 'not_found' (tickers sem dados) e 'elapsed_seconds'.
+
+    Raises:
+        ValueError: Se a estratégia, a grade ou o número de tickers for inválido.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if len(tickers) > settings.BACKTEST_MAX_TICKERS:
+        raise ValueError(f"Limite de {settings.BACKTEST_MAX_TICKERS} tickers por varredura")
+    combos = expand_grid(strategy, grid, settings.BACKTEST_MAX_COMBINATIONS)
+
+    started = time.perf_counter()
+    bars_by_ticker = await fetch_price_bars_batch(tickers, period, interval)
+    backtesting = await asyncio.to_thread(_backtesting)
+
+    tasks, task_tickers = [], []
+    for ticker, bars in bars_by_ticker.items():
+        # Só arrays e tipos simples atravessam a fronteira entre processos
+        arrays = [bars[c].to_numpy(dtype=float) for c in ("Close", "High", "Low")]
+        periods = backtesting.periods_per_year(bars.index)
+        for i in range(0, len(combos), settings.BACKTEST_CHUNK_SIZE):
+            chunk = combos[i:i + settings.BACKTEST_CHUNK_SIZE]
+            tasks.append(run_in_process(backtesting.sweep, *arrays, periods, strategy, chunk, cost_bps))
+            task_tickers.append(ticker)
+
+    results = []
+    for ticker, chunk_results in zip(task_tickers, await asyncio.gather(*tasks)):
+        results.extend({"ticker": ticker, **r} for r in chunk_results)
+    results.sort(key=lambda r: r[rank_by], reverse=True)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Varredura %s: %s backtests em %s tickers (%.2fs)", strategy, len(results), len(bars_by_ticker), elapsed)
+    return {
+        "strategy": strategy,
+        "results": results[:top],
+        "evaluated": len(results),
+        "not_found": [t for t in tickers if t not in bars_by_ticker],
+        "elapsed_seconds": elapsed,
+    }
+
@@ -0,0 +1,248 @@
+# backend/src/services/live_bars_service.py
+
+import asyncio
+import logging
+
+# Busca das barras com indicadores (sempre incremental, no pool de workers)
+from src.services.market_data_service import fetch_live_frame
+# Nomes das colunas de cada indicador
+from src.tools.indicator_specs import column_names
+# Conversão das barras para o formato de registros da API
+from src.utils.serialization import frame_to_records
+# Horário do pregão (sem pregão não há barras novas a forçar)
+from src.utils import market_hours
+# Importa as configurações (ritmo das consultas, histórico, limites por conexão)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Intervalos aceitos no streaming ao vivo
+LIVE_INTERVALS = tuple(settings.LIVE_HISTORY_PERIOD)
+
+
+class LiveSubscriber:
+    """
+    Uma conexão de streaming: recebe, em uma única fila, as mensagens de todos os tickers em que está inscrita.
+
+    Mensagens:
+    - {"type": "snapshot", "ticker", "interval", "bars": [...]}: as últimas barras (na inscrição ou ressincronização).
+    - {"type": "bars", "ticker", "interval", "bars": [...]}: apenas barras novas ou alteradas desde a última mensagem.
+    - {"type": "error", "ticker", "interval", "detail"}: o ticker não retornou dados.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.LIVE_MAX_PENDING_MESSAGES)
+        # Pollers em que está inscrita, por (ticker, intervalo)
+        self.pollers: dict[tuple[str, str], "_TickerPoller"] = {}
+
+    def send(self, message: dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Cliente lento: descarta o que está pendente e pede um snapshot novo de cada ticker
+            logger.info("Fila de streaming cheia; ressincronizando %s tickers", len(self.pollers))
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            for poller in self.pollers.values():
+                poller.request_snapshot(self)
+
+
+class _TickerPoller:
+    """
+    Consulta um ticker+intervalo no Yahoo a cada LIVE_POLL_SECONDS e distribui as barras novas
+    para todos os inscritos. Existe no máximo um poller por ticker+intervalo.
+
+    Com o pregão fechado (exceto tickers 24h, como cripto) a consulta não força a busca: as barras
+    vêm do cache, que só volta ao Yahoo quando o TTL expira (uma vez após o fechamento).
+    """
+
+    def __init__(self, ticker: str, interval: str):
+        self.ticker = ticker
+        self.interval = interval
+        # Inscrito -> indicadores pedidos por ele
+        self.subscribers: dict[LiveSubscriber, list[tuple[str, tuple]]] = {}
+        self.polls = 0
+        self._needs_snapshot: set[LiveSubscriber] = set()
+        self._frame = None
+        self._frame_specs: list[tuple[str, tuple]] = []
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def _specs(self) -> list[tuple[str, tuple]]:
+        """
+        União dos indicadores pedidos pelos inscritos (calculados uma única vez por consulta).
+        """
+        specs = []
+        for subscriber_specs in self.subscribers.values():
+            specs.extend(s for s in subscriber_specs if s not in specs)
+        return specs
+
+    def add(self, subscriber: LiveSubscriber, specs: list[tuple[str, tuple]]) -> None:
+        self.subscribers[subscriber] = specs
+        columns = [c for spec in specs for c in column_names(*spec)]
+        if self._frame is not None and set(columns).issubset(self._frame.columns):
+            # Os dados atuais já atendem a inscrição: o snapshot sai na hora
+            self._send_snapshot(subscriber, specs)
+        else:
+            self.request_snapshot(subscriber)
+            # Indicadores novos (ou primeira inscrição): consulta sem esperar o próximo ciclo
+            self._wake.set()
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def remove(self, subscriber: LiveSubscriber) -> None:
+        self.subscribers.pop(subscriber, None)
+        self._needs_snapshot.discard(subscriber)
+
+    def request_snapshot(self, subscriber: LiveSubscriber) -> None:
+        self._needs_snapshot.add(subscriber)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.error("Erro no streaming ao vivo de %s (%s): %s", self.ticker, self.interval, e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.LIVE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self) -> None:
+        specs = self._specs()
+        period = settings.LIVE_HISTORY_PERIOD[self.interval]
+        refresh = market_hours.trades_24h(self.ticker) or market_hours.is_market_open()
+        frame = await fetch_live_frame(self.ticker, self.interval, period, specs, refresh)
+        self.polls += 1
+
+        previous, self._frame, self._frame_specs = self._frame, frame, specs
+        if frame is None:
+            for subscriber in self._needs_snapshot:
+                subscriber.send({"type": "error", "ticker": self.ticker, "interval": self.interval,
+                                 "detail": f"Dados não encontrados para: {self.ticker}"})
+            self._needs_snapshot.clear()
+            return
+
+        changed = _changed_rows(previous, frame) if previous is not None else None
+        # Registros já montados por conjunto de indicadores (inscritos com os mesmos indicadores compartilham)
+        records_cache: dict[tuple, list] = {}
+
+        for subscriber, subscriber_specs in list(self.subscribers.items()):
+            if changed is None or subscriber in self._needs_snapshot:
+                self._send_snapshot(subscriber, subscriber_specs)
+            elif not changed.empty:
+                key = tuple(subscriber_specs)
+                if key not in records_cache:
+                    records_cache[key] = self._records(changed, subscriber_specs)
+                subscriber.send({"type": "bars", "ticker": self.ticker, "interval": self.interval,
+                                 "bars": records_cache[key]})
+
+    def _records(self, frame, specs: list[tuple[str, tuple]]) -> list:
+        """
+        Converte as barras em registros com as colunas OHLCV e apenas os indicadores pedidos pelo inscrito.
+        """
+        all_indicator_columns = {c for spec in self._frame_specs for c in column_names(*spec)}
+        columns = [c for c in frame.columns if c not in all_indicator_columns]
+        columns += [c for spec in specs for c in column_names(*spec) if c in frame.columns]
+        return frame_to_records(frame[columns], self.interval)
+
+    def _send_snapshot(self, subscriber: LiveSubscriber, specs: list[tuple[str, tuple]]) -> None:
+        self._needs_snapshot.discard(subscriber)
+        bars = self._records(self._frame.tail(settings.LIVE_SNAPSHOT_BARS), specs)
+        subscriber.send({"type": "snapshot", "ticker": self.ticker, "interval": self.interval, "bars": bars})
+
+
+def _changed_rows(previous, current):
+    """
+    Barras de 'current' que o cliente ainda não tem: as posteriores à última barra enviada e a
+    própria última barra, se ela mudou (barra em formação). Só a última barra do cache é
+    baixada de novo a cada consulta, então as anteriores não mudam.
+    """
+    last_date = previous['Date'].iloc[-1]
+    tail = current[current['Date'] >= last_date]
+    if not tail.empty and tail['Date'].iloc[0] == last_date:
+        columns = [c for c in previous.columns if c in current.columns]
+        if tail.iloc[0][columns].equals(previous.iloc[-1][columns]):
+            tail = tail.iloc[1:]
+    return tail
+
+
+# Pollers ativos, por (ticker, intervalo)
+_pollers: dict[tuple[str, str], _TickerPoller] = {}
+
+
+def subscribe(subscriber: LiveSubscriber, ticker: str, interval: str,
+              specs: list[tuple[str, tuple]]) -> None:
+    """
+    Inscreve a conexão nas barras ao vivo de um ticker, criando o poller se for o primeiro inscrito.
+    Uma nova inscrição no mesmo ticker+intervalo substitui os indicadores pedidos antes.
+
+    Args:
+        subscriber (LiveSubscriber): A conexão.
+        ticker (str): O símbolo do ticker.
+        interval (str): O intervalo das barras (um de LIVE_INTERVALS).
+        specs (list[tuple[str, tuple]]): Indicadores (ver indicator_specs.parse_specs).
+
+    Raises:
+        ValueError: Se o intervalo não for suportado ou a conexão passar de LIVE_MAX_TICKERS_PER_CONNECTION.
+    """
+    if interval not in LIVE_INTERVALS:
+        raise ValueError(f"Intervalo não suportado no streaming: {interval}")
+
+    key = (ticker.upper(), interval)
+    if key not in subscriber.pollers and len(subscriber.pollers) >= settings.LIVE_MAX_TICKERS_PER_CONNECTION:
+        raise ValueError(f"Limite de {settings.LIVE_MAX_TICKERS_PER_CONNECTION} tickers por conexão atingido")
+
+    poller = _pollers.get(key)
+    if poller is None:
+        poller = _pollers[key] = _TickerPoller(*key)
+    subscriber.pollers[key] = poller
+    poller.add(subscriber, specs)
+
+
+def unsubscribe(subscriber: LiveSubscriber, ticker: str, interval: str | None = None) -> None:
+    """
+    Cancela a inscrição em um ticker (em um intervalo ou, sem intervalo, em todos).
+    O poller é encerrado quando fica sem inscritos.
+    """
+    ticker = ticker.upper()
+    for key in [k for k in subscriber.pollers if k[0] == ticker and interval in (None, k[1])]:
+        poller = subscriber.pollers.pop(key)
+        poller.remove(subscriber)
+        if not poller.subscribers:
+            poller.stop()
+            _pollers.pop(key, None)
+
+
+def unsubscribe_all(subscriber: LiveSubscriber) -> None:
+    """
+    Cancela todas as inscrições da conexão (usado quando ela é fechada).
+    """
+    for ticker, interval in list(subscriber.pollers):
+        unsubscribe(subscriber, ticker, interval)
+
+
+def active_pollers() -> list[dict]:
+    """
+    Pollers ativos, com o número de inscritos e de consultas feitas (para monitoramento).
+    """
+    return [
+        {"ticker": p.ticker, "interval": p.interval, "subscribers": len(p.subscribers), "polls": p.polls}
+        for p in _pollers.values()
+    ]
+
+
+async def shutdown() -> None:
+    """
+    Encerra todos os pollers (usado no encerramento da aplicação).
+    """
+    for poller in _pollers.values():
+        poller.stop()
+    _pollers.clear()
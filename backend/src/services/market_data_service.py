@@ -0,0 +1,168 @@
+# backend/src/services/market_data_service.py
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Agrupamento de chamadas concorrentes idênticas
+from src.utils.singleflight import SingleFlight
+# Importa as configurações (tamanho do pool de workers)
+from src.config.config import settings
+
+# Pool limitado de threads para as chamadas bloqueantes ao yfinance.
+# Mantém o event loop do uvicorn livre enquanto o Yahoo responde.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.MARKET_DATA_MAX_WORKERS,
+    thread_name_prefix="market-data",
+)
+
+# Chamadas em andamento, compartilhadas entre requisições concorrentes
+_single_flight = SingleFlight()
+
+
+def _yfinance_tool():
+    """
+    Ferramentas síncronas que acessam o yfinance, importadas no primeiro uso
+    (yfinance/pandas/NumPy não entram no tempo de inicialização do worker).
+    """
+    from src.tools import yfinance_tool
+    return yfinance_tool
+
+
+async def run_in_pool(fn, *args, **kwargs):
+    """
+    Executa uma função síncrona no pool de workers de dados de mercado, sem bloquear o event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def fetch_historical_data(ticker: str, period: str = "6mo", interval: str = "1d") -> list | None:
+    """
+    Versão assíncrona de get_historical_data.
+    Requisições concorrentes para o mesmo ticker/período/intervalo compartilham uma única busca.
+
+    Args:
+        ticker (str): O símbolo do ticker da ação (ex: "MSFT").
+        period (str): O período dos dados históricos (ex: "6mo", "1y"). O padrão é "6mo".
+        interval (str): O intervalo das barras (ex: "1d", "5m"). O padrão é "1d".
+
+    Returns:
+        list | None: A lista de registros históricos, ou None se nenhum dado for encontrado.
+    """
+    ticker = ticker.upper()
+    key = ("history", ticker, period, interval)
+    return await _single_flight.do(
+        key, lambda: run_in_pool(_yfinance_tool().get_historical_data, ticker, period, interval)
+    )
+
+
+async def fetch_historical_frame(ticker: str, period: str = "6mo", interval: str = "1d",
+                                 indicator_specs: list[tuple[str, tuple]] | None = None,
+                                 start=None, end=None, points: int | None = None, downsample: str = "lttb"):
+    """
+    Versão assíncrona de get_historical_frame (DataFrame, para serialização em outros formatos).
+    Requisições concorrentes para o mesmo ticker/período/intervalo/indicadores compartilham uma única busca;
+    o DataFrame devolvido é compartilhado e não deve ser alterado pelos chamadores.
+
+    Args:
+        ticker (str): O símbolo do ticker da ação (ex: "MSFT").
+        period (str): O período dos dados históricos. O padrão é "6mo".
+        interval (str): O intervalo das barras. O padrão é "1d".
+        indicator_specs (list[tuple[str, tuple]] | None): Indicadores (ver indicators.parse_specs).
+        start, end (datetime | None): Intervalo de datas (inclusive); com 'start' o período é ignorado.
+        points (int | None): Número máximo de barras (redução no servidor). None devolve todas.
+        downsample (str): Método de redução: "lttb" ou "ohlc".
+
+    Returns:
+        pd.DataFrame | None: A série histórica, ou None se nenhum dado for encontrado.
+    """
+    ticker = ticker.upper()
+    key = ("history_frame", ticker, period, interval, tuple(indicator_specs or ()), start, end, points, downsample)
+    return await _single_flight.do(
+        key, lambda: run_in_pool(_yfinance_tool().get_historical_frame, ticker, period, interval, indicator_specs,
+                                 start=start, end=end, points=points, downsample=downsample)
+    )
+
+
+async def fetch_live_frame(ticker: str, interval: str, period: str,
+                           indicator_specs: list[tuple[str, tuple]], refresh: bool = True):
+    """
+    Como fetch_historical_frame, mas com 'refresh' sempre busca no Yahoo as barras novas (ignorando o TTL
+    do cache). Usada pelos pollers do streaming ao vivo, que definem o próprio ritmo de consulta.
+
+    Returns:
+        pd.DataFrame | None: A série histórica com os indicadores, ou None se nenhum dado for encontrado.
+    """
+    ticker = ticker.upper()
+    key = ("live_frame", ticker, period, interval, tuple(indicator_specs), refresh)
+    return await _single_flight.do(
+        key, lambda: run_in_pool(_yfinance_tool().get_historical_frame, ticker, period, interval,
+                                 indicator_specs, refresh)
+    )
+
+
+async def fetch_historical_data_batch(tickers: list[str], period: str = "6mo", interval: str = "1d") -> dict[str, list]:
+    """
+    Versão assíncrona de get_historical_data_batch (um único download em lote para todos os tickers).
+    Lotes concorrentes com o mesmo conjunto de tickers/período/intervalo compartilham uma única busca.
+
+    Args:
+        tickers (list[str]): Os símbolos dos tickers.
+        period (str): O período dos dados históricos. O padrão é "6mo".
+        interval (str): O intervalo das barras. O padrão é "1d".
+
+    Returns:
+        dict[str, list]: Um dicionário ticker -> lista de registros históricos.
+    """
+    # Remove duplicados preservando a ordem pedida
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    key = ("history_batch", tuple(sorted(tickers)), period, interval)
+    return await _single_flight.do(
+        key, lambda: run_in_pool(_yfinance_tool().get_historical_data_batch, tickers, period, interval)
+    )
+
+
+async def fetch_price_bars(ticker: str, period: str = "1y", interval: str = "1d"):
+    """
+    Versão assíncrona de get_price_bars (barras OHLCV sem indicadores).
+    O DataFrame devolvido é compartilhado entre requisições concorrentes e não deve ser alterado.
+
+    Returns:
+        pd.DataFrame | None: As barras indexadas por data, ou None se nenhum dado for encontrado.
+    """
+    ticker = ticker.upper()
+    key = ("price_bars", ticker, period, interval)
+    return await _single_flight.do(
+        key, lambda: run_in_pool(_yfinance_tool().get_price_bars, ticker, period, interval)
+    )
+
+
+async def fetch_price_bars_batch(tickers: list[str], period: str = "1y", interval: str = "1d") -> dict:
+    """
+    Versão assíncrona de get_price_bars_batch (um único download em lote para os tickers sem cache).
+
+    Returns:
+        dict[str, pd.DataFrame]: Ticker -> barras indexadas por data.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    key = ("price_bars_batch", tuple(sorted(tickers)), period, interval)
+    return await _single_flight.do(
+        key, lambda: run_in_pool(_yfinance_tool().get_price_bars_batch, tickers, period, interval)
+    )
+
+
+async def fetch_company_info(ticker: str) -> dict | None:
+    """
+    Versão assíncrona de get_company_info.
+    Requisições concorrentes para o mesmo ticker compartilham uma única busca.
+
+    Args:
+        ticker (str): O símbolo do ticker da empresa (ex: "MSFT").
+
+    Returns:
+        dict | None: As informações selecionadas da empresa, ou None se não forem encontradas.
+    """
+    ticker = ticker.upper()
+    key = ("info", ticker)
+    return await _single_flight.do(key, lambda: run_in_pool(_yfinance_tool().get_company_info, ticker))
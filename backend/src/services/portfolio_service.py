@@ -0,0 +1,209 @@
+# backend/src/services/portfolio_service.py
+
+import asyncio
+import logging
+import math
+import threading
+import time
+
+# Barras OHLCV (cache + yfinance em lote) e execução no pool de threads
+from src.services.market_data_service import fetch_price_bars_batch, run_in_pool
+# Cache em memória com expiração e descarte LRU
+from src.utils.ttl_cache import TTLCache
+# Importa as configurações (índice padrão, limites)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (ativos + índice, janela, período, intervalo) -> {"tracker": RollingCovariance, "last": data da última barra}
+_trackers = TTLCache(settings.PORTFOLIO_STATE_MAX_ENTRIES, settings.PORTFOLIO_STATE_TTL_SECONDS)
+_trackers_lock = threading.Lock()
+
+
+def _portfolio():
+    """
+    Cálculos de carteira (NumPy/pandas), importados no primeiro uso.
+    """
+    from src.tools import portfolio
+    return portfolio
+
+
+def _window_covariance(returns, window: int, period: str, interval: str):
+    """
+    Covariância da janela mais recente, reaproveitando o estado da consulta anterior com as mesmas colunas:
+    só as barras novas desde então entram no acumulador. A última barra do estado (que pode ter sido
+    calculada com a barra ainda em formação) é substituída se o retorno dela mudou; se alguma barra
+    anterior mudou (ex: retornos ajustados após dividendos ou desdobramentos) ou não há estado compatível,
+    o acumulador é criado de novo com a janela atual.
+    """
+    import numpy as np
+
+    portfolio = _portfolio()
+    key = (tuple(returns.columns), window, period, interval)
+    with _trackers_lock:
+        state = _trackers.get(key)
+        new_rows = None
+        if state is not None and state["last"] in returns.index:
+            tracker = state["tracker"]
+            stored = tracker.rows()
+            current = returns.loc[:state["last"]].to_numpy()[-len(stored):]
+            if len(current) == len(stored) and np.array_equal(current[:-1], stored[:-1]):
+                if not np.array_equal(current[-1], stored[-1]):
+                    tracker.replace_last(current[-1])
+                new_rows = returns.loc[returns.index > state["last"]]
+        if new_rows is None:
+            state = {"tracker": portfolio.RollingCovariance(len(returns.columns), window)}
+            new_rows = returns
+        state["tracker"].update(new_rows.to_numpy())
+        state["last"] = returns.index[-1]
+        _trackers.set(key, state)
+        return state["tracker"].covariance()
+
+
+def _matrix(values) -> list:
+    """
+    Matriz/vetor NumPy em listas nativas, com NaN como None (JSON não tem NaN).
+    """
+    import numpy as np
+
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def _analyze(bars_by_ticker: dict, tickers: list[str], weights: list[float], benchmark: str | None,
+             window: int, period: str, interval: str, history_step: int) -> dict:
+    """
+    Calcula o relatório da carteira sobre as barras já carregadas (roda no pool de threads).
+    """
+    import numpy as np
+    from src.utils.serialization import date_format_for, frame_to_records
+
+    portfolio = _portfolio()
+    columns = tickers + ([benchmark] if benchmark and benchmark not in tickers else [])
+    returns = portfolio.align_returns(bars_by_ticker, columns)
+    if len(returns) < window:
+        raise ValueError(f"Histórico comum insuficiente: {len(returns)} barras para uma janela de {window}")
+
+    w = np.asarray(weights, dtype=float)
+    covariance = _window_covariance(returns, window, period, interval)
+    assets = covariance[:len(tickers), :len(tickers)]
+    market = columns.index(benchmark) if benchmark else None
+
+    periods = portfolio.periods_per_year(returns.index)
+    report = portfolio.risk_report(
+        assets, w, periods,
+        covariance[:len(tickers), market] if market is not None else None,
+        float(covariance[market, market]) if market is not None else None,
+    )
+    volatilities = np.sqrt(np.diagonal(assets) * periods)
+
+    date_format = date_format_for(interval)
+    result = {
+        "tickers": tickers,
+        "weights": weights,
+        "benchmark": benchmark,
+        "window": window,
+        "as_of": returns.index[-1].strftime(date_format),
+        "observations": len(returns),
+        "volatility": float(report["volatility"]),
+        "beta": report["beta"],
+        "assets": [
+            {
+                "ticker": ticker,
+                "weight": weights[i],
+                "volatility": float(volatilities[i]),
+                "beta": float(report["betas"][i]) if report["betas"] is not None else None,
+                "marginal_risk": float(report["marginal_risk"][i]),
+                "risk_contribution": float(report["risk_contribution"][i]),
+                "risk_contribution_pct": float(report["risk_contribution_pct"][i]),
+            }
+            for i, ticker in enumerate(tickers)
+        ],
+        "covariance": _matrix(assets * periods),
+        "correlation": _matrix(portfolio.correlation_matrix(assets)),
+        "rolling": [
+            {k: None if isinstance(v, float) and math.isnan(v) else v for k, v in record.items()}
+            for record in frame_to_records(portfolio.rolling_report(returns, tickers, w, window, benchmark), interval)
+        ],
+    }
+
+    if history_step:
+        # Matrizes de correlação das janelas móveis (a cada 'history_step' barras), todas de uma vez
+        asset_returns = returns[tickers].to_numpy()
+        matrices = portfolio.correlation_matrix(portfolio.rolling_covariance(asset_returns, window, history_step))
+        ends = returns.index[window - 1:][::-1][::history_step][::-1]
+        result["correlation_history"] = [
+            {"Date": end.strftime(date_format), "correlation": _matrix(matrix)}
+            for end, matrix in zip(ends, matrices)
+        ]
+    return result
+
+
+def normalize_weights(tickers: list[str], weights: list[float] | None) -> list[float]:
+    """
+    Pesos da carteira somando 1 (pesos iguais quando omitidos; posições vendidas são aceitas).
+
+    Raises:
+        ValueError: Se a quantidade de pesos não bater com a de tickers ou a soma não for positiva.
+    """
+    if weights is None:
+        return [1.0 / len(tickers)] * len(tickers)
+    if len(weights) != len(tickers):
+        raise ValueError(f"Informe um peso por ticker ({len(tickers)} tickers, {len(weights)} pesos)")
+    total = sum(weights)
+    if total <= 0:
+        raise ValueError("A soma dos pesos deve ser positiva")
+    return [w / total for w in weights]
+
+
+async def analyze_portfolio(tickers: list[str], weights: list[float] | None = None,
+                            benchmark: str | None = None, window: int = 63, period: str = "1y",
+                            interval: str = "1d", history_step: int = 0) -> dict:
+    """
+    Analisa o risco de uma carteira sobre as séries de fechamento em cache, alinhadas por data.
+
+    Covariância e correlação são produtos de matrizes sobre a janela mais recente (sem laço em pares de
+    ativos), mantidas em um acumulador incremental: consultas repetidas só somam as barras novas.
+
+    Args:
+        tickers (list[str]): Os ativos da carteira.
+        weights (list[float] | None): Os pesos, na ordem dos tickers (normalizados para somar 1).
+                                      Sem eles, a carteira é igualmente ponderada.
+        benchmark (str | None): O índice de referência do beta. O padrão é settings.PORTFOLIO_BENCHMARK;
+                                "" desativa o beta.
+        window (int): A janela das estatísticas, em barras. O padrão é 63 (~3 meses de pregões).
+        period (str): O período do histórico. O padrão é "1y".
+        interval (str): O intervalo das barras. O padrão é "1d".
+        history_step (int): Se maior que zero, inclui as matrizes de correlação das janelas móveis a cada
+                            'history_step' barras ('correlation_history').
+
+    Returns:
+        dict: 'volatility' e 'beta' da carteira, 'assets' (peso, volatilidade, beta e contribuição para o
+              risco de cada ativo), 'covariance' (anualizada) e 'correlation' da janela mais recente,
+              'rolling' (Date, Volatility, Beta e BenchmarkCorrelation por barra) e 'elapsed_seconds'.
+
+    Raises:
+        ValueError: Se os tickers, os pesos ou a janela forem inválidos, ou se faltarem dados de algum ativo.
+    """
+    tickers = [t.upper() for t in tickers]
+    if len(set(tickers)) != len(tickers):
+        raise ValueError("Tickers repetidos na carteira")
+    if len(tickers) > settings.PORTFOLIO_MAX_TICKERS:
+        raise ValueError(f"Limite de {settings.PORTFOLIO_MAX_TICKERS} ativos por carteira")
+    weights = normalize_weights(tickers, weights)
+    benchmark = (settings.PORTFOLIO_BENCHMARK if benchmark is None else benchmark).upper() or None
+
+    started = time.perf_counter()
+    bars_by_ticker = await fetch_price_bars_batch(tickers + ([benchmark] if benchmark else []), period, interval)
+    missing = [t for t in tickers if t not in bars_by_ticker]
+    if missing:
+        raise ValueError(f"Dados não encontrados para: {', '.join(missing)}")
+    if benchmark and benchmark not in bars_by_ticker:
+        logger.info("Índice %s sem dados; carteira analisada sem beta", benchmark)
+        benchmark = None
+
+    await asyncio.to_thread(_portfolio)
+    result = await run_in_pool(_analyze, bars_by_ticker, tickers, weights, benchmark, window, period,
+                               interval, history_step)
+    result["elapsed_seconds"] = time.perf_counter() - started
+    logger.info("Carteira com %s ativos analisada (%.2fs)", len(tickers), result['elapsed_seconds'])
+    return result
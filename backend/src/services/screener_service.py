@@ -0,0 +1,120 @@
+# backend/src/services/screener_service.py
+
+import asyncio
+import logging
+import math
+import time
+
+# Barras OHLCV (cache + yfinance em lote) e execução no pool de threads
+from src.services.market_data_service import fetch_price_bars_batch, run_in_pool
+# Pool de processos compartilhado (cálculos pesados em CPU)
+from src.utils.process_pool import run_in_process
+# Validação das expressões (sem carregar NumPy/pandas)
+from src.tools.screener_specs import parse_expression
+# Universos de tickers pré-definidos
+from src.config.universes import UNIVERSES
+# Importa as configurações (tamanho dos blocos, limites)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _screener():
+    """
+    Motor do screener (NumPy/pandas), importado no primeiro uso.
+    """
+    from src.tools import screener
+    return screener
+
+
+def resolve_universe(universe: str | None, tickers: list[str] | None) -> list[str]:
+    """
+    Tickers a avaliar: a lista explícita ou, sem ela, os do universo pré-definido.
+
+    Raises:
+        ValueError: Se o universo for desconhecido, nada for informado ou o limite de tickers for excedido.
+    """
+    if tickers:
+        symbols = tickers
+    elif universe:
+        if universe not in UNIVERSES:
+            raise ValueError(f"Universo desconhecido: {universe} (disponíveis: {', '.join(UNIVERSES)})")
+        symbols = UNIVERSES[universe]
+    else:
+        raise ValueError("Informe 'universe' ou 'tickers'")
+
+    symbols = list(dict.fromkeys(t.upper() for t in symbols))
+    if len(symbols) > settings.SCREENER_MAX_TICKERS:
+        raise ValueError(f"Limite de {settings.SCREENER_MAX_TICKERS} tickers por consulta")
+    return symbols
+
+
+async def run_screen(expression: str, universe: str | None = "stocks", tickers: list[str] | None = None,
+                     rank_by: str | None = None, ascending: bool = False, top: int = 50,
+                     period: str = "1y", interval: str = "1d") -> dict:
+    """
+    Avalia um filtro na barra mais recente de todos os tickers de um universo e devolve os aprovados,
+    ordenados por 'rank_by'.
+
+    As barras (do cache, com um único download em lote para o que faltar) são empilhadas em matrizes
+    tickers x barras e avaliadas de uma vez; universos maiores que SCREENER_CHUNK_SIZE são divididos
+    em blocos de linhas avaliados em paralelo no pool de processos.
+
+    Args:
+        expression (str): O filtro (ex: "close > SMA_20 and volume > 2 * avg(volume, 20)").
+        universe (str | None): Universo pré-definido ("stocks", "crypto", "all"). Ignorado com 'tickers'.
+        tickers (list[str] | None): Lista explícita de tickers.
+        rank_by (str | None): Expressão numérica de ordenação (ex: "rsi_14"). Sem ela, a ordem é a do universo.
+        ascending (bool): Ordena do menor para o maior valor de 'rank_by'.
+        top (int): Número máximo de resultados.
+        period (str): O período das barras carregadas (deve cobrir as janelas usadas). O padrão é "1y".
+        interval (str): O intervalo das barras. O padrão é "1d".
+
+    Returns:
+        dict: 'matches' (ticker, close, rank_value e values de cada aprovado), 'matched', 'evaluated',
+              'not_found' e 'elapsed_seconds'.
+
+    Raises:
+        ValueError: Se o filtro, a ordenação, o universo ou os tickers forem inválidos.
+    """
+    # Valida as expressões antes de buscar qualquer dado
+    parse_expression(expression)
+    if rank_by:
+        parse_expression(rank_by)
+    symbols = resolve_universe(universe, tickers)
+
+    started = time.perf_counter()
+    bars_by_ticker = await fetch_price_bars_batch(symbols, period, interval)
+    screener = await asyncio.to_thread(_screener)
+
+    # Blocos de linhas do mesmo tamanho (cada bloco é empilhado só com as próprias séries)
+    available = [t for t in symbols if t in bars_by_ticker]
+    chunks = max(1, math.ceil(len(available) / settings.SCREENER_CHUNK_SIZE))
+    size = math.ceil(len(available) / chunks) if available else 0
+    blocks = [available[i:i + size] for i in range(0, len(available), size)] if available else []
+
+    async def screen_block(block: list[str]) -> list[dict]:
+        names, matrices = await run_in_pool(screener.stack_bars, {t: bars_by_ticker[t] for t in block})
+        if len(blocks) == 1:
+            return await run_in_pool(screener.screen, names, matrices, expression, rank_by)
+        return await run_in_process(screener.screen, names, matrices, expression, rank_by)
+
+    matches = [m for block_matches in await asyncio.gather(*(screen_block(b) for b in blocks))
+               for m in block_matches]
+    if rank_by:
+        # Valores ausentes (histórico insuficiente) ficam no fim, em qualquer direção
+        matches.sort(key=lambda m: (m["rank_value"] is None,
+                                    0 if m["rank_value"] is None
+                                    else (m["rank_value"] if ascending else -m["rank_value"])))
+
+    elapsed = time.perf_counter() - started
+    logger.info("Screener: %s de %s tickers aprovados (%.2fs)", len(matches), len(available), elapsed)
+    return {
+        "expression": expression,
+        "rank_by": rank_by,
+        "matches": matches[:top],
+        "matched": len(matches),
+        "evaluated": len(available),
+        "not_found": [t for t in symbols if t not in bars_by_ticker],
+        "elapsed_seconds": elapsed,
+    }
@@ -1,12 +1,16 @@
 # backend/src/services/stock_service.py
 
-# Importa a ferramenta para buscar dados históricos
-from src.tools.yfinance_tool import get_historical_data
+# Importa a busca assíncrona de dados históricos (executada no pool de workers)
+import logging
+
+from src.services.market_data_service import fetch_historical_data
 
 # Importa o serviço de IA (este arquivo será criado na próxima etapa - 1.6)
 # A função get_ai_analysis será definida em ai_service.py
 from src.services.ai_service import get_ai_analysis
 
+logger = logging.getLogger(__name__)
+
 async def analyze_stock(ticker: str) -> dict | None:
     """
     Orquestra a busca por dados históricos e a análise de IA para um ticker.
@@ -19,11 +23,11 @@ async def analyze_stock(ticker: str) -> dict | None:
                      e 'ai_analysis' (str), ou None se os dados históricos não forem encontrados.
     """
     # 1. Obter dados históricos usando a ferramenta yfinance
-    historical_data = get_historical_data(ticker)
+    historical_data = await fetch_historical_data(ticker)
 
     # Verifica se os dados históricos foram encontrados
     if historical_data is None:
-        print(f"Dados históricos não encontrados para o ticker: {ticker}")
+        logger.info("Dados históricos não encontrados para o ticker: %s", ticker)
         return None # Retorna None se os dados básicos não existirem
 
     # 2. Obter análise de IA usando o serviço de IA
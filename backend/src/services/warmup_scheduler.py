@@ -0,0 +1,155 @@
+# backend/src/services/warmup_scheduler.py
+#
+# Aquecimento agendado das watchlists: nos horários de WARMUP_TIMES (ex: logo após a abertura e após o
+# fechamento), atualiza as barras, os indicadores e as informações de WARMUP_TICKERS e, opcionalmente,
+# enfileira as análises de IA. Assim o primeiro usuário do dia encontra tudo em cache.
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+
+# Buscas assíncronas (pool de workers + single-flight); a de barras ao vivo sempre busca as barras novas
+from src.services.market_data_service import fetch_company_info, fetch_live_frame
+# Fila de jobs de análise de IA (com os limites de concorrência e de taxa por modelo)
+from src.services import ai_job_queue
+from src.services.ai_service import is_ai_available
+# Indicadores pré-calculados
+from src.tools.indicator_specs import parse_specs
+# Horário do pregão e cache/travas compartilhados entre os workers
+from src.utils import market_hours, shared_cache
+# Importa as configurações (watchlist, horários, limites)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rodadas já executadas por algum worker do host (cada rodada roda em um único worker)
+_completed_runs = shared_cache.SharedCache("warmup_runs", 24 * 3600) if settings.SHARED_CACHE_ENABLED else None
+_task: asyncio.Task | None = None
+
+
+async def _warm_ticker(ticker: str, indicator_specs: list[tuple[str, tuple]], semaphore: asyncio.Semaphore) -> bool:
+    """
+    Atualiza as barras (com indicadores) de cada intervalo e as informações de um ticker.
+
+    Returns:
+        bool: True se todas as buscas trouxeram dados.
+    """
+    # Espalha o início das buscas para não disparar todos os tickers no mesmo instante
+    await asyncio.sleep(random.uniform(0, settings.WARMUP_JITTER_SECONDS))
+    async with semaphore:
+        ok = True
+        for interval in settings.WARMUP_INTERVALS:
+            frame = await fetch_live_frame(ticker, interval, settings.WARMUP_PERIOD, indicator_specs)
+            if frame is None:
+                logger.warning("Aquecimento: sem barras para %s (%s)", ticker, interval)
+                ok = False
+        try:
+            if await fetch_company_info(ticker) is None:
+                ok = False
+        except Exception as e:
+            logger.error("Aquecimento: erro ao buscar as informações de %s: %s", ticker, e)
+            ok = False
+        return ok
+
+
+async def run_warmup(tickers: list[str] | None = None) -> dict:
+    """
+    Executa uma rodada de aquecimento: barras, indicadores e informações de cada ticker (no máximo
+    WARMUP_CONCURRENCY ao mesmo tempo) e, com WARMUP_ANALYSIS_MODELS, as análises de IA (jobs "batch").
+
+    Args:
+        tickers (list[str] | None): Os tickers a aquecer. O padrão é settings.WARMUP_TICKERS.
+
+    Returns:
+        dict: 'tickers' (quantidade), 'failed' (tickers sem dados), 'ai_jobs' (jobs enfileirados)
+              e 'elapsed_seconds'.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in (tickers if tickers is not None else settings.WARMUP_TICKERS)))
+    started = time.perf_counter()
+    indicator_specs = parse_specs(settings.WARMUP_INDICATORS)
+    semaphore = asyncio.Semaphore(max(settings.WARMUP_CONCURRENCY, 1))
+
+    results = await asyncio.gather(*(_warm_ticker(t, indicator_specs, semaphore) for t in tickers))
+    failed = [t for t, ok in zip(tickers, results) if not ok]
+
+    ai_jobs = 0
+    if settings.WARMUP_ANALYSIS_MODELS and is_ai_available():
+        for model_id in settings.WARMUP_ANALYSIS_MODELS:
+            try:
+                ai_jobs += len(ai_job_queue.submit_watchlist(tickers, model_id, "batch"))
+            except asyncio.QueueFull:
+                logger.warning("Aquecimento: fila de jobs de IA cheia; análises com %s não enfileiradas", model_id)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Aquecimento de %s tickers concluído em %.2fs (%s sem dados, %s análises de IA enfileiradas)",
+                len(tickers), elapsed, len(failed), ai_jobs)
+    return {"tickers": len(tickers), "failed": failed, "ai_jobs": ai_jobs, "elapsed_seconds": elapsed}
+
+
+async def _run_scheduled(run_id: str) -> None:
+    """
+    Executa a rodada agendada 'run_id' se nenhum outro worker do host a executou (ou está executando).
+    """
+    if _completed_runs is None:
+        await run_warmup()
+        return
+
+    lock = shared_cache.FileLock(f"warmup:{run_id}")
+    if not lock.acquire(timeout=0):
+        logger.info("Aquecimento %s em execução em outro worker", run_id)
+        return
+    try:
+        if _completed_runs.get(run_id) is not None:
+            logger.info("Aquecimento %s já executado por outro worker", run_id)
+            return
+        await run_warmup()
+        _completed_runs.set(run_id, time.time())
+    finally:
+        lock.release()
+
+
+async def _scheduler() -> None:
+    while True:
+        run_at = market_hours.next_weekday_time(settings.WARMUP_TIMES)
+        # O atraso aleatório evita que os workers (e as instâncias) acordem juntos
+        delay = (run_at - datetime.now(run_at.tzinfo)).total_seconds() + random.uniform(0, settings.WARMUP_JITTER_SECONDS)
+        logger.info("Próximo aquecimento da watchlist em %s", run_at.isoformat())
+        await asyncio.sleep(max(delay, 0))
+        try:
+            await _run_scheduled(run_at.isoformat())
+        except Exception as e:
+            logger.error("Erro no aquecimento agendado da watchlist: %s", e)
+
+
+def start() -> None:
+    """
+    Inicia o agendador (chamado na inicialização da aplicação). Sem WARMUP_TICKERS, não faz nada.
+    """
+    global _task
+    if not settings.WARMUP_TICKERS or _task is not None:
+        return
+    try:
+        market_hours.next_weekday_time(settings.WARMUP_TIMES)
+    except ValueError as e:
+        logger.error("WARMUP_TIMES inválido (%s); aquecimento agendado desligado", e)
+        return
+    unknown_models = [m for m in settings.WARMUP_ANALYSIS_MODELS if m not in settings.AI_MODELS]
+    if unknown_models:
+        logger.error("WARMUP_ANALYSIS_MODELS com modelos fora de AI_MODELS (%s); aquecimento agendado desligado",
+                     ", ".join(unknown_models))
+        return
+    _task = asyncio.create_task(_scheduler())
+
+
+async def shutdown() -> None:
+    """
+    Encerra o agendador (usado no encerramento da aplicação).
+    """
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    await asyncio.gather(_task, return_exceptions=True)
+    _task = None
@@ -0,0 +1,144 @@
+# backend/src/tools/ai_context.py
+#
+# Contexto da análise de IA no modo "context": um resumo compacto (poucas centenas de tokens) dos dados
+# que o time de agentes buscaria com as próprias ferramentas (preço, indicadores, fundamentos, consenso
+# dos analistas e notícias), montado a partir dos caches locais e enviado em uma única chamada ao modelo.
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Barras com indicadores, informações e notícias (todos servidos dos caches sempre que possível)
+from src.tools import yfinance_tool
+from src.tools.indicator_specs import column_names, parse_specs
+# Importa as configurações (período, indicadores e limites do contexto)
+from src.config.config import settings
+
+# Pregões aproximados por janela de variação do preço
+_CHANGE_WINDOWS = (("1d", 1), ("5d", 5), ("1m", 21), ("3m", 63))
+
+
+def _number(value, digits: int = 2) -> str:
+    """
+    Número legível e curto: 1234567890 -> "1.23B"; None/NaN -> "n/d".
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "n/d"
+    if not isinstance(value, (int, float, np.number)):
+        return str(value)
+    for limit, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= limit:
+            return f"{value / limit:.{digits}f}{suffix}"
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    return f"{value:.{digits}f}"
+
+
+def _fields(pairs: list[tuple[str, object]]) -> str:
+    """
+    Pares "rótulo: valor" em uma linha, omitindo os valores ausentes.
+    """
+    return " | ".join(f"{label}: {_number(value)}" for label, value in pairs if value is not None)
+
+
+def _price_lines(frame: pd.DataFrame, indicator_columns: list[str]) -> list[str]:
+    """
+    Resumo das barras diárias: preço e variações, faixa do período, volume, volatilidade,
+    último valor de cada indicador e os fechamentos mais recentes.
+    """
+    close = frame["Close"].to_numpy(dtype=float)
+    last = frame.iloc[-1]
+    lines = [f"Último fechamento: {_number(close[-1])} em {last['Date']:%Y-%m-%d}"]
+
+    changes = [(label, (close[-1] / close[-1 - n] - 1) * 100) for label, n in _CHANGE_WINDOWS if len(close) > n]
+    changes.append((settings.AI_CONTEXT_PERIOD, (close[-1] / close[0] - 1) * 100))
+    lines.append("Variação %: " + " | ".join(f"{label} {value:+.1f}" for label, value in changes))
+
+    lines.append(_fields([
+        (f"Mínima {settings.AI_CONTEXT_PERIOD}", float(frame["Low"].min())),
+        (f"Máxima {settings.AI_CONTEXT_PERIOD}", float(frame["High"].max())),
+        ("Volume último", float(last["Volume"])),
+        ("Volume médio 20d", float(frame["Volume"].tail(20).mean())),
+    ]))
+
+    returns = np.diff(np.log(close[-21:]))
+    if len(returns) > 1:
+        lines.append(f"Volatilidade anualizada 20d: {np.std(returns, ddof=1) * math.sqrt(252) * 100:.1f}%")
+
+    if indicator_columns:
+        lines.append("Indicadores: " + _fields([(c, float(last[c])) for c in indicator_columns]))
+
+    recent = close[-settings.AI_CONTEXT_RECENT_CLOSES:]
+    lines.append(f"Fechamentos recentes ({len(recent)} pregões): " + ", ".join(_number(v) for v in recent))
+    return lines
+
+
+def _info_lines(info: dict) -> list[str]:
+    """
+    Empresa, fundamentos e consenso dos analistas a partir de get_company_info.
+    """
+    name = info.get("longName") or info.get("shortName")
+    lines = [_fields([("Empresa", name), ("Setor", info.get("sector")), ("Indústria", info.get("industry")),
+                      ("País", info.get("country")), ("Moeda", info.get("currency"))])]
+
+    fundamentals = _fields([
+        ("Valor de mercado", info.get("marketCap")), ("P/L", info.get("trailingPE")),
+        ("P/L projetado", info.get("forwardPE")), ("Dividend yield", info.get("dividendYield")),
+        ("Beta", info.get("beta")), ("Mínima 52s", info.get("fiftyTwoWeekLow")),
+        ("Máxima 52s", info.get("fiftyTwoWeekHigh")),
+    ])
+    if fundamentals:
+        lines.append("Fundamentos: " + fundamentals)
+
+    analysts = _fields([
+        ("Recomendação", info.get("recommendationKey")),
+        ("Nota média (1=compra forte, 5=venda)", info.get("recommendationMean")),
+        ("Analistas", info.get("numberOfAnalystOpinions")), ("Preço-alvo médio", info.get("targetMeanPrice")),
+        ("Preço-alvo mínimo", info.get("targetLowPrice")), ("Preço-alvo máximo", info.get("targetHighPrice")),
+    ])
+    lines.append("Analistas: " + (analysts or "sem recomendação disponível"))
+    return lines
+
+
+def _news_lines(news: list[dict]) -> list[str]:
+    """
+    Uma linha por notícia: data, fonte, título e link.
+    """
+    if not news:
+        return ["Notícias: nenhuma notícia recente disponível"]
+    lines = ["Notícias:"]
+    for item in news:
+        published = (item.get("published") or "")[:10]
+        parts = [p for p in (published, item.get("publisher"), item["title"], item.get("url")) if p]
+        lines.append("- " + " | ".join(parts))
+    return lines
+
+
+def build_context(ticker: str) -> str | None:
+    """
+    Monta o contexto compacto da análise de IA de um ticker (texto simples, uma informação por linha).
+
+    Args:
+        ticker (str): O símbolo do ticker (ex: "AAPL").
+
+    Returns:
+        str | None: O contexto, ou None se não houver nem barras nem informações do ticker.
+    """
+    ticker = ticker.upper()
+    specs = parse_specs(settings.AI_CONTEXT_INDICATORS)
+    frame = yfinance_tool.get_historical_frame(ticker, settings.AI_CONTEXT_PERIOD, "1d", specs)
+    info = yfinance_tool.get_company_info(ticker)
+    if frame is None and info is None:
+        return None
+
+    lines = [f"Ticker: {ticker}"]
+    if info is not None:
+        lines += _info_lines(info)
+    if frame is not None:
+        indicator_columns = [c for spec in specs for c in column_names(*spec)]
+        lines += _price_lines(frame, indicator_columns)
+    else:
+        lines.append("Preços: sem barras disponíveis")
+    lines += _news_lines(yfinance_tool.get_company_news(ticker)[:settings.AI_CONTEXT_NEWS_ITEMS])
+    return "\n".join(lines)
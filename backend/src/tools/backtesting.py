@@ -0,0 +1,211 @@
+# backend/src/tools/backtesting.py
+
+import numpy as np
+import pandas as pd
+
+# Primitivas vetorizadas (médias, RSI, máximas/mínimas móveis)
+from src.tools import indicators
+# Estratégias disponíveis e validação dos parâmetros
+from src.tools.strategy_specs import parse_params
+
+# Barras por ano usadas quando as datas não permitem estimar (ex: uma única barra)
+DEFAULT_PERIODS_PER_YEAR = 252.0
+
+
+def periods_per_year(index: pd.DatetimeIndex) -> float:
+    """
+    Número de barras por ano, estimado pelas próprias datas (anualiza retorno, volatilidade e Sharpe).
+    Funciona para qualquer intervalo e calendário: ~252 em ações diárias, ~365 em cripto diária.
+    """
+    if len(index) < 2:
+        return DEFAULT_PERIODS_PER_YEAR
+    years = (index[-1] - index[0]) / pd.Timedelta(days=365.25)
+    return (len(index) - 1) / years if years > 0 else DEFAULT_PERIODS_PER_YEAR
+
+
+def _hold(entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """
+    Posição (1 = comprado, 0 = fora) mantida de um sinal de entrada até o próximo sinal de saída,
+    sem laço no tempo: cada barra repete o último sinal emitido até ela.
+    """
+    signal = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    positions = np.arange(signal.shape[-1])
+    last = np.maximum.accumulate(np.where(np.isnan(signal), -1, positions), axis=-1)
+    held = np.take_along_axis(signal, np.maximum(last, 0), axis=-1)
+    return np.where(last >= 0, held, 0.0)
+
+
+def positions(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+              strategy: str, combos: list[dict]) -> np.ndarray:
+    """
+    Calcula a posição de cada combinação de parâmetros em cada barra, em uma matriz (combinações x barras).
+    Cada indicador é calculado uma única vez por janela distinta e compartilhado entre as combinações.
+    A posição de uma barra é decidida no fechamento dela (e só rende a partir da barra seguinte).
+    """
+    if strategy in ("sma_cross", "ema_cross"):
+        if strategy == "sma_cross":
+            average = indicators.sma
+        else:
+            # Sem valor até 'span' barras, como a SMA: a EMA não opera no aquecimento
+            average = lambda values, span: indicators.ema(values, span, min_periods=span)
+        by_window = {w: average(close, w) for w in {c["fast"] for c in combos} | {c["slow"] for c in combos}}
+        fast = np.stack([by_window[c["fast"]] for c in combos])
+        slow = np.stack([by_window[c["slow"]] for c in combos])
+        # Comparações com NaN (aquecimento das médias) dão False: fora do mercado
+        return (fast > slow).astype(float)
+
+    if strategy == "rsi":
+        by_window = {w: indicators.rsi(close, w) for w in {c["window"] for c in combos}}
+        values = np.stack([by_window[c["window"]] for c in combos])
+        lower = np.array([c["lower"] for c in combos])[:, None]
+        upper = np.array([c["upper"] for c in combos])[:, None]
+        return _hold(values < lower, values > upper)
+
+    if strategy == "breakout":
+        # Máxima/mínima das barras anteriores (sem incluir a barra atual)
+        highs = {w: indicators._shift(indicators.rolling_max(high, w)) for w in {c["window"] for c in combos}}
+        lows = {w: indicators._shift(indicators.rolling_min(low, w)) for w in {c["exit_window"] for c in combos}}
+        entries = close > np.stack([highs[c["window"]] for c in combos])
+        exits = close < np.stack([lows[c["exit_window"]] for c in combos])
+        return _hold(entries, exits)
+
+    raise ValueError(f"Estratégia desconhecida: {strategy}")
+
+
+def simulate(close: np.ndarray, position: np.ndarray, cost_bps: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Retornos por barra e curva de capital de cada linha de 'position' (vetorizado em todas as linhas).
+
+    Args:
+        close (np.ndarray): Fechamentos (barras).
+        position (np.ndarray): Posições (combinações x barras), decididas no fechamento de cada barra.
+        cost_bps (float): Custo por operação (compra ou venda), em pontos-base do valor negociado.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (retornos da estratégia por barra, capital acumulado a partir de 1.0).
+    """
+    returns = np.zeros(close.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = close[1:] / close[:-1] - 1.0
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    held = np.nan_to_num(indicators._shift(position))
+    turnover = np.abs(np.diff(held, axis=-1, prepend=0.0))
+    strategy_returns = held * returns - turnover * (cost_bps / 10_000)
+    return strategy_returns, np.cumprod(1.0 + strategy_returns, axis=-1)
+
+
+def metrics(strategy_returns: np.ndarray, equity: np.ndarray, position: np.ndarray,
+            periods: float) -> dict[str, np.ndarray]:
+    """
+    Métricas de desempenho de cada linha (combinação): retorno total e anualizado, volatilidade,
+    Sharpe (taxa livre de risco zero), máximo drawdown, número de operações e exposição.
+    """
+    bars = strategy_returns.shape[-1]
+    total_return = equity[..., -1] - 1.0
+    mean = strategy_returns.mean(axis=-1)
+    std = strategy_returns.std(axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods), 0.0)
+        annual_return = np.where(equity[..., -1] > 0, equity[..., -1] ** (periods / bars) - 1.0, -1.0)
+
+    return {
+        "total_return": total_return,
+        "annual_return": annual_return,
+        "volatility": std * np.sqrt(periods),
+        "sharpe": sharpe,
+        "max_drawdown": drawdown.min(axis=-1),
+        "trades": (np.diff(position, axis=-1, prepend=0.0) > 0).sum(axis=-1),
+        "exposure": position.mean(axis=-1),
+    }
+
+
+def sweep(close: np.ndarray, high: np.ndarray, low: np.ndarray, periods: float,
+          strategy: str, combos: list[dict], cost_bps: float = 0.0) -> list[dict]:
+    """
+    Avalia um bloco de combinações de parâmetros sobre uma série (todas de uma vez, em matrizes).
+    Recebe e devolve apenas tipos simples, para rodar em outro processo (ver backtest_service).
+
+    Returns:
+        list[dict]: Para cada combinação (na mesma ordem): {"params": ..., métricas...}.
+    """
+    position = positions(close, high, low, strategy, combos)
+    strategy_returns, equity = simulate(close, position, cost_bps)
+    values = metrics(strategy_returns, equity, position, periods)
+    results = []
+    for row, combo in enumerate(combos):
+        result = {"params": combo, **{name: float(column[row]) for name, column in values.items()}}
+        result["trades"] = int(result["trades"])
+        results.append(result)
+    return results
+
+
+def trade_list(dates: pd.DatetimeIndex, close: np.ndarray, position: np.ndarray,
+               cost_bps: float = 0.0) -> list[dict]:
+    """
+    Operações de uma única série de posições: datas e preços de entrada/saída e o retorno de cada uma.
+    Uma operação ainda aberta na última barra aparece com 'exit_date' None e o retorno até ela.
+    """
+    change = np.diff(position, prepend=0.0)
+    entries = np.flatnonzero(change > 0)
+    exits = np.flatnonzero(change < 0)
+    cost = cost_bps / 10_000
+
+    trades = []
+    for i, entry in enumerate(entries):
+        is_open = i >= len(exits)
+        exit_ = len(close) - 1 if is_open else exits[i]
+        trades.append({
+            "entry_date": dates[entry].isoformat(),
+            "entry_price": float(close[entry]),
+            "exit_date": None if is_open else dates[exit_].isoformat(),
+            "exit_price": float(close[exit_]),
+            "bars": int(exit_ - entry),
+            "return": float(close[exit_] / close[entry] - 1.0 - cost * (1 if is_open else 2)),
+        })
+    return trades
+
+
+def backtest(bars: pd.DataFrame, strategy: str, params: dict | None = None,
+             cost_bps: float = 0.0) -> dict:
+    """
+    Executa uma estratégia com um conjunto de parâmetros sobre as barras de um ticker.
+
+    Args:
+        bars (pd.DataFrame): Barras OHLCV indexadas por data, em ordem cronológica.
+        strategy (str): A estratégia (ver strategy_specs.STRATEGIES).
+        params (dict | None): Os parâmetros (os omitidos usam os padrões).
+        cost_bps (float): Custo por operação, em pontos-base.
+
+    Returns:
+        dict: 'params', 'metrics' (inclui 'win_rate'), 'trades' e 'equity_curve' (DataFrame com
+              Date, Close, Position, Equity e Drawdown).
+
+    Raises:
+        ValueError: Se a estratégia ou os parâmetros forem inválidos.
+    """
+    params = parse_params(strategy, params)
+    close = bars['Close'].to_numpy(dtype=float)
+    high = bars['High'].to_numpy(dtype=float)
+    low = bars['Low'].to_numpy(dtype=float)
+
+    position = positions(close, high, low, strategy, [params])
+    strategy_returns, equity = simulate(close, position, cost_bps)
+    values = metrics(strategy_returns, equity, position, periods_per_year(bars.index))
+    trades = trade_list(bars.index, close, position[0], cost_bps)
+
+    summary = {name: float(column[0]) for name, column in values.items()}
+    summary["trades"] = int(summary["trades"])
+    summary["win_rate"] = (sum(t["return"] > 0 for t in trades) / len(trades)) if trades else None
+
+    curve = pd.DataFrame({
+        "Date": bars.index,
+        "Close": close,
+        "Position": position[0],
+        "Equity": equity[0],
+        "Drawdown": equity[0] / np.maximum.accumulate(equity[0]) - 1.0,
+    })
+    return {"params": params, "metrics": summary, "trades": trades, "equity_curve": curve}
+
@@ -0,0 +1,108 @@
+# backend/src/tools/downsampling.py
+
+import numpy as np
+import pandas as pd
+
+# Agregação OHLCV vetorizada (a mesma usada na reamostragem de intervalos)
+from src.tools.resampling import aggregate_ohlcv
+
+# Métodos de redução de pontos aceitos pela API
+DOWNSAMPLE_METHODS = ("lttb", "ohlc")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: escolhe 'threshold' pontos que preservam a forma visual da série.
+
+    O primeiro e o último ponto são mantidos; os demais são divididos em (threshold - 2) baldes e,
+    em cada balde, fica o ponto que forma o maior triângulo com o ponto escolhido no balde anterior
+    e a média do balde seguinte.
+
+    Args:
+        x (np.ndarray): Eixo x (crescente), ex: datas em nanossegundos.
+        y (np.ndarray): Valores da série (NaN são tratados como 0 no cálculo da área).
+        threshold (int): Número de pontos desejado (>= 3).
+
+    Returns:
+        np.ndarray: Os índices (crescentes) dos pontos escolhidos.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+
+    # Limites dos baldes internos (o primeiro e o último ponto ficam fora deles)
+    edges = 1 + (np.arange(threshold - 1) * (n - 2)) // (threshold - 2)
+    # Média de cada balde, usada como terceiro vértice do triângulo do balde anterior
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 1 < threshold - 2:
+            next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+
+        # Área (x2) do triângulo (ponto escolhido, candidato, média do próximo balde) para cada candidato
+        area = np.abs((x[selected] - next_x) * (y[start:end] - y[selected])
+                      - (x[selected] - x[start:end]) * (next_y - y[selected]))
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def lttb(frame: pd.DataFrame, points: int, column: str = "Close") -> pd.DataFrame:
+    """
+    Reduz o DataFrame (coluna 'Date' + barras) a 'points' linhas escolhidas por LTTB sobre 'column'.
+    As linhas mantidas são barras reais, com todas as colunas (OHLCV e indicadores) originais.
+    """
+    x = frame['Date'].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    indices = lttb_indices(x, frame[column].to_numpy(dtype=float), points)
+    return frame.iloc[indices].reset_index(drop=True)
+
+
+def ohlc_buckets(frame: pd.DataFrame, points: int) -> pd.DataFrame:
+    """
+    Agrega as barras em 'points' baldes consecutivos (com o mesmo número de barras), preservando
+    os extremos: Open da primeira barra, High máximo, Low mínimo, Close da última barra e Volume somado.
+    A data é a da primeira barra do balde; as demais colunas (indicadores) ficam com o valor da última.
+    """
+    # Início de cada balde (np.linspace distribui o resto da divisão entre os baldes)
+    starts = np.unique(np.linspace(0, len(frame), points, endpoint=False).astype(np.int64))
+
+    result = aggregate_ohlcv(frame.drop(columns=['Date']), starts)
+    # Mantém o fuso e o tipo da coluna de datas
+    result.insert(0, 'Date', frame['Date'].iloc[starts].reset_index(drop=True))
+    return result
+
+
+def downsample(frame: pd.DataFrame, points: int | None, method: str = "lttb") -> pd.DataFrame:
+    """
+    Reduz uma série histórica a aproximadamente 'points' linhas (resolução de tela).
+
+    Args:
+        frame (pd.DataFrame): A série (coluna 'Date', OHLCV e indicadores), em ordem cronológica.
+        points (int | None): Número máximo de linhas. None (ou uma série menor) devolve a série inteira.
+        method (str): "lttb" (barras reais escolhidas pela forma do fechamento, para gráficos de linha)
+                      ou "ohlc" (barras agregadas preservando máximas e mínimas, para candles).
+
+    Returns:
+        pd.DataFrame: A série reduzida.
+
+    Raises:
+        ValueError: Se o método for desconhecido.
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Método de redução desconhecido: {method}")
+    if points is None or len(frame) <= points:
+        return frame
+    if method == "lttb":
+        return lttb(frame, points)
+    return ohlc_buckets(frame, points)
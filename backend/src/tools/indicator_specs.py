@@ -0,0 +1,87 @@
+# backend/src/tools/indicator_specs.py
+#
+# Interpretação dos indicadores pedidos pelo cliente. Não depende de NumPy/pandas, para que as rotas
+# possam validar os parâmetros sem carregar o motor de cálculo (src/tools/indicators.py) na inicialização.
+
+import re
+
+# Indicadores padrão (mantém o formato histórico da API: SMA_20 e EMA_20)
+DEFAULT_INDICATORS = "sma_20,ema_20"
+
+# Maior janela aceita em um indicador (protege a API de pedidos absurdos)
+MAX_WINDOW = 500
+
+# Nome -> parâmetros padrão (na ordem em que aparecem na especificação, ex: "macd_12_26_9")
+_DEFAULT_PARAMS = {
+    "sma": (20,),
+    "ema": (20,),
+    "rsi": (14,),
+    "macd": (12, 26, 9),
+    "bbands": (20, 2.0),
+    "atr": (14,),
+    "vwap": (),
+    "obv": (),
+}
+
+
+def parse_specs(spec: str | None) -> list[tuple[str, tuple]]:
+    """
+    Interpreta a lista de indicadores pedida pelo cliente.
+
+    Args:
+        spec (str | None): Indicadores separados por vírgula, com parâmetros após "_"
+                           (ex: "sma_50,ema_20,rsi_14,macd_12_26_9,bbands_20_2,atr_14,vwap,obv").
+                           Parâmetros omitidos usam os padrões. None/vazio usa DEFAULT_INDICATORS.
+
+    Returns:
+        list[tuple[str, tuple]]: Pares (nome, parâmetros), sem repetições.
+
+    Raises:
+        ValueError: Se algum indicador ou parâmetro for inválido.
+    """
+    specs = []
+    for item in (spec or DEFAULT_INDICATORS).lower().split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, *raw_params = item.split("_")
+        if name not in _DEFAULT_PARAMS:
+            raise ValueError(f"Indicador desconhecido: {item}")
+
+        defaults = _DEFAULT_PARAMS[name]
+        if len(raw_params) > len(defaults) or not all(re.fullmatch(r"\d+(\.\d+)?", p) for p in raw_params):
+            raise ValueError(f"Parâmetros inválidos para o indicador: {item}")
+
+        params = tuple(type(d)(float(p)) for d, p in zip(defaults, raw_params)) + defaults[len(raw_params):]
+        windows = [p for p in params if isinstance(p, int)]
+        if any(w < 1 or w > MAX_WINDOW for w in windows):
+            raise ValueError(f"Janela fora do intervalo 1..{MAX_WINDOW}: {item}")
+
+        if (name, params) not in specs:
+            specs.append((name, params))
+    return specs
+
+
+def column_names(name: str, params: tuple) -> list[str]:
+    """
+    Nomes das colunas geradas por um indicador (ex: ("sma", (20,)) -> ["SMA_20"]).
+    """
+    suffix = "".join(f"_{p:g}" if isinstance(p, float) else f"_{p}" for p in params)
+    if name == "macd":
+        return [f"MACD{suffix}", f"MACD_SIGNAL{suffix}", f"MACD_HIST{suffix}"]
+    if name == "bbands":
+        return [f"BB_UPPER{suffix}", f"BB_MIDDLE{suffix}", f"BB_LOWER{suffix}"]
+    return [f"{name.upper()}{suffix}"]
+
+
+def warmup_bars(specs: list[tuple[str, tuple]]) -> int:
+    """
+    Número de barras anteriores necessárias para que os indicadores já tenham valor na primeira barra pedida.
+    """
+    bars = 0
+    for name, params in specs:
+        if name == "macd":
+            bars = max(bars, params[1] + params[2])
+        elif params:
+            bars = max(bars, int(params[0]))
+    return bars
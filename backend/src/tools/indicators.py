@@ -0,0 +1,238 @@
+# backend/src/tools/indicators.py
+
+import numpy as np
+import pandas as pd
+
+# Indicadores selecionáveis: nomes, parâmetros padrão e interpretação da especificação do cliente
+from src.tools.indicator_specs import DEFAULT_INDICATORS, MAX_WINDOW, parse_specs, column_names, warmup_bars
+
+
+# --- Primitivas vetorizadas (aceitam vetor ou matriz 2-D, operando no último eixo) ---
+
+def pad_series(series: list[np.ndarray]) -> np.ndarray:
+    """
+    Empilha séries de tamanhos diferentes em uma matriz 2-D (uma linha por série),
+    alinhadas à direita e preenchidas com NaN à esquerda.
+
+    O alinhamento é por barra, não por data: cada ticker mantém o próprio calendário
+    (ações não negociam no fim de semana, cripto sim), então as médias nunca atravessam lacunas.
+    """
+    length = max((len(s) for s in series), default=0)
+    matrix = np.full((len(series), length), np.nan, dtype=float)
+    for row, values in enumerate(series):
+        if len(values):
+            matrix[row, length - len(values):] = values
+    return matrix
+
+
+def _rolling_sums(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Soma e contagem de pontos válidos em janelas móveis, via somas acumuladas (sem laço no tempo).
+    Os arrays devolvidos têm (n - window + 1) posições no último eixo.
+    """
+    valid = ~np.isnan(values)
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    csum = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=-1)], axis=-1)
+    ccount = np.concatenate([zeros, np.cumsum(valid, axis=-1)], axis=-1)
+    return csum[..., window:] - csum[..., :-window], ccount[..., window:] - ccount[..., :-window]
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Média Móvel Simples (equivalente a rolling(window).mean() do pandas).
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+
+    window_sum, window_count = _rolling_sums(values, window)
+    # Só há média quando a janela inteira tem valores válidos (min_periods=window)
+    out[..., window - 1:] = np.where(window_count == window, window_sum / window, np.nan)
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Desvio padrão populacional (ddof=0) em janelas móveis, como usado nas Bandas de Bollinger.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+
+    window_sum, window_count = _rolling_sums(values, window)
+    window_sq_sum, _ = _rolling_sums(values * values, window)
+    mean = window_sum / window
+    # max(…, 0) absorve pequenos erros de arredondamento negativos
+    variance = np.maximum(window_sq_sum / window - mean * mean, 0.0)
+    out[..., window - 1:] = np.where(window_count == window, np.sqrt(variance), np.nan)
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Máximo em janelas móveis (equivalente a rolling(window).max() do pandas; NaN nas janelas com NaN).
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    out[..., window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window, axis=-1).max(axis=-1)
+    return out
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mínimo em janelas móveis (equivalente a rolling(window).min() do pandas; NaN nas janelas com NaN).
+    """
+    return -rolling_max(-np.asarray(values, dtype=float), window)
+
+
+def _ewm(values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Média exponencial recursiva (adjust=False). A recorrência roda no código compilado do pandas,
+    coluna a coluna, com NaN à esquerda ignorados até o primeiro valor válido.
+    """
+    values = np.asarray(values, dtype=float)
+    frame = pd.DataFrame(np.atleast_2d(values).T)
+    out = frame.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy().T
+    return out.reshape(values.shape)
+
+
+def ema(values: np.ndarray, span: int, min_periods: int = 0) -> np.ndarray:
+    """
+    Média Móvel Exponencial (equivalente a ewm(span=span, adjust=False, min_periods=min_periods).mean()).
+    """
+    return _ewm(values, 2.0 / (span + 1.0), min_periods)
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """
+    Desloca a série uma barra para frente no último eixo (o primeiro valor vira NaN).
+    """
+    out = np.full(values.shape, np.nan)
+    out[..., 1:] = values[..., :-1]
+    return out
+
+
+# --- Indicadores ---
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Índice de Força Relativa com suavização de Wilder (alpha = 1/window).
+    """
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    gain = _ewm(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), 1.0 / window, window)
+    loss = _ewm(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), 1.0 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    # Sem perdas na janela: RSI = 100
+    return np.where((loss == 0) & ~np.isnan(gain), 100.0, out)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD (EMA rápida - EMA lenta), linha de sinal e histograma.
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close: np.ndarray, window: int = 20, k: float = 2.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bandas de Bollinger: (superior, média, inferior) = SMA ± k desvios padrão.
+    """
+    middle = sma(close, window)
+    deviation = rolling_std(close, window)
+    return middle + k * deviation, middle, middle - k * deviation
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Average True Range com suavização de Wilder.
+    """
+    prev_close = _shift(close)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _ewm(true_range, 1.0 / window, window)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         sessions: np.ndarray) -> np.ndarray:
+    """
+    VWAP ancorado no início de cada sessão (reinicia a cada pregão).
+
+    Args:
+        sessions (np.ndarray): Código inteiro da sessão de cada barra (ex: a data do pregão).
+                               Em barras diárias ou maiores cada barra é a própria sessão.
+    """
+    typical = (high + low + close) / 3.0
+    pv = np.cumsum(np.nan_to_num(typical * volume))
+    vol = np.cumsum(np.nan_to_num(volume))
+
+    # Índice da primeira barra de cada sessão, repetido para todas as barras da sessão
+    starts = np.flatnonzero(np.r_[True, sessions[1:] != sessions[:-1]])
+    first = np.repeat(starts, np.diff(np.r_[starts, len(sessions)]))
+    pv_before = np.where(first > 0, pv[first - 1], 0.0)
+    vol_before = np.where(first > 0, vol[first - 1], 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = (pv - pv_before) / (vol - vol_before)
+    # Sessão sem volume até o momento: usa o preço típico
+    return np.where(np.isfinite(out), out, typical)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    On-Balance Volume: soma acumulada do volume com o sinal da variação do fechamento.
+    """
+    direction = np.sign(np.nan_to_num(np.diff(close, prepend=close[:1])))
+    return np.cumsum(direction * np.nan_to_num(volume))
+
+
+# --- Motor de indicadores selecionáveis ---
+
+def compute(bars: pd.DataFrame, specs: list[tuple[str, tuple]], intraday: bool = False) -> pd.DataFrame:
+    """
+    Calcula os indicadores pedidos sobre as barras OHLCV, extraindo cada coluna para NumPy uma única vez.
+
+    Args:
+        bars (pd.DataFrame): Barras indexadas por data, com Open/High/Low/Close/Volume.
+        specs (list[tuple[str, tuple]]): Indicadores, como devolvidos por parse_specs.
+        intraday (bool): Se as barras são intradiárias (define as sessões do VWAP).
+
+    Returns:
+        pd.DataFrame: Uma coluna por série de indicador, com o mesmo índice das barras.
+    """
+    close = bars['Close'].to_numpy(dtype=float)
+    high = bars['High'].to_numpy(dtype=float)
+    low = bars['Low'].to_numpy(dtype=float)
+    volume = bars['Volume'].to_numpy(dtype=float)
+
+    columns = {}
+    for name, params in specs:
+        if name == "sma":
+            values = [sma(close, params[0])]
+        elif name == "ema":
+            values = [ema(close, params[0])]
+        elif name == "rsi":
+            values = [rsi(close, params[0])]
+        elif name == "macd":
+            values = list(macd(close, *params))
+        elif name == "bbands":
+            values = list(bollinger(close, params[0], params[1]))
+        elif name == "atr":
+            values = [atr(high, low, close, params[0])]
+        elif name == "vwap":
+            if intraday:
+                sessions = bars.index.normalize().asi8
+            else:
+                sessions = np.arange(len(bars))
+            values = [vwap(high, low, close, volume, sessions)]
+        else:  # obv
+            values = [obv(close, volume)]
+
+        columns.update(zip(column_names(name, params), values))
+
+    return pd.DataFrame(columns, index=bars.index)
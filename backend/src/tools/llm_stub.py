@@ -0,0 +1,77 @@
+# backend/src/tools/llm_stub.py
+#
+# Substituto do time de agentes (phi + Groq) para benchmarks e testes sem rede, ativado com
+# AI_PROVIDER=stub. Responde com um texto sintético depois de uma latência configurável
+# (AI_STUB_LATENCY_SECONDS + até AI_STUB_LATENCY_JITTER_SECONDS), com a mesma interface usada por
+# ai_service: arun(prompt) devolve um objeto com 'content'; arun(prompt, stream=True) devolve
+# um iterador assíncrono de pedaços. StubChatModel substitui a chamada única ao modelo do modo "context".
+
+import asyncio
+import random
+import re
+from types import SimpleNamespace
+
+# Texto devolvido pelo stub (o ticker é extraído do prompt)
+_RESPONSE = (
+    "## Análise de {ticker}\n\n"
+    "| Indicador | Valor |\n|---|---|\n"
+    "| Recomendação dos analistas | Compra |\n| Preço-alvo médio | n/d |\n\n"
+    "Últimas notícias: resposta sintética gerada pelo modelo de teste ({model_id}).\n\n"
+    "Fontes: fixtures locais."
+)
+
+
+class StubAgentTeam:
+    """
+    Time de agentes falso: não acessa a rede nem carrega o phi/Groq.
+    """
+
+    def __init__(self, model_id: str, latency_seconds: float = 1.0, jitter_seconds: float = 0.0):
+        self.model_id = model_id
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.runs = 0
+
+    def _latency(self) -> float:
+        return self.latency_seconds + random.uniform(0.0, self.jitter_seconds)
+
+    def _response(self, prompt: str) -> str:
+        ticker = prompt.rsplit(" ", 1)[-1] if prompt else ""
+        return _RESPONSE.format(ticker=ticker, model_id=self.model_id)
+
+    async def arun(self, prompt: str, stream: bool = False):
+        self.runs += 1
+        if stream:
+            return self._stream(prompt)
+        await asyncio.sleep(self._latency())
+        return SimpleNamespace(content=self._response(prompt))
+
+    async def _stream(self, prompt: str):
+        # A latência é distribuída entre os pedaços (uma palavra por vez, como tokens)
+        words = self._response(prompt).split(" ")
+        pause = self._latency() / len(words)
+        for i, word in enumerate(words):
+            await asyncio.sleep(pause)
+            yield SimpleNamespace(content=word if i == 0 else " " + word)
+
+
+class StubChatModel(StubAgentTeam):
+    """
+    Modelo falso para a chamada única do modo "context" (ver phi_agent_setup.complete).
+    O ticker vem da linha "Ticker: ..." do contexto.
+    """
+
+    def _response(self, prompt: str) -> str:
+        match = re.search(r"^Ticker: (\S+)", prompt, flags=re.MULTILINE)
+        return _RESPONSE.format(ticker=match.group(1) if match else "", model_id=self.model_id)
+
+    async def complete(self, messages: list[dict], stream: bool = False):
+        response = await self.arun(messages[-1]["content"], stream=stream)
+        if not stream:
+            return response.content
+        return self._text_stream(response)
+
+    @staticmethod
+    async def _text_stream(response):
+        async for chunk in response:
+            yield chunk.content
@@ -0,0 +1,295 @@
+# backend/src/tools/market_data_providers.py
+#
+# Fontes dos dados de mercado usadas por yfinance_tool. Todo acesso à rede para barras e informações
+# de empresas passa por um MarketDataProvider, escolhido em settings.MARKET_DATA_PROVIDER:
+#   - "yfinance": o Yahoo Finance (padrão);
+#   - "replay": fixtures gravadas em disco (MARKET_DATA_REPLAY_DIR), sem rede - para benchmarks e
+#     testes de regressão de desempenho. As fixtures são gravadas com benchmarks/record_fixtures.py
+#     (ou geradas sinteticamente por benchmarks/load_benchmark.py).
+#
+# Layout das fixtures (mesma normalização de nomes do cache OHLCV):
+#   <dir>/<TICKER>_<intervalo>.parquet   barras OHLCV indexadas por data (com fuso)
+#   <dir>/<TICKER>.info.json             o dicionário .info do Yahoo
+#   <dir>/<TICKER>.news.json             a lista .news do Yahoo (opcional; sem ela, nenhuma notícia)
+
+import json
+import logging
+from abc import ABC, abstractmethod
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import yfinance as yf
+
+# Recorte de períodos no formato do yfinance ("6mo", "5d"...)
+from src.tools import ohlcv_cache
+# Importa as configurações (fonte escolhida, diretório das fixtures, latência simulada)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface das fontes de dados de mercado. Os métodos devolvem os mesmos formatos do yfinance,
+    para que o cache, os indicadores e a serialização não dependam da fonte.
+    Uma fonte que não implemente todos eles falha já ao ser instanciada.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, ticker: str, interval: str, period: str | None = None,
+                start: pd.Timestamp | None = None) -> pd.DataFrame:
+        """
+        Barras de um ticker por período (ex: "6mo") ou a partir de um instante inicial
+        (DataFrame vazio se não houver dados).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def download(self, tickers: list[str], interval: str, period: str | None = None,
+                 start: pd.Timestamp | None = None) -> dict[str, pd.DataFrame]:
+        """
+        Barras de vários tickers de uma vez: ticker -> barras (tickers sem dados ficam de fora).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def info(self, ticker: str) -> dict:
+        """
+        O dicionário de informações da empresa (vazio se não houver dados).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def news(self, ticker: str) -> list[dict]:
+        """
+        As notícias recentes do ticker, no formato do yfinance (lista vazia se não houver).
+        """
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Dados do Yahoo Finance via yfinance.
+    """
+
+    name = "yfinance"
+
+    def history(self, ticker, interval, period=None, start=None):
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+    def download(self, tickers, interval, period=None, start=None):
+        if not tickers:
+            return {}
+
+        kwargs = {"start": start} if start is not None else {"period": period}
+        data = yf.download(
+            tickers,
+            interval=interval,
+            group_by="ticker",
+            actions=True,        # Inclui Dividends/Stock Splits, como o Ticker.history
+            auto_adjust=True,
+            ignore_tz=False,     # Mantém o índice com fuso, compatível com o cache
+            threads=True,
+            progress=False,
+            **kwargs,
+        )
+
+        frames = {}
+        if data is None or data.empty:
+            return frames
+
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                frame = data[ticker]
+            else:
+                frame = data
+            # Remove as datas em que este ticker não negociou (calendários diferentes no mesmo lote)
+            frame = frame.dropna(subset=["Close"])
+            frame.columns.name = None
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def news(self, ticker):
+        return yf.Ticker(ticker).news or []
+
+
+def fixture_path(fixtures_dir: str, ticker: str, interval: str | None = None, kind: str = "info") -> str:
+    """
+    Caminho da fixture de barras (com 'interval') ou, sem 'interval', de informações ou notícias
+    ('kind' "info" ou "news") de um ticker.
+    """
+    safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+    name = f"{safe_ticker}_{interval}.parquet" if interval else f"{safe_ticker}.{kind}.json"
+    return os.path.join(fixtures_dir, name)
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Reproduz fixtures gravadas em disco, sem rede.
+
+    As datas das barras são deslocadas em semanas inteiras para que a última barra gravada caia na
+    semana corrente (preservando dia da semana e horário): períodos como "6mo", o TTL do cache e as
+    buscas incrementais se comportam como com dados ao vivo. 'latency_seconds' simula o tempo de
+    resposta do Yahoo em cada chamada.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str, latency_seconds: float = 0.0, shift_to_now: bool = True):
+        self.fixtures_dir = fixtures_dir
+        self.latency_seconds = latency_seconds
+        self.shift_to_now = shift_to_now
+        self._bars: dict[tuple[str, str], pd.DataFrame | None] = {}
+        self._lock = threading.Lock()
+
+    def _wait(self) -> None:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+    def _load(self, ticker: str, interval: str) -> pd.DataFrame | None:
+        key = (ticker.upper(), interval)
+        with self._lock:
+            if key in self._bars:
+                return self._bars[key]
+
+        path = fixture_path(self.fixtures_dir, ticker, interval)
+        bars = pd.read_parquet(path) if os.path.exists(path) else None
+        if bars is not None and self.shift_to_now and not bars.empty:
+            last = bars.index[-1]
+            weeks = (pd.Timestamp.now(tz=last.tz) - last) // pd.Timedelta(weeks=1)
+            if weeks > 0:
+                bars = bars.copy()
+                bars.index = bars.index + pd.Timedelta(weeks=weeks)
+
+        with self._lock:
+            self._bars[key] = bars
+        return bars
+
+    def _slice(self, bars: pd.DataFrame | None, period: str | None, start) -> pd.DataFrame:
+        if bars is None:
+            return pd.DataFrame()
+        if start is not None:
+            return bars[bars.index >= pd.Timestamp(start)]
+        return ohlcv_cache.slice_period(bars, period or "max")
+
+    def history(self, ticker, interval, period=None, start=None):
+        self._wait()
+        return self._slice(self._load(ticker, interval), period, start)
+
+    def download(self, tickers, interval, period=None, start=None):
+        self._wait()
+        frames = {}
+        for ticker in tickers:
+            bars = self._slice(self._load(ticker, interval), period, start)
+            if not bars.empty:
+                frames[ticker] = bars
+        return frames
+
+    def _load_json(self, path: str, default):
+        self._wait()
+        if not os.path.exists(path):
+            return default
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def info(self, ticker):
+        return self._load_json(fixture_path(self.fixtures_dir, ticker), {})
+
+    def news(self, ticker):
+        return self._load_json(fixture_path(self.fixtures_dir, ticker, kind="news"), [])
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Repassa as chamadas para outra fonte e grava as respostas como fixtures do ReplayProvider
+    (as barras novas são mescladas às já gravadas).
+    """
+
+    name = "recording"
+
+    def __init__(self, inner: MarketDataProvider, fixtures_dir: str):
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def _record_bars(self, ticker: str, interval: str, bars: pd.DataFrame) -> None:
+        if bars is None or bars.empty:
+            return
+        path = fixture_path(self.fixtures_dir, ticker, interval)
+        if os.path.exists(path):
+            bars = ohlcv_cache.merge(pd.read_parquet(path), bars)
+        bars.to_parquet(path)
+
+    def history(self, ticker, interval, period=None, start=None):
+        bars = self.inner.history(ticker, interval, period, start)
+        self._record_bars(ticker, interval, bars)
+        return bars
+
+    def download(self, tickers, interval, period=None, start=None):
+        frames = self.inner.download(tickers, interval, period, start)
+        for ticker, bars in frames.items():
+            self._record_bars(ticker, interval, bars)
+        return frames
+
+    def info(self, ticker):
+        info = self.inner.info(ticker)
+        if info:
+            with open(fixture_path(self.fixtures_dir, ticker), "w", encoding="utf-8") as f:
+                json.dump(info, f, default=str)
+        return info
+
+    def news(self, ticker):
+        news = self.inner.news(ticker)
+        if news:
+            with open(fixture_path(self.fixtures_dir, ticker, kind="news"), "w", encoding="utf-8") as f:
+                json.dump(news, f, default=str)
+        return news
+
+
+# Fonte em uso no processo (criada no primeiro uso a partir das configurações)
+_provider: MarketDataProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """
+    Devolve a fonte de dados de mercado do processo (settings.MARKET_DATA_PROVIDER).
+
+    Raises:
+        ValueError: Se a fonte configurada for desconhecida.
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if settings.MARKET_DATA_PROVIDER == "yfinance":
+                _provider = YFinanceProvider()
+            elif settings.MARKET_DATA_PROVIDER == "replay":
+                _provider = ReplayProvider(settings.MARKET_DATA_REPLAY_DIR,
+                                           settings.MARKET_DATA_REPLAY_LATENCY_SECONDS)
+            else:
+                raise ValueError(f"Fonte de dados de mercado desconhecida: {settings.MARKET_DATA_PROVIDER}")
+            logger.info("Fonte de dados de mercado: %s", _provider.name)
+        return _provider
+
+
+def set_provider(provider: MarketDataProvider | None) -> None:
+    """
+    Substitui a fonte de dados do processo (None volta a usar a das configurações).
+    """
+    global _provider
+    with _provider_lock:
+        _provider = provider
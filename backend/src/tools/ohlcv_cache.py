@@ -0,0 +1,332 @@
+# backend/src/tools/ohlcv_cache.py
+
+import json
+import logging
+import math
+import os
+import re
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+# Cache em memória com descarte LRU (quadros já lidos neste processo)
+from src.utils.ttl_cache import TTLCache
+# Horário do pregão (barras buscadas após o fechamento valem até a abertura)
+from src.utils import market_hours
+# Importa as configurações (diretório e TTLs do cache)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Valor gravado em 'covered_from' quando o arquivo contém todo o histórico disponível (period="max")
+COVERS_MAX = "max"
+
+# Caminho -> (identidade do arquivo, DataFrame) dos arquivos já lidos neste processo: enquanto o
+# arquivo não é substituído, uma nova leitura não refaz nem a conversão para pandas
+_frames = TTLCache(settings.OHLCV_CACHE_MEMORY_ENTRIES, 24 * 3600)
+
+
+def _cache_paths(ticker: str, interval: str, kind: str = "bars") -> tuple[str, str]:
+    """
+    Monta os caminhos do arquivo Arrow (dados) e do arquivo JSON (metadados) de um ticker+intervalo.
+    'kind' diferencia as barras ("bars") dos indicadores calculados sobre elas ("indicators").
+    """
+    # Normaliza o ticker para um nome de arquivo seguro (ex: "^GSPC" -> "_GSPC", "BRK-B" continua "BRK-B")
+    safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+    base = os.path.join(settings.OHLCV_CACHE_DIR, f"{safe_ticker}_{interval}")
+    if kind != "bars":
+        base = f"{base}.{kind}"
+    return f"{base}.arrow", f"{base}.json"
+
+
+def _read_frame(path: str) -> pd.DataFrame:
+    """
+    Lê um DataFrame gravado em Arrow IPC. O arquivo é mapeado em memória e as colunas numéricas
+    apontam direto para as páginas mapeadas (sem cópia e somente leitura): os workers do host que
+    leem as mesmas barras compartilham o cache de páginas do sistema em vez de cada um decodificar
+    a sua cópia. No Windows o arquivo é lido para a memória, pois um arquivo mapeado não pode ser
+    substituído por outro processo.
+
+    O DataFrame fica guardado em memória enquanto o arquivo não muda; cada chamador recebe uma cópia
+    rasa (as colunas continuam compartilhadas e não devem ser alteradas).
+    """
+    stat = os.stat(path)
+    identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    entry = _frames.get(path)
+    if entry is not None and entry[0] == identity:
+        return entry[1].copy(deep=False)
+
+    source = pa.OSFile(path, "rb") if os.name == "nt" else pa.memory_map(path, "r")
+    with source:
+        table = pa.ipc.open_file(source).read_all()
+    frame = table.to_pandas(split_blocks=True)
+    _frames.set(path, (identity, frame))
+    return frame.copy(deep=False)
+
+
+def _write_frame(df: pd.DataFrame, path: str) -> None:
+    """
+    Grava um DataFrame em Arrow IPC (formato de arquivo, sem compressão) de forma atômica. Leitores
+    com o arquivo antigo mapeado continuam com ele até terminar.
+    """
+    # O sufixo com o PID evita que dois workers escrevam no mesmo arquivo temporário
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    table = pa.Table.from_pandas(df)
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def period_start(period: str, now: pd.Timestamp | None = None) -> pd.Timestamp | None:
+    """
+    Converte um período no formato do yfinance (ex: "6mo", "1y", "ytd") no instante inicial equivalente.
+
+    Args:
+        period (str): O período ("1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max").
+        now (pd.Timestamp | None): Instante de referência (UTC). O padrão é o instante atual.
+
+    Returns:
+        pd.Timestamp | None: O instante inicial (UTC), ou None para "max" (todo o histórico).
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Período inválido: {period}")
+
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        # Para períodos em dias o yfinance conta pregões, não dias corridos.
+        # Usamos uma margem de calendário (fins de semana/feriados) para garantir a cobertura.
+        return now - pd.Timedelta(days=math.ceil(amount * 7 / 5) + 3)
+    if unit == "wk":
+        return now - pd.DateOffset(weeks=amount)
+    if unit == "mo":
+        return now - pd.DateOffset(months=amount)
+    return now - pd.DateOffset(years=amount)
+
+
+def history_span(interval: str, bars: int) -> pd.Timedelta:
+    """
+    Intervalo de calendário que contém ao menos 'bars' barras do intervalo informado
+    (com margem para fins de semana, feriados e, nas barras intradiárias, o horário de pregão).
+    """
+    if bars <= 0:
+        return pd.Timedelta(0)
+    match = re.fullmatch(r"(\d+)(m|h|d|wk|mo)", interval)
+    amount, unit = (int(match.group(1)), match.group(2)) if match else (1, "d")
+    if unit in ("m", "h"):
+        # Um pregão de ações tem 390 minutos
+        minutes = amount * (60 if unit == "h" else 1)
+        sessions = math.ceil(bars * minutes / 390)
+    else:
+        sessions = bars * amount * {"d": 1, "wk": 5, "mo": 21}[unit]
+    return pd.Timedelta(days=math.ceil(sessions * 7 / 5) + 3)
+
+
+def read(ticker: str, interval: str) -> tuple[pd.DataFrame, dict] | None:
+    """
+    Lê as barras e os metadados gravados em disco para um ticker+intervalo.
+
+    Returns:
+        tuple[pd.DataFrame, dict] | None: (barras indexadas por data, metadados), ou None se não houver cache.
+    """
+    data_path, meta_path = _cache_paths(ticker, interval)
+    if not os.path.exists(data_path) or not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        bars = _read_frame(data_path)
+        return bars, meta
+    except Exception as e:
+        # Arquivo corrompido ou gravado pela metade: tratamos como cache inexistente
+        logger.error("Erro ao ler cache OHLCV para %s (%s): %s", ticker, interval, e)
+        return None
+
+
+def write(ticker: str, interval: str, bars: pd.DataFrame, covered_from: str | None,
+          extra: dict | None = None) -> dict | None:
+    """
+    Grava as barras e os metadados em disco de forma atômica (arquivo temporário + os.replace).
+
+    Args:
+        ticker (str): O símbolo do ticker.
+        interval (str): O intervalo das barras (ex: "1d", "5m").
+        bars (pd.DataFrame): As barras indexadas por data.
+        covered_from (str | None): Início (ISO, UTC) do histórico coberto, ou COVERS_MAX.
+        extra (dict | None): Metadados adicionais (ex: o intervalo de origem de barras derivadas).
+
+    Returns:
+        dict | None: Os metadados gravados, ou None se a gravação falhar.
+    """
+    data_path, meta_path = _cache_paths(ticker, interval)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+    meta = {
+        "ticker": ticker.upper(),
+        "interval": interval,
+        "fetched_at": time.time(),
+        "covered_from": covered_from,
+        **(extra or {}),
+    }
+
+    try:
+        _write_frame(bars, data_path)
+        tmp_suffix = f".{os.getpid()}.tmp"
+        with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + tmp_suffix, meta_path)
+        return meta
+    except Exception as e:
+        # Falha ao gravar o cache não deve impedir a resposta ao usuário
+        logger.error("Erro ao gravar cache OHLCV para %s (%s): %s", ticker, interval, e)
+        return None
+
+
+def bars_version(meta: dict | None) -> float | None:
+    """
+    Identifica a versão das barras em cache (muda a cada gravação). None quando não há cache.
+    """
+    return meta.get("fetched_at") if meta else None
+
+
+def read_indicators(ticker: str, interval: str, version: float) -> pd.DataFrame | None:
+    """
+    Lê os indicadores já calculados para a versão atual das barras de um ticker+intervalo.
+
+    Returns:
+        pd.DataFrame | None: Colunas de indicadores indexadas por data, ou None se não houver
+                             cache ou se ele tiver sido calculado sobre outra versão das barras.
+    """
+    data_path, meta_path = _cache_paths(ticker, interval, "indicators")
+    if not os.path.exists(data_path) or not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("bars_version") != version:
+            return None
+        return _read_frame(data_path)
+    except Exception as e:
+        logger.error("Erro ao ler cache de indicadores para %s (%s): %s", ticker, interval, e)
+        return None
+
+
+def write_indicators(ticker: str, interval: str, version: float, values: pd.DataFrame) -> None:
+    """
+    Grava, ao lado das barras, os indicadores calculados sobre a versão 'version' delas.
+    """
+    data_path, meta_path = _cache_paths(ticker, interval, "indicators")
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+    try:
+        _write_frame(values, data_path)
+        tmp_suffix = f".{os.getpid()}.tmp"
+        with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump({"bars_version": version}, f)
+        os.replace(meta_path + tmp_suffix, meta_path)
+    except Exception as e:
+        logger.error("Erro ao gravar cache de indicadores para %s (%s): %s", ticker, interval, e)
+
+
+def is_fresh(meta: dict, interval: str) -> bool:
+    """
+    Indica se as barras em cache ainda estão dentro do TTL configurado para o intervalo, ou se foram
+    buscadas depois do último fechamento com o pregão ainda fechado (não há barras novas até a abertura).
+    """
+    ttl = settings.OHLCV_CACHE_TTL_SECONDS.get(interval, settings.OHLCV_CACHE_DEFAULT_TTL_SECONDS)
+    fetched_at = meta.get("fetched_at", 0)
+    if (time.time() - fetched_at) < ttl:
+        return True
+    return "ticker" in meta and market_hours.closed_since(fetched_at, meta["ticker"])
+
+
+def covers(meta: dict, start: pd.Timestamp | None) -> bool:
+    """
+    Indica se o histórico em cache começa antes (ou no) instante inicial pedido.
+    """
+    covered_from = meta.get("covered_from")
+    if covered_from == COVERS_MAX:
+        return True
+    if covered_from is None or start is None:
+        return False
+    return pd.Timestamp(covered_from) <= start
+
+
+def covers_cache(meta: dict, other: dict) -> bool:
+    """
+    Indica se o histórico em cache de 'meta' começa antes (ou no) início do histórico de 'other'
+    (ex: se barras derivadas de 'meta' podem substituir as de 'other' sem encurtar o histórico).
+    """
+    other_from = other.get("covered_from")
+    if other_from is None:
+        return True
+    if other_from == COVERS_MAX:
+        return meta.get("covered_from") == COVERS_MAX
+    return covers(meta, pd.Timestamp(other_from))
+
+
+def merge(cached: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Junta barras novas às barras em cache. Em datas repetidas prevalece a barra nova
+    (a última barra do cache pode ter sido gravada ainda em formação).
+    """
+    if new is None or new.empty:
+        return cached
+    if cached is None or cached.empty:
+        return new
+    if cached.index.tz is not None and new.index.tz is not None and new.index.tz != cached.index.tz:
+        # Downloads em lote podem vir em UTC; mantemos o fuso das barras já gravadas
+        new = new.tz_convert(cached.index.tz)
+    combined = pd.concat([cached, new])
+    combined = combined[~combined.index.duplicated(keep="last")]
+    return combined.sort_index()
+
+
+def slice_period(bars: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Recorta, das barras em cache, apenas o trecho correspondente ao período pedido.
+    """
+    if period == "max" or bars.empty:
+        return bars
+
+    match = re.fullmatch(r"(\d+)d", period)
+    if match:
+        # Períodos em dias: últimos N pregões distintos, como faz o yfinance
+        sessions = bars.index.normalize().unique()
+        first_session = sessions[-int(match.group(1)):][0]
+        return bars[bars.index.normalize() >= first_session]
+
+    return bars[bars.index >= period_start(period)]
+
+
+
+def _in_bars_tz(bars: pd.DataFrame, moment) -> pd.Timestamp:
+    """
+    Converte um instante para comparação com o índice das barras: sem fuso, é interpretado
+    no fuso das próprias barras (o horário da bolsa, como as datas exibidas ao usuário).
+    """
+    moment = pd.Timestamp(moment)
+    if moment.tzinfo is None and bars.index.tz is not None:
+        return moment.tz_localize(bars.index.tz)
+    return moment
+
+
+def slice_range(bars: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Recorta as barras entre 'start' e 'end' (inclusive; None deixa o lado em aberto).
+    """
+    if start is not None:
+        bars = bars[bars.index >= _in_bars_tz(bars, start)]
+    if end is not None:
+        bars = bars[bars.index <= _in_bars_tz(bars, end)]
+    return bars
@@ -1,73 +1,288 @@
 # backend/src/tools/phi_agent_setup.py
 
-# Importa as classes necessárias do phi-agents e das ferramentas
-from phi.agent import Agent
-from phi.model.groq import Groq
-from phi.tools.yfinance import YFinanceTools
-from phi.tools.duckduckgo import DuckDuckGo
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
 
 # Importa as configurações, incluindo a chave da API
 from src.config.config import settings
 
-# Variável para armazenar o time de agentes inicializado
-multi_ai_agent = None
-
-try:
-    # Verifica se a chave GROQ está disponível antes de inicializar
-    if not settings.GROQ_API_KEY:
-        print("AVISO: GROQ_API_KEY não configurada. Agentes de IA não serão inicializados.")
-    else:
-        # Define os modelos a serem usados (verifique a disponibilidade na Groq)
-        # Usaremos modelos comuns, ajuste se precisar de modelos específicos como deepseek-r1-distill
-        groq_model_70b = "llama-3.1-8b-instant"#"llama-3.1-70b-versatile" # ou um modelo 70B equivalente disponível
-        groq_model_8b = "llama-3.1-8b-instant"    # ou um modelo 8B equivalente disponível
-
-
-        # Inicializa o Agente de Busca na Web
-        dsa_agente_web_search = Agent(
-            name="DSA Agente Web Search",
-            role="Fazer busca na web",
-            model=Groq(id=groq_model_8b, api_key=settings.GROQ_API_KEY),
-            tools=[DuckDuckGo()],
-            instructions=["Sempre inclua as fontes"],
-            show_tool_calls=False,  # Desativa logs detalhados de tools nas respostas para API
-            markdown=False         # Desativa markdown na saída direta do agente individual
-        )
-
-        # Inicializa o Agente Financeiro
-        dsa_agente_financeiro = Agent(
-            name="DSA Agente Financeiro",
-            model=Groq(id=groq_model_70b, api_key=settings.GROQ_API_KEY),
-            tools=[
-                YFinanceTools(
-                    stock_price=True,
-                    analyst_recommendations=True,
-                    stock_fundamentals=True,
-                    company_news=True
-                )
-            ],
-            instructions=["Use tabelas para mostrar os dados"],
-            show_tool_calls=False,
-            markdown=False
-        )
-
-        # Inicializa o Time de Agentes (Multi-Agente)
-        multi_ai_agent = Agent(
-            team=[dsa_agente_web_search, dsa_agente_financeiro],
-            model=Groq(id=groq_model_70b, api_key=settings.GROQ_API_KEY), # O time usa um modelo
-            instructions=[
-                "Resuma a recomendação do analista e as últimas notícias.",
-                "Sempre inclua as fontes.",
-                "Use tabelas para mostrar os dados.",
-                "Se a recomendação ou notícias não forem encontradas, indique isso claramente."
-            ],
-            show_tool_calls=False, # Desativa para a resposta final do time
-            markdown=True          # Ativa markdown para a resposta final do time, útil para formatação do texto de análise
-        )
-
-        print("Agentes de IA inicializados com sucesso.")
-
-except Exception as e:
-    # Captura exceções durante a inicialização (ex: erro na chave, problema de conexão)
-    print(f"ERRO ao inicializar Agentes de IA: {e}")
-    # multi_ai_agent permanece None, indicando que não está disponível
\ No newline at end of file
+# phi-agents, as ferramentas (yfinance, DuckDuckGo) e o SDK da Groq são importados no primeiro uso
+# (ou no pré-aquecimento), não na importação deste módulo: a API sobe sem carregá-los.
+if TYPE_CHECKING:
+    from phi.agent import Agent
+    from phi.model.groq import Groq
+    from groq import Groq as GroqClient, AsyncGroq as AsyncGroqClient
+
+logger = logging.getLogger(__name__)
+
+# Define os modelos a serem usados pelos agentes membros do time (verifique a disponibilidade na Groq)
+# O modelo do time (que coordena e escreve a resposta final) é escolhido por requisição (model_id)
+groq_model_70b = "llama-3.1-8b-instant"#"llama-3.1-70b-versatile" # ou um modelo 70B equivalente disponível
+groq_model_8b = "llama-3.1-8b-instant"    # ou um modelo 8B equivalente disponível
+
+
+# Clientes Groq compartilhados por todos os modelos e times (criados no primeiro uso)
+_sync_client: "GroqClient | None" = None
+_async_client: "AsyncGroqClient | None" = None
+_clients_lock = threading.Lock()
+
+
+def is_ai_configured() -> bool:
+    """
+    Indica se a API KEY da Groq está configurada (sem ela os agentes não são criados).
+    O stub de testes (AI_PROVIDER=stub) não precisa de chave.
+    """
+    return _uses_stub() or bool(settings.GROQ_API_KEY)
+
+
+def _uses_stub() -> bool:
+    """
+    Indica se os times de agentes são substituídos pelo stub sem rede (AI_PROVIDER=stub).
+    """
+    return settings.AI_PROVIDER == "stub"
+
+
+def _groq_clients() -> tuple["GroqClient", "AsyncGroqClient"]:
+    """
+    Devolve os clientes Groq (síncrono e assíncrono) do processo, criando-os na primeira chamada.
+
+    Sem eles o phi cria um cliente novo (e um novo pool HTTP) a cada chamada ao modelo,
+    pagando um handshake TLS por requisição.
+    """
+    # Clientes HTTP da API Groq (mantêm conexões keep-alive quando reutilizados)
+    from groq import Groq as GroqClient, AsyncGroq as AsyncGroqClient
+
+    global _sync_client, _async_client
+    with _clients_lock:
+        if _sync_client is None:
+            _sync_client = GroqClient(api_key=settings.GROQ_API_KEY)
+            _async_client = AsyncGroqClient(api_key=settings.GROQ_API_KEY)
+        return _sync_client, _async_client
+
+
+def _groq_model(model_id: str) -> "Groq":
+    """
+    Cria o modelo phi para um model_id, ligado aos clientes Groq compartilhados.
+    Cada agente precisa da sua própria instância (o phi guarda as ferramentas do agente no modelo).
+    """
+    from phi.model.groq import Groq
+
+    sync_client, async_client = _groq_clients()
+    return Groq(id=model_id, api_key=settings.GROQ_API_KEY, client=sync_client, async_client=async_client)
+
+
+def _build_agent_team(model_id: str) -> "Agent":
+    """
+    Monta o time de agentes (busca na web + financeiro) coordenado pelo modelo 'model_id'.
+    """
+    if _uses_stub():
+        from src.tools.llm_stub import StubAgentTeam
+        return StubAgentTeam(model_id, settings.AI_STUB_LATENCY_SECONDS, settings.AI_STUB_LATENCY_JITTER_SECONDS)
+
+    # Importa as classes necessárias do phi-agents e das ferramentas
+    from phi.agent import Agent
+    from phi.tools.yfinance import YFinanceTools
+    from phi.tools.duckduckgo import DuckDuckGo
+
+    # Inicializa o Agente de Busca na Web
+    dsa_agente_web_search = Agent(
+        name="DSA Agente Web Search",
+        role="Fazer busca na web",
+        model=_groq_model(groq_model_8b),
+        tools=[DuckDuckGo()],
+        instructions=["Sempre inclua as fontes"],
+        show_tool_calls=False,  # Desativa logs detalhados de tools nas respostas para API
+        markdown=False         # Desativa markdown na saída direta do agente individual
+    )
+
+    # Inicializa o Agente Financeiro
+    dsa_agente_financeiro = Agent(
+        name="DSA Agente Financeiro",
+        model=_groq_model(groq_model_70b),
+        tools=[
+            YFinanceTools(
+                stock_price=True,
+                analyst_recommendations=True,
+                stock_fundamentals=True,
+                company_news=True
+            )
+        ],
+        instructions=["Use tabelas para mostrar os dados"],
+        show_tool_calls=False,
+        markdown=False
+    )
+
+    # Inicializa o Time de Agentes (Multi-Agente)
+    return Agent(
+        team=[dsa_agente_web_search, dsa_agente_financeiro],
+        model=_groq_model(model_id), # O time usa o modelo escolhido na requisição
+        instructions=[
+            "Resuma a recomendação do analista e as últimas notícias.",
+            "Sempre inclua as fontes.",
+            "Use tabelas para mostrar os dados.",
+            "Se a recomendação ou notícias não forem encontradas, indique isso claramente."
+        ],
+        show_tool_calls=False, # Desativa para a resposta final do time
+        markdown=True          # Ativa markdown para a resposta final do time, útil para formatação do texto de análise
+    )
+
+
+def _reset_agent_team(team: "Agent") -> None:
+    """
+    Limpa o histórico das execuções anteriores, para que um time reutilizado não acumule mensagens.
+    """
+    if _uses_stub():
+        return
+    for agent in [team, *(team.team or [])]:
+        agent.memory.clear()
+        agent.run_id = None
+        agent.run_response = None
+
+
+class AgentTeamPool:
+    """
+    Times de agentes ociosos de um modelo. Um time do phi guarda o estado da execução corrente,
+    então cada execução simultânea usa um time próprio; ao terminar, ele volta para o pool.
+    """
+
+    def __init__(self, model_id: str, max_idle: int):
+        self.model_id = model_id
+        self.max_idle = max_idle
+        self._idle: list["Agent"] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> "Agent":
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _build_agent_team(self.model_id)
+
+    def release(self, team: "Agent") -> None:
+        _reset_agent_team(team)
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(team)
+
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+
+# Pools de times por model_id
+_pools: dict[str, AgentTeamPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_team_pool(model_id: str) -> AgentTeamPool:
+    """
+    Devolve o pool de times do modelo, criando-o no primeiro uso.
+    """
+    with _pools_lock:
+        pool = _pools.get(model_id)
+        if pool is None:
+            pool = _pools[model_id] = AgentTeamPool(model_id, settings.AI_AGENT_POOL_MAX_IDLE)
+        return pool
+
+
+@contextmanager
+def agent_team(model_id: str):
+    """
+    Empresta um time de agentes coordenado pelo modelo 'model_id' e o devolve ao pool ao final.
+
+    Uso:
+        with agent_team("llama-3.1-8b-instant") as team:
+            response = await team.arun(prompt)
+
+    Raises:
+        RuntimeError: Se a API KEY da Groq não estiver configurada.
+    """
+    if not is_ai_configured():
+        raise RuntimeError("GROQ_API_KEY não configurada. Agentes de IA indisponíveis.")
+
+    pool = get_team_pool(model_id)
+    team = pool.acquire()
+    try:
+        yield team
+    finally:
+        pool.release(team)
+
+
+async def complete(model_id: str, messages: list[dict], max_tokens: int, stream: bool = False):
+    """
+    Uma única chamada ao modelo 'model_id', sem agentes nem ferramentas (modo "context" da análise),
+    pelo cliente Groq assíncrono compartilhado.
+
+    Args:
+        model_id (str): O ID do modelo Groq.
+        messages (list[dict]): As mensagens no formato da API de chat ({"role", "content"}).
+        max_tokens (int): O limite de tokens da resposta.
+        stream (bool): Se True, devolve um iterador assíncrono dos pedaços de texto da resposta.
+
+    Returns:
+        str | AsyncIterator[str]: O texto da resposta (ou os seus pedaços, com 'stream').
+
+    Raises:
+        RuntimeError: Se a API KEY da Groq não estiver configurada.
+    """
+    if not is_ai_configured():
+        raise RuntimeError("GROQ_API_KEY não configurada. Agentes de IA indisponíveis.")
+
+    if _uses_stub():
+        from src.tools.llm_stub import StubChatModel
+        model = StubChatModel(model_id, settings.AI_STUB_LATENCY_SECONDS, settings.AI_STUB_LATENCY_JITTER_SECONDS)
+        return await model.complete(messages, stream)
+
+    # O SDK da Groq é importado na primeira chamada: roda fora do event loop
+    _, async_client = await asyncio.to_thread(_groq_clients)
+    response = await async_client.chat.completions.create(
+        model=model_id, messages=messages, max_tokens=max_tokens, temperature=0.2, stream=stream,
+    )
+    if not stream:
+        return response.choices[0].message.content or ""
+    return _completion_text(response)
+
+
+async def _completion_text(response):
+    """
+    Texto dos pedaços de uma resposta em streaming da API de chat.
+    """
+    async for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def warm_up_agents(model_ids: list[str]) -> None:
+    """
+    Pré-aquece os agentes na inicialização: cria os clientes Groq, abre a conexão HTTP
+    (keep-alive) com a API e deixa um time pronto no pool de cada modelo informado.
+    Falhas são apenas registradas; os agentes continuam sendo criados sob demanda.
+    """
+    if not is_ai_configured():
+        logger.warning("GROQ_API_KEY não configurada. Agentes de IA não serão inicializados.")
+        return
+
+    if _uses_stub():
+        for model_id in model_ids:
+            get_team_pool(model_id).release(_build_agent_team(model_id))
+        return
+
+    try:
+        _, async_client = await asyncio.to_thread(_groq_clients)
+        # Uma chamada leve (sem consumo de tokens) estabelece a conexão TLS reaproveitada depois
+        await async_client.models.list()
+    except Exception as e:
+        logger.error("Erro ao conectar à API Groq no pré-aquecimento: %s", e)
+
+    for model_id in model_ids:
+        try:
+            pool = get_team_pool(model_id)
+            if pool.idle_count() == 0:
+                # A montagem importa o phi e as ferramentas na primeira vez: roda fora do event loop
+                pool.release(await asyncio.to_thread(_build_agent_team, model_id))
+        except Exception as e:
+            logger.error("Erro ao inicializar Agentes de IA para o modelo %s: %s", model_id, e)
+
+    if model_ids:
+        logger.info("Agentes de IA inicializados para os modelos: %s", ', '.join(model_ids))
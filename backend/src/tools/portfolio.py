@@ -0,0 +1,202 @@
+# backend/src/tools/portfolio.py
+
+import numpy as np
+import pandas as pd
+
+# Primitivas vetorizadas (médias móveis via somas acumuladas)
+from src.tools import indicators
+# Barras por ano estimadas pelas datas (anualização)
+from src.tools.backtesting import periods_per_year
+
+
+def align_returns(bars_by_ticker: dict[str, pd.DataFrame], columns: list[str]) -> pd.DataFrame:
+    """
+    Retornos simples por barra das colunas pedidas, alinhados por data.
+
+    Só as datas presentes em todas as séries são mantidas (ex: ações e cripto juntas ficam só com
+    os pregões), e o retorno de cada barra é calculado sobre essas datas comuns.
+
+    Args:
+        bars_by_ticker (dict[str, pd.DataFrame]): Ticker -> barras OHLCV indexadas por data.
+        columns (list[str]): Os tickers, na ordem das colunas do resultado.
+
+    Returns:
+        pd.DataFrame: Retornos (datas x tickers), sem a primeira data comum.
+    """
+    closes = pd.concat({t: bars_by_ticker[t]['Close'] for t in columns}, axis=1, join="inner")
+    closes = closes[~closes.index.duplicated(keep="last")].sort_index()
+    return closes.pct_change().iloc[1:].dropna()
+
+
+def correlation_matrix(covariance: np.ndarray) -> np.ndarray:
+    """
+    Matriz de correlação a partir da covariância (no último par de eixos); variância zero dá NaN.
+    """
+    std = np.sqrt(np.diagonal(covariance, axis1=-2, axis2=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return covariance / (std[..., :, None] * std[..., None, :])
+
+
+def rolling_covariance(returns: np.ndarray, window: int, step: int = 1) -> np.ndarray:
+    """
+    Matrizes de covariância (ddof=1) das janelas móveis, calculadas de uma vez: cada janela é um
+    produto X^T X sobre a visão deslizante do array, sem laço em pares de ativos nem no tempo.
+
+    Args:
+        returns (np.ndarray): Retornos (barras x ativos).
+        window (int): Tamanho da janela, em barras.
+        step (int): Distância entre as janelas devolvidas (a última janela sempre termina na última barra).
+
+    Returns:
+        np.ndarray: Covariâncias (janelas x ativos x ativos), da mais antiga para a mais recente.
+    """
+    if len(returns) < window:
+        return np.empty((0, returns.shape[1], returns.shape[1]))
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window, axis=0)[::-1][::step][::-1]
+    centered = windows - windows.mean(axis=-1, keepdims=True)
+    return np.einsum("kiw,kjw->kij", centered, centered) / (window - 1)
+
+
+def rolling_pair_covariance(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """
+    Covariância móvel (ddof=1) entre duas séries, via médias móveis de x, y e x*y (NaN no aquecimento).
+    """
+    mean_xy = indicators.sma(x * y, window)
+    return (mean_xy - indicators.sma(x, window) * indicators.sma(y, window)) * window / (window - 1)
+
+
+class RollingCovariance:
+    """
+    Covariância de uma janela móvel de retornos, atualizada de forma incremental.
+
+    Mantém as últimas 'window' barras em um buffer circular, a soma dos retornos e a soma dos produtos
+    cruzados: cada barra nova custa O(ativos²), em vez de recalcular a janela inteira. As somas são
+    recalculadas a partir do buffer a cada volta completa, evitando acúmulo de erros de arredondamento.
+    """
+
+    def __init__(self, n_assets: int, window: int):
+        self.window = window
+        self.count = 0
+        self._buffer = np.zeros((window, n_assets))
+        self._position = 0
+        self._sum = np.zeros(n_assets)
+        self._cross = np.zeros((n_assets, n_assets))
+
+    def update(self, rows: np.ndarray) -> None:
+        """
+        Adiciona as barras (linhas x ativos), em ordem cronológica, descartando as que saem da janela.
+        """
+        # Mais barras do que a janela: as mais antigas sairiam dela de qualquer forma
+        for row in np.atleast_2d(rows)[-self.window:]:
+            if self.count >= self.window:
+                old = self._buffer[self._position]
+                self._sum -= old
+                self._cross -= np.outer(old, old)
+            self._buffer[self._position] = row
+            self._sum += row
+            self._cross += np.outer(row, row)
+            self.count = min(self.count + 1, self.window)
+            self._position = (self._position + 1) % self.window
+            if self._position == 0:
+                self._resync()
+
+    def rows(self) -> np.ndarray:
+        """
+        As barras da janela atual, em ordem cronológica.
+        """
+        if self.count < self.window:
+            return self._buffer[:self.count].copy()
+        return np.roll(self._buffer, -self._position, axis=0)
+
+    def replace_last(self, row: np.ndarray) -> None:
+        """
+        Substitui a barra mais recente (ex: a barra em formação, revista a cada consulta até o fechamento).
+        """
+        last = (self._position - 1) % self.window
+        old = self._buffer[last].copy()
+        self._buffer[last] = row
+        self._sum += row - old
+        self._cross += np.outer(row, row) - np.outer(old, old)
+
+    def _resync(self) -> None:
+        filled = self._buffer[:self.count]
+        self._sum = filled.sum(axis=0)
+        self._cross = filled.T @ filled
+
+    def covariance(self) -> np.ndarray:
+        """
+        Covariância amostral (ddof=1) da janela atual (NaN com menos de duas barras).
+        """
+        n = self.count
+        if n < 2:
+            return np.full(self._cross.shape, np.nan)
+        mean = self._sum / n
+        return (self._cross - n * np.outer(mean, mean)) / (n - 1)
+
+    def correlation(self) -> np.ndarray:
+        """
+        Correlação da janela atual.
+        """
+        return correlation_matrix(self.covariance())
+
+
+def risk_report(covariance: np.ndarray, weights: np.ndarray, periods: float,
+                benchmark_covariance: np.ndarray | None = None, benchmark_variance: float | None = None) -> dict:
+    """
+    Volatilidade da carteira, contribuição de cada ativo para o risco e betas contra o índice.
+
+    Args:
+        covariance (np.ndarray): Covariância dos retornos dos ativos (por barra).
+        weights (np.ndarray): Pesos dos ativos (mesma ordem da covariância).
+        periods (float): Barras por ano (anualização).
+        benchmark_covariance (np.ndarray | None): Covariância de cada ativo com o índice.
+        benchmark_variance (float | None): Variância do índice.
+
+    Returns:
+        dict: 'volatility' (anualizada), 'marginal_risk', 'risk_contribution' (soma = volatilidade),
+              'risk_contribution_pct' (soma = 1), 'betas' e 'beta' da carteira (None sem índice).
+    """
+    exposure = covariance @ weights
+    variance = float(weights @ exposure)
+    volatility = np.sqrt(max(variance, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        marginal = exposure / volatility if volatility > 0 else np.full(len(weights), np.nan)
+        contribution = weights * marginal
+        betas = (benchmark_covariance / benchmark_variance
+                 if benchmark_covariance is not None and benchmark_variance else None)
+
+    annualize = np.sqrt(periods)
+    return {
+        "volatility": volatility * annualize,
+        "marginal_risk": marginal * annualize,
+        "risk_contribution": contribution * annualize,
+        "risk_contribution_pct": contribution / volatility if volatility > 0 else contribution,
+        "betas": betas,
+        "beta": float(weights @ betas) if betas is not None else None,
+    }
+
+
+def rolling_report(returns: pd.DataFrame, tickers: list[str], weights: np.ndarray, window: int,
+                   benchmark: str | None = None) -> pd.DataFrame:
+    """
+    Séries móveis da carteira: volatilidade anualizada, beta e correlação com o índice.
+    Tudo é O(barras x ativos): o retorno da carteira é um produto matriz-vetor e as estatísticas
+    móveis são médias via somas acumuladas.
+
+    Returns:
+        pd.DataFrame: Date, Volatility e, com índice, Beta e BenchmarkCorrelation (a partir da primeira janela completa).
+    """
+    portfolio = returns[tickers].to_numpy() @ weights
+    periods = periods_per_year(returns.index)
+    variance = rolling_pair_covariance(portfolio, portfolio, window)
+    report = {"Date": returns.index, "Volatility": np.sqrt(np.maximum(variance, 0.0) * periods)}
+
+    if benchmark:
+        market = returns[benchmark].to_numpy()
+        covariance = rolling_pair_covariance(portfolio, market, window)
+        market_variance = rolling_pair_covariance(market, market, window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            report["Beta"] = np.where(market_variance > 0, covariance / market_variance, np.nan)
+            report["BenchmarkCorrelation"] = covariance / np.sqrt(variance * market_variance)
+
+    return pd.DataFrame(report).iloc[window - 1:].reset_index(drop=True)
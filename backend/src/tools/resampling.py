@@ -0,0 +1,136 @@
+# backend/src/tools/resampling.py
+
+import numpy as np
+import pandas as pd
+
+# Duração (em minutos) dos intervalos intradiários do yfinance
+INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+# Intervalos de calendário que podem ser derivados de barras mais finas ("5d" não tem equivalente fixo)
+CALENDAR_INTERVALS = ("1d", "1wk", "1mo", "3mo")
+
+
+def can_derive(base: str, target: str) -> bool:
+    """
+    Indica se as barras de 'target' podem ser montadas agregando barras de 'base'.
+    """
+    if base == target:
+        return False
+    if target in INTRADAY_MINUTES:
+        return base in INTRADAY_MINUTES and INTRADAY_MINUTES[target] % INTRADAY_MINUTES[base] == 0
+    if target not in CALENDAR_INTERVALS:
+        return False
+    if base in INTRADAY_MINUTES:
+        return True
+    # Semanas/meses/trimestres a partir de dias; trimestres também a partir de meses
+    return base == "1d" or (base == "1mo" and target == "3mo")
+
+
+def derivable_bases(target: str) -> list[str]:
+    """
+    Intervalos dos quais 'target' pode ser derivado, do mais grosso (menos barras a agregar) ao mais fino.
+    """
+    order = ["1mo", "1d", "90m", "60m", "1h", "30m", "15m", "5m", "2m", "1m"]
+    return [base for base in order if can_derive(base, target)]
+
+
+def session_anchor(index: pd.DatetimeIndex) -> pd.Timedelta:
+    """
+    Horário (no fuso das barras) em que as sessões começam: o horário mais comum da primeira barra de cada dia.
+    Ações abrem às 9:30 em Nova York; cripto (24/7, barras em UTC) começa à meia-noite.
+    """
+    wall = pd.Series(index.tz_localize(None))
+    first_of_day = wall.groupby(wall.dt.normalize()).min()
+    return (first_of_day - first_of_day.dt.normalize()).mode().iloc[0]
+
+
+def bucket_starts(index: pd.DatetimeIndex, target: str, anchor: pd.Timedelta | None = None) -> pd.DatetimeIndex:
+    """
+    Início do período de 'target' a que pertence cada barra.
+
+    Os cálculos são feitos no horário local da bolsa (o fuso do índice), de modo que dias, semanas
+    e meses seguem o calendário da bolsa e as mudanças de horário de verão não deslocam as sessões.
+    Barras intradiárias são agrupadas a partir da abertura da sessão ('anchor'), como faz o Yahoo
+    (ex: barras de 60m de ações começam às 9:30, 10:30, ...).
+    """
+    tz = index.tz
+    wall = index.tz_localize(None) if tz is not None else index
+    day = wall.normalize()
+
+    if target in INTRADAY_MINUTES:
+        anchor = session_anchor(index) if anchor is None else anchor
+        rule = pd.Timedelta(minutes=INTRADAY_MINUTES[target])
+        starts = day + anchor + ((wall - day - anchor) // rule) * rule
+    elif target == "1d":
+        starts = day
+    elif target == "1wk":
+        # Semanas começando na segunda-feira, como as barras semanais do Yahoo
+        starts = day - pd.to_timedelta(wall.weekday, unit="D")
+    elif target in ("1mo", "3mo"):
+        months = 1 if target == "1mo" else 3
+        first_month = ((wall.month - 1) // months) * months + 1
+        starts = pd.DatetimeIndex(pd.to_datetime({"year": wall.year, "month": first_month, "day": 1}))
+    else:
+        raise ValueError(f"Intervalo não suportado na reamostragem: {target}")
+
+    starts = pd.DatetimeIndex(starts)
+    if tz is not None:
+        starts = starts.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
+    return starts
+
+
+def aggregate_ohlcv(frame: pd.DataFrame, starts: np.ndarray) -> pd.DataFrame:
+    """
+    Agrega blocos consecutivos de barras (cada bloco começa em uma posição de 'starts'), de forma vetorizada:
+    Open da primeira barra, High máximo, Low mínimo, Close da última, Volume/Dividends somados e
+    Stock Splits não nulo. Outras colunas (ex: indicadores) ficam com o valor da última barra do bloco.
+
+    Returns:
+        pd.DataFrame: Uma linha por bloco, com índice numérico (o chamador define as datas).
+    """
+    ends = np.r_[starts[1:], len(frame)] - 1
+    columns = {}
+    for name in frame.columns:
+        values = frame[name].to_numpy()
+        if name == "Open":
+            columns[name] = values[starts]
+        elif name == "High":
+            columns[name] = np.fmax.reduceat(values.astype(float), starts)
+        elif name == "Low":
+            columns[name] = np.fmin.reduceat(values.astype(float), starts)
+        elif name in ("Volume", "Dividends"):
+            columns[name] = np.add.reduceat(np.nan_to_num(values.astype(float)), starts)
+        elif name == "Stock Splits":
+            columns[name] = np.fmax.reduceat(values.astype(float), starts)
+        else:
+            columns[name] = values[ends]
+
+    result = pd.DataFrame(columns)
+    if "Volume" in result.columns:
+        result["Volume"] = result["Volume"].astype(frame["Volume"].dtype)
+    return result
+
+
+def resample_bars(bars: pd.DataFrame, target: str) -> pd.DataFrame:
+    """
+    Deriva barras de um intervalo mais grosso a partir de barras mais finas (indexadas por data, com fuso).
+    Períodos sem nenhuma barra (fins de semana, feriados, fora do pregão) não geram linhas.
+
+    Args:
+        bars (pd.DataFrame): Barras OHLCV em ordem cronológica, indexadas por data no fuso da bolsa.
+        target (str): O intervalo desejado (ex: "5m", "1h", "1d", "1wk").
+
+    Returns:
+        pd.DataFrame: As barras de 'target', indexadas pelo início de cada período.
+    """
+    if bars.empty:
+        return bars
+
+    keys = bucket_starts(bars.index, target)
+    key_values = keys.asi8
+    starts = np.flatnonzero(np.r_[True, key_values[1:] != key_values[:-1]])
+
+    result = aggregate_ohlcv(bars, starts)
+    # Mesmo nome de índice que o yfinance usa para o intervalo ("Datetime" intradiário, "Date" diário ou maior)
+    result.index = pd.DatetimeIndex(keys[starts], name="Datetime" if target in INTRADAY_MINUTES else "Date")
+    # Horário de verão ambíguo (sem sessão nesse horário na prática) não gera barra
+    return result[result.index.notna()]
@@ -0,0 +1,213 @@
+# backend/src/tools/screener.py
+
+import ast
+
+import numpy as np
+import pandas as pd
+
+# Primitivas vetorizadas (operam em matrizes tickers x barras, no último eixo)
+from src.tools import indicators
+# Nomes das colunas de cada indicador
+from src.tools.indicator_specs import column_names
+# Gramática e validação das expressões
+from src.tools.screener_specs import FIELDS, parse_expression, resolve_name, indicator_specs, referenced_names
+
+
+def stack_bars(bars_by_ticker: dict[str, pd.DataFrame]) -> tuple[list[str], dict[str, np.ndarray]]:
+    """
+    Empilha as barras de vários tickers em uma matriz 2-D por campo (tickers x barras),
+    alinhadas à direita (a última coluna é a barra mais recente de cada ticker).
+
+    Returns:
+        tuple[list[str], dict[str, np.ndarray]]: (tickers, nas linhas da matriz), campo -> matriz.
+    """
+    tickers = list(bars_by_ticker)
+    matrices = {
+        field: indicators.pad_series([bars_by_ticker[t][field.capitalize()].to_numpy(dtype=float) for t in tickers])
+        for field in FIELDS
+    }
+    return tickers, matrices
+
+
+def _indicator_columns(spec: tuple[str, tuple], m: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Calcula um indicador para todas as linhas de uma vez, devolvendo coluna -> matriz.
+    """
+    name, params = spec
+    close = m["close"]
+    if name == "sma":
+        values = [indicators.sma(close, params[0])]
+    elif name == "ema":
+        values = [indicators.ema(close, params[0])]
+    elif name == "rsi":
+        values = [indicators.rsi(close, params[0])]
+    elif name == "atr":
+        values = [indicators.atr(m["high"], m["low"], close, params[0])]
+    elif name == "macd":
+        values = list(indicators.macd(close, *params))
+    elif name == "bbands":
+        values = list(indicators.bollinger(close, *params))
+    else:
+        raise ValueError(f"Indicador não suportado no screener: {name}")
+    return dict(zip(column_names(name, params), values))
+
+
+def _shift(values: np.ndarray, bars: int) -> np.ndarray:
+    """
+    Valor de 'bars' barras atrás (NaN quando não há histórico suficiente).
+    """
+    out = np.full(values.shape, np.nan)
+    if bars < values.shape[-1]:
+        out[..., bars:] = values[..., :-bars]
+    return out
+
+
+class _Evaluator:
+    """
+    Avalia a árvore validada de uma expressão sobre as matrizes (tickers x barras).
+    Cada nó produz uma matriz; comparações com NaN (histórico insuficiente) resultam em False.
+    """
+
+    def __init__(self, tree: ast.Expression, matrices: dict[str, np.ndarray]):
+        self.tree = tree
+        self.matrices = matrices
+        self.columns: dict[str, np.ndarray] = {}
+        for spec in indicator_specs(tree):
+            self.columns.update(_indicator_columns(spec, matrices))
+
+    def name(self, identifier: str) -> np.ndarray:
+        resolved = resolve_name(identifier)
+        return self.matrices[resolved[1]] if resolved[0] == "field" else self.columns[resolved[2]]
+
+    def evaluate(self, node: ast.AST) -> np.ndarray:
+        if isinstance(node, ast.Expression):
+            return self.evaluate(node.body)
+        if isinstance(node, ast.Constant):
+            return np.asarray(float(node.value))
+        if isinstance(node, ast.Name):
+            return self.name(node.id)
+
+        if isinstance(node, ast.BoolOp):
+            values = [self.evaluate(v).astype(bool) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = values[0]
+            for value in values[1:]:
+                result = combine(result, value)
+            return result
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.evaluate(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~operand.astype(bool)
+            return -operand if isinstance(node.op, ast.USub) else operand
+
+        if isinstance(node, ast.BinOp):
+            left, right = self.evaluate(node.left), self.evaluate(node.right)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if isinstance(node.op, ast.Add):
+                    return left + right
+                if isinstance(node.op, ast.Sub):
+                    return left - right
+                if isinstance(node.op, ast.Mult):
+                    return left * right
+                return np.where(right != 0, left / right, np.nan)
+
+        if isinstance(node, ast.Compare):
+            # Comparações encadeadas (a < b < c) equivalem a (a < b) and (b < c)
+            result, left = None, self.evaluate(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self.evaluate(comparator)
+                with np.errstate(invalid="ignore"):
+                    if isinstance(op, ast.Gt):
+                        value = left > right
+                    elif isinstance(op, ast.GtE):
+                        value = left >= right
+                    elif isinstance(op, ast.Lt):
+                        value = left < right
+                    elif isinstance(op, ast.LtE):
+                        value = left <= right
+                    elif isinstance(op, ast.Eq):
+                        value = left == right
+                    else:
+                        value = (left != right) & ~np.isnan(left) & ~np.isnan(right)
+                result = value if result is None else result & value
+                left = right
+            return result
+
+        if isinstance(node, ast.Call):
+            function = node.func.id.lower()
+            series = self.evaluate(node.args[0]).astype(float)
+            bars = node.args[1].value if len(node.args) == 2 else 1
+            if function == "avg":
+                return indicators.sma(series, bars)
+            if function == "max":
+                return indicators.rolling_max(series, bars)
+            if function == "min":
+                return indicators.rolling_min(series, bars)
+            if function == "prev":
+                return _shift(series, bars)
+            if function == "change":
+                previous = _shift(series, bars)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    return np.where(previous != 0, series / previous - 1.0, np.nan)
+            return np.abs(series)
+
+        raise ValueError(f"Construção não permitida na expressão: {type(node).__name__}")
+
+
+def _latest(values: np.ndarray, rows: int) -> np.ndarray:
+    """
+    Valor na barra mais recente de cada linha (uma constante vira um vetor com o mesmo valor).
+    """
+    values = np.asarray(values)
+    if values.ndim == 0:
+        return np.full(rows, values.item())
+    return values[:, -1]
+
+
+def screen(tickers: list[str], matrices: dict[str, np.ndarray], expression: str,
+           rank_by: str | None = None) -> list[dict]:
+    """
+    Avalia o filtro na barra mais recente de cada ticker (todas as linhas de uma vez).
+    Recebe e devolve apenas tipos simples, para rodar em outro processo (ver screener_service).
+
+    Args:
+        tickers (list[str]): Os tickers, na ordem das linhas das matrizes.
+        matrices (dict[str, np.ndarray]): Campo (open, high, low, close, volume) -> matriz tickers x barras.
+        expression (str): O filtro (ver screener_specs).
+        rank_by (str | None): Expressão numérica usada na ordenação (ex: "rsi_14", "change(close, 5)").
+
+    Returns:
+        list[dict]: Os tickers aprovados: 'ticker', 'close', 'rank_value' e 'values' (o valor atual de
+                    cada campo/indicador citado no filtro e na ordenação).
+    """
+    rows = len(tickers)
+    if rows == 0:
+        return []
+
+    tree = parse_expression(expression)
+    rank_tree = parse_expression(rank_by) if rank_by else None
+
+    evaluator = _Evaluator(tree, matrices)
+    passed = _latest(evaluator.evaluate(tree), rows).astype(bool)
+
+    rank_values = np.full(rows, np.nan)
+    names = referenced_names(tree)
+    if rank_tree is not None:
+        rank_evaluator = _Evaluator(rank_tree, matrices)
+        rank_values = _latest(rank_evaluator.evaluate(rank_tree), rows).astype(float)
+        evaluator.columns.update(rank_evaluator.columns)
+        names += [n for n in referenced_names(rank_tree) if n not in names]
+
+    latest = {name: _latest(evaluator.name(name), rows) for name in names}
+    close = matrices["close"][:, -1]
+
+    matches = []
+    for row in np.flatnonzero(passed):
+        matches.append({
+            "ticker": tickers[row],
+            "close": float(close[row]),
+            "rank_value": None if np.isnan(rank_values[row]) else float(rank_values[row]),
+            "values": {name: None if np.isnan(v[row]) else float(v[row]) for name, v in latest.items()},
+        })
+    return matches
@@ -0,0 +1,178 @@
+# backend/src/tools/screener_specs.py
+#
+# Interpretação e validação das expressões de filtro do screener. Usa apenas o módulo 'ast' da
+# biblioteca padrão (sem NumPy/pandas) e nunca executa código: a expressão é convertida em uma árvore
+# sintática e só os nós da gramática abaixo são aceitos. O cálculo fica em src/tools/screener.py.
+#
+# Gramática:
+#   - Campos das barras: open, high, low, close, volume.
+#   - Indicadores (mesmos nomes e parâmetros de /data): sma_20, ema_50, rsi_14, atr_14, macd_12_26_9,
+#     macd_signal, macd_hist, bb_upper_20_2, bb_middle, bb_lower (maiúsculas ou minúsculas).
+#   - Funções: avg(x, n) (média de n barras), max(x, n) / min(x, n) (máxima/mínima de n barras),
+#     prev(x, n=1) (valor de n barras atrás), change(x, n=1) (variação relativa em n barras), abs(x).
+#   - Operadores: + - * / (também "×"), comparações (>, >=, <, <=, ==, !=, encadeadas), and, or, not.
+#
+# Exemplos: "close > SMA_20 and volume > 2 × avg(volume, 20)", "RSI_14 < 30", "close >= max(high, 20)".
+
+import ast
+import re
+
+# Indicadores e nomes de colunas compartilhados com /data
+from src.tools.indicator_specs import parse_specs, column_names
+
+# Colunas das barras disponíveis nas expressões
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Função -> (mínimo, máximo) de argumentos; o segundo argumento, quando existe, é um número de barras
+FUNCTIONS = {
+    "avg": (2, 2),
+    "max": (2, 2),
+    "min": (2, 2),
+    "prev": (1, 2),
+    "change": (1, 2),
+    "abs": (1, 1),
+}
+
+# Indicadores calculados pelo screener (vwap e obv dependem de sessões/volume acumulado por série)
+SCREENER_INDICATORS = ("sma", "ema", "rsi", "atr", "macd", "bbands")
+
+# Prefixos das séries secundárias dos indicadores com várias colunas -> (indicador, posição da coluna)
+_MULTI_COLUMN_PREFIXES = {
+    "macd_signal": ("macd", 1),
+    "macd_hist": ("macd", 2),
+    "bb_upper": ("bbands", 0),
+    "bb_middle": ("bbands", 1),
+    "bb_lower": ("bbands", 2),
+}
+
+# Limites que protegem a API de expressões absurdas
+MAX_EXPRESSION_LENGTH = 500
+MAX_NODES = 200
+MAX_LOOKBACK = 500
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Gt, ast.GtE, ast.Lt, ast.LtE,
+    ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant, ast.Call,
+)
+
+
+def resolve_name(name: str) -> tuple:
+    """
+    Identifica um nome usado na expressão.
+
+    Returns:
+        tuple: ("field", campo) para colunas das barras, ou ("indicator", spec, coluna) para indicadores
+               (ex: "SMA_20" -> ("indicator", ("sma", (20,)), "SMA_20")).
+
+    Raises:
+        ValueError: Se o nome não for um campo nem um indicador suportado.
+    """
+    lowered = name.lower()
+    if lowered in FIELDS:
+        return ("field", lowered)
+
+    position = 0
+    for prefix, (indicator, column_position) in _MULTI_COLUMN_PREFIXES.items():
+        if lowered == prefix or lowered.startswith(prefix + "_"):
+            lowered, position = indicator + lowered[len(prefix):], column_position
+            break
+
+    try:
+        specs = parse_specs(lowered)
+    except ValueError:
+        raise ValueError(f"Nome desconhecido na expressão: {name}")
+    if len(specs) != 1 or specs[0][0] not in SCREENER_INDICATORS:
+        raise ValueError(f"Nome desconhecido na expressão: {name}")
+    return ("indicator", specs[0], column_names(*specs[0])[position])
+
+
+def _window(node: ast.AST) -> int:
+    """
+    Valida o argumento "número de barras" de uma função (inteiro entre 1 e MAX_LOOKBACK).
+    """
+    if (not isinstance(node, ast.Constant) or isinstance(node.value, bool)
+            or not isinstance(node.value, int) or not 1 <= node.value <= MAX_LOOKBACK):
+        raise ValueError(f"O número de barras deve ser um inteiro entre 1 e {MAX_LOOKBACK}")
+    return node.value
+
+
+def parse_expression(expression: str) -> ast.Expression:
+    """
+    Converte a expressão em uma árvore sintática validada (nada é executado).
+
+    Args:
+        expression (str): A expressão (ver a gramática no topo do módulo).
+
+    Returns:
+        ast.Expression: A árvore, contendo apenas nós, nomes e funções permitidos.
+
+    Raises:
+        ValueError: Se a expressão for longa demais, tiver erro de sintaxe ou usar algo fora da gramática.
+    """
+    if not expression or len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"A expressão deve ter entre 1 e {MAX_EXPRESSION_LENGTH} caracteres")
+
+    # "2× avg(volume, 20)" -> "2* avg(volume, 20)"
+    source = re.sub(r"\s+", " ", expression.replace("×", "*")).strip()
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Erro de sintaxe na expressão: {expression}")
+
+    nodes = list(ast.walk(tree))
+    if len(nodes) > MAX_NODES:
+        raise ValueError("Expressão complexa demais")
+
+    for node in nodes:
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Construção não permitida na expressão: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (isinstance(node.value, bool)
+                                               or not isinstance(node.value, (int, float))):
+            raise ValueError(f"Constante não permitida na expressão: {node.value!r}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id.lower() not in FUNCTIONS:
+                raise ValueError(f"Função desconhecida na expressão: {ast.unparse(node.func)}")
+            minimum, maximum = FUNCTIONS[node.func.id.lower()]
+            if node.keywords or not minimum <= len(node.args) <= maximum:
+                raise ValueError(f"Argumentos inválidos em {node.func.id}(): use {node.func.id}(x"
+                                 + (", n)" if maximum == 2 else ")"))
+            if len(node.args) == 2:
+                _window(node.args[1])
+        elif isinstance(node, ast.Name) and not _is_function_name(tree, node):
+            resolve_name(node.id)
+    return tree
+
+
+def _is_function_name(tree: ast.AST, name: ast.Name) -> bool:
+    """
+    Indica se o nome é o de uma função chamada (ex: "avg" em "avg(volume, 20)").
+    """
+    return any(isinstance(n, ast.Call) and n.func is name for n in ast.walk(tree))
+
+
+def indicator_specs(tree: ast.Expression) -> list[tuple[str, tuple]]:
+    """
+    Indicadores usados na expressão (cada um calculado uma única vez).
+    """
+    specs = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not _is_function_name(tree, node):
+            resolved = resolve_name(node.id)
+            if resolved[0] == "indicator" and resolved[1] not in specs:
+                specs.append(resolved[1])
+    return specs
+
+
+def referenced_names(tree: ast.Expression) -> list[str]:
+    """
+    Campos e indicadores citados na expressão, normalizados (ex: ["close", "SMA_20"]), na ordem em que aparecem.
+    """
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not _is_function_name(tree, node):
+            resolved = resolve_name(node.id)
+            name = resolved[1] if resolved[0] == "field" else resolved[2]
+            if name not in names:
+                names.append(name)
+    return names
@@ -0,0 +1,114 @@
+# backend/src/tools/strategy_specs.py
+#
+# Estratégias de backtesting e validação dos seus parâmetros. Não depende de NumPy/pandas, para que
+# as rotas possam validar os pedidos sem carregar o motor de backtesting (src/tools/backtesting.py).
+
+import itertools
+
+# Nome -> parâmetros (na ordem) e valores padrão
+# - sma_cross / ema_cross: comprado enquanto a média rápida estiver acima da lenta.
+# - rsi: compra quando o RSI fica abaixo de 'lower' e vende quando passa de 'upper'.
+# - breakout: compra quando o fechamento rompe a máxima das 'window' barras anteriores e vende
+#   quando perde a mínima das 'exit_window' barras anteriores (canal de Donchian).
+STRATEGIES = {
+    "sma_cross": {"fast": 20, "slow": 50},
+    "ema_cross": {"fast": 12, "slow": 26},
+    "rsi": {"window": 14, "lower": 30.0, "upper": 70.0},
+    "breakout": {"window": 20, "exit_window": 10},
+}
+
+# Maior janela aceita (a mesma dos indicadores)
+MAX_WINDOW = 500
+
+
+def _validate(strategy: str, params: dict) -> bool:
+    """
+    Indica se a combinação de parâmetros faz sentido (ex: média rápida menor que a lenta).
+    """
+    if strategy in ("sma_cross", "ema_cross"):
+        return params["fast"] < params["slow"]
+    if strategy == "rsi":
+        return 0 < params["lower"] < params["upper"] < 100
+    return True
+
+
+def _coerce(strategy: str, params: dict | None) -> dict:
+    """
+    Completa os parâmetros com os padrões e converte cada valor para o tipo do padrão.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia desconhecida: {strategy}")
+
+    defaults = STRATEGIES[strategy]
+    unknown = set(params or {}) - set(defaults)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos para {strategy}: {', '.join(sorted(unknown))}")
+
+    parsed = {}
+    for name, default in defaults.items():
+        value = (params or {}).get(name, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Parâmetro inválido para {strategy}: {name}={value!r}")
+        if isinstance(default, int):
+            if value != int(value) or not 1 <= value <= MAX_WINDOW:
+                raise ValueError(f"Janela fora do intervalo 1..{MAX_WINDOW}: {name}={value}")
+            value = int(value)
+        parsed[name] = type(default)(value)
+    return parsed
+
+
+def parse_params(strategy: str, params: dict | None = None) -> dict:
+    """
+    Completa os parâmetros de uma estratégia com os padrões e valida os tipos e limites.
+
+    Args:
+        strategy (str): O nome da estratégia (uma das chaves de STRATEGIES).
+        params (dict | None): Parâmetros informados pelo cliente (os omitidos usam os padrões).
+
+    Returns:
+        dict: Todos os parâmetros da estratégia, na ordem de STRATEGIES.
+
+    Raises:
+        ValueError: Se a estratégia, algum parâmetro ou a combinação deles for inválida.
+    """
+    parsed = _coerce(strategy, params)
+    if not _validate(strategy, parsed):
+        raise ValueError(f"Combinação de parâmetros inválida para {strategy}: {parsed}")
+    return parsed
+
+
+def expand_grid(strategy: str, grid: dict[str, list] | None, max_combinations: int) -> list[dict]:
+    """
+    Gera todas as combinações de uma grade de parâmetros (produto cartesiano), descartando as inválidas
+    (ex: fast >= slow). Parâmetros fora da grade usam os padrões.
+
+    Args:
+        strategy (str): O nome da estratégia.
+        grid (dict[str, list] | None): Parâmetro -> lista de valores a testar.
+        max_combinations (int): Limite de combinações válidas.
+
+    Returns:
+        list[dict]: As combinações válidas.
+
+    Raises:
+        ValueError: Se a estratégia ou algum valor for inválido, se nenhuma combinação for válida
+                    ou se o número de combinações passar do limite.
+    """
+    grid = grid or {}
+    names = list(grid)
+    for name in names:
+        if not isinstance(grid[name], list) or not grid[name]:
+            raise ValueError(f"A grade de '{name}' deve ser uma lista não vazia")
+
+    combinations = []
+    for values in itertools.product(*(dict.fromkeys(grid[n]) for n in names)):
+        params = _coerce(strategy, dict(zip(names, values)))
+        # Combinações inválidas (ex: fast >= slow) são descartadas; valores inválidos geram erro
+        if _validate(strategy, params):
+            combinations.append(params)
+        if len(combinations) > max_combinations:
+            raise ValueError(f"A grade passa do limite de {max_combinations} combinações")
+
+    if not combinations:
+        raise ValueError("Nenhuma combinação válida de parâmetros na grade")
+    return combinations
@@ -1,68 +1,537 @@
 # backend/src/tools/yfinance_tool.py
 
-import yfinance as yf
+import logging
+from functools import partial
+
 import pandas as pd # Necessário para operações com DataFrame
 
-def get_historical_data(ticker: str, period: str = "6mo") -> list | None:
+# Fonte dos dados de mercado (Yahoo ou fixtures gravadas)
+from src.tools.market_data_providers import get_provider
+# Cache local (Arrow IPC, mapeado em memória) das barras OHLCV
+from src.tools import ohlcv_cache
+# Médias móveis vetorizadas (várias séries de uma vez)
+from src.tools import indicators
+# Redução de pontos para gráficos (LTTB / agregação OHLC)
+from src.tools import downsampling
+# Derivação de intervalos mais grossos a partir de barras mais finas
+from src.tools import resampling
+# Conversão de DataFrames para os formatos de resposta
+from src.utils import serialization
+# Métricas de duração das etapas e de acerto dos caches
+from src.utils import metrics
+# Cache e travas compartilhados entre os workers do host
+from src.utils import shared_cache
+# Prazos, novas tentativas, hedge e disjuntor das chamadas à fonte de dados
+from src.utils import resilience
+# Importa as configurações (habilitação do cache)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _download_history(ticker: str, interval: str, period: str | None = None,
+                      start: pd.Timestamp | None = None) -> pd.DataFrame:
     """
-    Extrai dados históricos de uma ação usando yfinance e calcula médias móveis.
+    Baixa barras da fonte de dados, seja por período (ex: "6mo") ou a partir de um instante inicial.
+
+    Raises:
+        resilience.UpstreamError: Se a fonte falhar, não responder no prazo ou estiver com o circuito aberto.
+    """
+    with metrics.stage("upstream_fetch"):
+        return resilience.market_data().call(
+            partial(get_provider().history, ticker, interval, period=period, start=start)
+        )
+
+
+def _range_start(period: str, start=None, interval: str = "1d", warmup_bars: int = 0) -> pd.Timestamp | None:
+    """
+    Instante inicial (UTC) a buscar: o início explícito do intervalo pedido, recuado o bastante para
+    'warmup_bars' barras de aquecimento dos indicadores, ou o início do período.
+    """
+    if start is None:
+        return ohlcv_cache.period_start(period)
+    start = pd.Timestamp(start)
+    if start.tzinfo is None:
+        # Sem fuso, a data é a da bolsa (que pode estar à frente do UTC): um dia de margem cobre qualquer fuso
+        start = start.tz_localize("UTC") - pd.Timedelta(days=1)
+    return start.tz_convert("UTC") - ohlcv_cache.history_span(interval, warmup_bars)
+
+
+def _load_bars(ticker: str, period: str, interval: str,
+               refresh: bool = False, start=None, warmup_bars: int = 0) -> tuple[pd.DataFrame, dict | None]:
+    """
+    Obtém as barras do ticker servindo do cache em disco sempre que possível.
+    Com 'start' informado, o histórico precisa começar nele, mais 'warmup_bars' barras antes
+    (o período é ignorado).
+
+    - Cache atual (dentro do TTL do intervalo) e cobrindo o período: nenhuma chamada ao Yahoo
+      (a menos que 'refresh' seja True, caso em que é feita a busca incremental abaixo).
+    - Barras mais finas do mesmo ticker em cache cobrindo o período (ex: 1m para um pedido de 5m/1h/1d):
+      o intervalo é derivado delas por reamostragem (ver _derive_bars), sem baixar o intervalo pedido.
+    - Cache expirado mas cobrindo o período: baixa apenas as barras a partir da última data gravada.
+    - Sem cache, ou cache com histórico mais curto que o pedido: baixa o período completo.
+
+    As atualizações de um ticker+intervalo são feitas sob uma trava entre processos: com vários workers,
+    só um consulta o Yahoo e os demais esperam e leem as barras que ele gravou.
+
+    Se o Yahoo falhar (ou o circuito estiver aberto) e houver barras em cache, elas são servidas mesmo
+    expiradas (ver _update_or_stale).
+
+    Returns:
+        tuple[pd.DataFrame, dict | None]: Todas as barras em cache (que cobrem ao menos o período pedido;
+                                          recorte com ohlcv_cache.slice_period) e os metadados do cache
+                                          (None com o cache desabilitado).
+    """
+    explicit_start = start is not None
+    start = _range_start(period, start, interval, warmup_bars)
+    # Download completo: a partir do início explícito ou pelo período
+    full_kwargs = {"start": start} if explicit_start else {"period": period}
+    if not settings.OHLCV_CACHE_ENABLED:
+        return _download_history(ticker, interval, **full_kwargs), None
+
+    cached = ohlcv_cache.read(ticker, interval)
+    if not refresh and _fresh_bars(cached, interval, start):
+        metrics.cache_result("ohlcv", "hit")
+        return cached
+
+    if not settings.SHARED_CACHE_ENABLED:
+        return _update_or_stale(ticker, interval, start, cached, refresh, full_kwargs)
+
+    with shared_cache.file_lock(f"ohlcv:{ticker.upper()}:{interval}"):
+        # Outro worker pode ter atualizado as barras enquanto esperávamos a trava
+        cached = ohlcv_cache.read(ticker, interval)
+        if not refresh and _fresh_bars(cached, interval, start):
+            metrics.cache_result("ohlcv", "hit")
+            return cached
+        return _update_or_stale(ticker, interval, start, cached, refresh, full_kwargs)
+
+
+def _fresh_bars(cached: tuple[pd.DataFrame, dict] | None, interval: str, start: pd.Timestamp | None) -> bool:
+    """
+    Indica se as barras em cache cobrem o período e ainda estão dentro do TTL do intervalo.
+    """
+    return cached is not None and ohlcv_cache.covers(cached[1], start) and ohlcv_cache.is_fresh(cached[1], interval)
+
+
+def _update_or_stale(ticker: str, interval: str, start: pd.Timestamp | None,
+                     cached: tuple[pd.DataFrame, dict] | None, refresh: bool,
+                     full_kwargs: dict) -> tuple[pd.DataFrame, dict | None]:
+    """
+    _update_bars com reserva: se a fonte de dados falhar, serve as barras em cache como estão
+    (expiradas ou cobrindo menos que o período pedido) em vez de um erro.
+    """
+    try:
+        return _update_bars(ticker, interval, start, cached, refresh, full_kwargs)
+    except resilience.UpstreamError as e:
+        if cached is None:
+            raise
+        logger.warning("Servindo barras antigas do cache para %s (%s): %s", ticker, interval, e)
+        metrics.cache_result("ohlcv", "stale")
+        return cached
+
+
+def _update_bars(ticker: str, interval: str, start: pd.Timestamp | None, cached: tuple[pd.DataFrame, dict] | None,
+                 refresh: bool, full_kwargs: dict) -> tuple[pd.DataFrame, dict | None]:
+    """
+    Atualiza as barras que não podem ser servidas do cache como estão (ver _load_bars): derivando de
+    um intervalo mais fino, com uma busca incremental ou com o download completo.
+    """
+    if settings.OHLCV_RESAMPLE_ENABLED:
+        derived = _derive_bars(ticker, interval, start, refresh)
+        if derived is not None:
+            metrics.cache_result("ohlcv", "derived")
+            return derived
+
+    if cached is not None and ohlcv_cache.covers(cached[1], start):
+        metrics.cache_result("ohlcv", "refresh")
+        return _refresh_bars(ticker, interval, *cached)
+
+    metrics.cache_result("ohlcv", "miss")
+
+    bars = _download_history(ticker, interval, **full_kwargs)
+    if bars.empty:
+        return bars, None
+    if cached is not None:
+        # Preserva barras mais recentes que já estavam em cache
+        bars = ohlcv_cache.merge(cached[0], bars)
+    covered_from = ohlcv_cache.COVERS_MAX if start is None else start.isoformat()
+
+    meta = ohlcv_cache.write(ticker, interval, bars, covered_from)
+    return bars, meta
+
+
+def _refresh_bars(ticker: str, interval: str, bars: pd.DataFrame, meta: dict) -> tuple[pd.DataFrame, dict | None]:
+    """
+    Busca incremental: baixa apenas as barras a partir da última gravada (ela é baixada de novo,
+    pois pode ter sido gravada em formação) e atualiza o cache.
+    """
+    new_bars = _download_history(ticker, interval, start=bars.index[-1])
+    bars = ohlcv_cache.merge(bars, new_bars)
+    return bars, ohlcv_cache.write(ticker, interval, bars, meta.get("covered_from"))
+
+
+def _derive_bars(ticker: str, interval: str, start: pd.Timestamp | None,
+                 refresh: bool = False) -> tuple[pd.DataFrame, dict | None] | None:
+    """
+    Monta as barras de 'interval' agregando barras mais finas do mesmo ticker que já estejam em cache
+    e cubram o período (ex: 5m, 1h e 1d a partir das barras de 1m), sem baixar o intervalo do Yahoo.
+    Se as barras de origem estiverem expiradas (ou 'refresh' for True), só elas são atualizadas:
+    uma busca incremental que serve a todos os intervalos derivados delas.
+
+    As barras derivadas ficam em cache como as demais, marcadas com a origem e a versão das barras
+    de origem; enquanto a origem não muda, elas são reaproveitadas sem reagregar.
+
+    Uma origem só é usada se o seu histórico começar antes (ou no) início do que já está em cache para
+    'interval': barras derivadas nunca substituem um histórico mais longo (ex: 1mo de 5m baixado do
+    Yahoo não é trocado por 5d derivados de 1m), que segue pela busca incremental de _update_bars.
+
+    Returns:
+        tuple[pd.DataFrame, dict | None] | None: (barras, metadados), ou None se nenhum intervalo
+                                                 mais fino em cache cobrir o período.
+    """
+    cached = ohlcv_cache.read(ticker, interval)
+    for base in resampling.derivable_bases(interval):
+        cached_base = ohlcv_cache.read(ticker, base)
+        # Só barras baixadas do Yahoo servem de origem: atualizar uma derivada exigiria baixá-la
+        if (cached_base is None or "derived_from" in cached_base[1]
+                or not ohlcv_cache.covers(cached_base[1], start)
+                or (cached is not None and not ohlcv_cache.covers_cache(cached_base[1], cached[1]))):
+            continue
+
+        base_bars, base_meta = cached_base
+        if refresh or not ohlcv_cache.is_fresh(base_meta, base):
+            base_bars, base_meta = _refresh_bars(ticker, base, base_bars, base_meta)
+            if base_meta is None:
+                continue
+
+        version = ohlcv_cache.bars_version(base_meta)
+        if (cached is not None and cached[1].get("derived_from") == base
+                and cached[1].get("base_version") == version):
+            return cached
+
+        with metrics.stage("resample"):
+            bars = resampling.resample_bars(base_bars, interval)
+        meta = ohlcv_cache.write(ticker, interval, bars, base_meta.get("covered_from"),
+                                 extra={"derived_from": base, "base_version": version})
+        return bars, meta
+    return None
+
+
+def _compute_indicators(ticker: str, interval: str, bars: pd.DataFrame, meta: dict | None,
+                        specs: list[tuple[str, tuple]]) -> pd.DataFrame:
+    """
+    Calcula os indicadores pedidos sobre todas as barras em cache, reaproveitando as colunas
+    já calculadas e gravadas ao lado das barras para a mesma versão delas.
+    Sem indicadores pedidos, devolve um DataFrame sem colunas (com o índice das barras).
+    """
+    if not specs:
+        return pd.DataFrame(index=bars.index)
+
+    intraday = interval.endswith(('m', 'h'))
+    version = ohlcv_cache.bars_version(meta)
+    if version is None:
+        with metrics.stage("indicators"):
+            return indicators.compute(bars, specs, intraday)
+
+    cached = ohlcv_cache.read_indicators(ticker, interval, version)
+    if cached is not None and len(cached) != len(bars):
+        cached = None
+
+    # Calcula apenas os indicadores que ainda não estão no cache
+    missing = [s for s in specs
+               if cached is None or not set(indicators.column_names(*s)).issubset(cached.columns)]
+    if not missing:
+        metrics.cache_result("indicators", "hit")
+        return cached
+
+    metrics.cache_result("indicators", "miss")
+    with metrics.stage("indicators"):
+        computed = indicators.compute(bars, missing, intraday)
+    values = computed if cached is None else cached.join(computed)
+    ohlcv_cache.write_indicators(ticker, interval, version, values)
+    return values
+
+
+def _download_batch(tickers: list[str], interval: str, period: str | None = None,
+                    start: pd.Timestamp | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Baixa barras de vários tickers em uma única chamada à fonte de dados (yf.download no Yahoo),
+    separadas por ticker. Sem hedge (duplicar um lote grande custa caro) e com o prazo total como
+    prazo da tentativa.
+
+    Raises:
+        resilience.UpstreamError: Se a fonte falhar, não responder no prazo ou estiver com o circuito aberto.
+    """
+    if not tickers:
+        return {}
+    with metrics.stage("upstream_fetch"):
+        return resilience.market_data().call(
+            partial(get_provider().download, tickers, interval, period=period, start=start),
+            hedge=False, attempt_timeout=settings.MARKET_DATA_DEADLINE_SECONDS,
+        )
+
+
+def _load_bars_batch(tickers: list[str], period: str, interval: str) -> dict[str, pd.DataFrame]:
+    """
+    Versão em lote de _load_bars: serve do cache o que estiver atual e agrupa
+    o restante em no máximo duas chamadas ao Yahoo (uma incremental e uma completa).
+    Se uma delas falhar, os tickers dela são servidos com as barras em cache (se houver).
+    """
+    if not settings.OHLCV_CACHE_ENABLED:
+        return _download_batch(tickers, interval, period=period)
+
+    start = ohlcv_cache.period_start(period)
+    bars_by_ticker: dict[str, pd.DataFrame] = {}
+    cached_by_ticker: dict[str, tuple[pd.DataFrame, dict]] = {}
+    stale, missing = [], []
+
+    for ticker in tickers:
+        cached = ohlcv_cache.read(ticker, interval)
+        if cached is not None and ohlcv_cache.covers(cached[1], start):
+            cached_by_ticker[ticker] = cached
+            if ohlcv_cache.is_fresh(cached[1], interval):
+                bars_by_ticker[ticker] = cached[0]
+            else:
+                stale.append(ticker)
+        else:
+            if cached is not None:
+                cached_by_ticker[ticker] = cached
+            missing.append(ticker)
+
+    if tickers:
+        metrics.CACHE_REQUESTS.inc(len(bars_by_ticker), cache="ohlcv", result="hit")
+        metrics.CACHE_REQUESTS.inc(len(stale), cache="ohlcv", result="refresh")
+        metrics.CACHE_REQUESTS.inc(len(missing), cache="ohlcv", result="miss")
+
+    # Busca incremental única a partir da barra mais antiga entre as "últimas barras" dos tickers expirados
+    if stale:
+        since = min(cached_by_ticker[t][0].index[-1] for t in stale)
+        try:
+            new_frames = _download_batch(stale, interval, start=since)
+        except resilience.UpstreamError as e:
+            logger.warning("Servindo barras antigas do cache para %s (%s): %s", stale, interval, e)
+            metrics.CACHE_REQUESTS.inc(len(stale), cache="ohlcv", result="stale")
+            bars_by_ticker.update((t, cached_by_ticker[t][0]) for t in stale)
+            stale = []
+        for ticker in stale:
+            bars, meta = cached_by_ticker[ticker]
+            bars = ohlcv_cache.merge(bars, new_frames.get(ticker))
+            ohlcv_cache.write(ticker, interval, bars, meta.get("covered_from"))
+            bars_by_ticker[ticker] = bars
+
+    # Download completo único para os tickers sem cache (ou com histórico mais curto que o pedido)
+    if missing:
+        covered_from = ohlcv_cache.COVERS_MAX if start is None else start.isoformat()
+        try:
+            new_frames = _download_batch(missing, interval, period=period)
+        except resilience.UpstreamError as e:
+            fallback = [t for t in missing if t in cached_by_ticker]
+            if not fallback and not bars_by_ticker:
+                raise
+            logger.warning("Fonte de dados indisponível para %s (%s); barras antigas do cache servidas para %s: %s",
+                           missing, interval, fallback, e)
+            metrics.CACHE_REQUESTS.inc(len(fallback), cache="ohlcv", result="stale")
+            new_frames = {}
+            bars_by_ticker.update((t, cached_by_ticker[t][0]) for t in fallback)
+        for ticker, bars in new_frames.items():
+            if ticker in cached_by_ticker:
+                bars = ohlcv_cache.merge(cached_by_ticker[ticker][0], bars)
+            ohlcv_cache.write(ticker, interval, bars, covered_from)
+            bars_by_ticker[ticker] = bars
+
+    return {t: ohlcv_cache.slice_period(b, period) for t, b in bars_by_ticker.items()}
+
+
+def _finalize_frame(hist: pd.DataFrame, indicator_columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Prepara as barras (indexadas por data, já com indicadores) para resposta:
+    data como coluna 'Date' e sem as linhas iniciais em que os indicadores ainda não têm valor.
+    """
+    # Reseta o índice do DataFrame para transformar a coluna de data em uma coluna normal
+    hist = hist.reset_index()
+
+    # Renomeia a coluna 'Datetime' ou 'Date' para 'Date' consistente, se necessário
+    # (yfinance retorna 'Date' a partir de certas versões/períodos, mas checamos)
+    if 'Datetime' in hist.columns:
+         hist.rename(columns={'Datetime': 'Date'}, inplace=True)
+
+    # Remove linhas com valores NaN que resultam dos cálculos de média móvel iniciais
+    # (Os primeiros 19 dias não terão SMA/EMA 20)
+    hist.dropna(subset=['SMA_20', 'EMA_20'] if indicator_columns is None else indicator_columns, inplace=True)
+    return hist
+
+
+def get_historical_frame(ticker: str, period: str = "6mo", interval: str = "1d",
+                         indicator_specs: list[tuple[str, tuple]] | None = None,
+                         refresh: bool = False, start=None, end=None,
+                         points: int | None = None, downsample: str = "lttb") -> pd.DataFrame | None:
+    """
+    Extrai dados históricos de uma ação usando yfinance e calcula indicadores técnicos, devolvendo um DataFrame.
+    As barras são servidas do cache local em disco (ver ohlcv_cache) e apenas as barras
+    mais novas que a última data gravada são buscadas no Yahoo.
+
+    Os indicadores são calculados sobre todo o histórico em cache (não só o período pedido),
+    o que reduz as linhas perdidas no aquecimento das janelas, e ficam gravados ao lado das barras.
 
     Args:
         ticker (str): O símbolo do ticker da ação (ex: "MSFT").
         period (str): O período dos dados históricos (ex: "1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max").
                       O padrão é "6mo".
+        interval (str): O intervalo das barras (ex: "1m", "5m", "1h", "1d", "1wk"). O padrão é "1d".
+        indicator_specs (list[tuple[str, tuple]] | None): Indicadores a calcular (ver indicators.parse_specs).
+                                                          O padrão é SMA_20 e EMA_20.
+        refresh (bool): Busca as barras novas no Yahoo mesmo com o cache dentro do TTL
+                        (usado pelo streaming ao vivo, que tem o próprio ritmo de consulta).
+        start, end (datetime | str | None): Intervalo de datas pedido (inclusive). Com 'start' o período
+                        é ignorado; sem ele, o início vem do período. Datas sem fuso são lidas no fuso da bolsa.
+        points (int | None): Número máximo de barras na resposta (ver downsampling.downsample).
+                        None devolve todas as barras.
+        downsample (str): Método de redução: "lttb" (gráfico de linha) ou "ohlc" (candles).
 
     Returns:
-        list | None: Uma lista de dicionários contendo os dados históricos
-                     (Date, Open, High, Low, Close, Volume, SMA_20, EMA_20)
-                     ou None se nenhum dado for encontrado ou ocorrer um erro.
+        pd.DataFrame | None: As colunas Date (datetime), Open, High, Low, Close, Volume e uma coluna por
+                             série de indicador, ou None se nenhum dado for encontrado ou ocorrer um erro.
     """
-    try:
-        stock = yf.Ticker(ticker)
+    if indicator_specs is None:
+        indicator_specs = indicators.parse_specs(indicators.DEFAULT_INDICATORS)
 
-        # Obtém o histórico de preços da ação para o período definido
-        hist = stock.history(period=period)
+    try:
+        # Obtém o histórico de preços da ação (cache + yfinance)
+        bars, meta = _load_bars(ticker, period, interval, refresh, start,
+                                indicators.warmup_bars(indicator_specs))
 
-        if hist.empty:
+        if bars.empty:
             # Retorna None se não houver dados para o ticker/período
             return None
 
-        # Reseta o índice do DataFrame para transformar a coluna de data em uma coluna normal
-        hist.reset_index(inplace=True)
+        # Indicadores calculados (ou lidos do cache) sobre todas as barras disponíveis
+        indicator_columns = [c for spec in indicator_specs for c in indicators.column_names(*spec)]
+        values = _compute_indicators(ticker, interval, bars, meta, indicator_specs)
+        hist = bars.join(values[indicator_columns])
 
-        # Renomeia a coluna 'Datetime' ou 'Date' para 'Date' consistente, se necessário
-        # (yfinance retorna 'Date' a partir de certas versões/períodos, mas checamos)
-        if 'Datetime' in hist.columns:
-             hist.rename(columns={'Datetime': 'Date'}, inplace=True)
+        # Recorta o período (ou intervalo de datas) pedido e prepara o DataFrame para resposta
+        if start is None:
+            hist = ohlcv_cache.slice_period(hist, period)
+        hist = ohlcv_cache.slice_range(hist, start, end)
+        hist = _finalize_frame(hist, indicator_columns)
+        if hist.empty:
+            return None
 
+        # Reduz a série à resolução pedida (depois dos indicadores, calculados sobre todas as barras)
+        return downsampling.downsample(hist, points, downsample)
 
-        # Calcula a Média Móvel Simples (SMA) de 20 períodos
-        hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
+    except Exception as e:
+        logger.error("Erro ao extrair dados para o ticker %s: %s", ticker, e)
+        # Em uma API real, pode-se logar o erro detalhado
+        return None
 
-        # Calcula a Média Móvel Exponencial (EMA) de 20 períodos
-        hist['EMA_20'] = hist['Close'].ewm(span=20, adjust=False).mean()
 
-        # Converte a coluna de data para o formato string 'YYYY-MM-DD' para serialização JSON
-        hist['Date'] = hist['Date'].dt.strftime('%Y-%m-%d')
+def get_price_bars(ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame | None:
+    """
+    Barras OHLCV do período (indexadas por data, sem indicadores), servidas do cache sempre que possível.
+    Usada pelas análises que trabalham direto sobre os arrays (ex: backtesting).
+
+    Returns:
+        pd.DataFrame | None: As barras, ou None se nenhum dado for encontrado ou ocorrer um erro.
+    """
+    try:
+        bars, _ = _load_bars(ticker, period, interval)
+        bars = ohlcv_cache.slice_period(bars, period).dropna(subset=['Close'])
+        return bars if not bars.empty else None
+    except Exception as e:
+        logger.error("Erro ao extrair barras para o ticker %s: %s", ticker, e)
+        return None
 
-        # Remove linhas com valores NaN que resultam dos cálculos de média móvel iniciais
-        # (Os primeiros 19 dias não terão SMA/EMA 20)
-        hist.dropna(subset=['SMA_20', 'EMA_20'], inplace=True)
 
-        # Converte o DataFrame para uma lista de dicionários para ser facilmente serializado para JSON
-        # O 'records' orienta a conversão para uma lista onde cada elemento é um dicionário de linha
-        return hist.to_dict(orient='records')
+def get_price_bars_batch(tickers: list[str], period: str = "1y", interval: str = "1d") -> dict[str, pd.DataFrame]:
+    """
+    Versão em lote de get_price_bars (no máximo duas chamadas ao Yahoo para todos os tickers).
 
+    Returns:
+        dict[str, pd.DataFrame]: Ticker -> barras. Tickers sem dados (ou com erro) não aparecem no dicionário.
+    """
+    try:
+        bars_by_ticker = _load_bars_batch(tickers, period, interval)
     except Exception as e:
-        print(f"Erro ao extrair dados para o ticker {ticker}: {e}")
-        # Em uma API real, pode-se logar o erro detalhado
+        logger.error("Erro ao extrair barras em lote para os tickers %s: %s", tickers, e)
+        return {}
+    bars_by_ticker = {t: b.dropna(subset=['Close']) for t, b in bars_by_ticker.items()}
+    return {t: b for t, b in bars_by_ticker.items() if not b.empty}
+
+
+def get_historical_data(ticker: str, period: str = "6mo", interval: str = "1d") -> list | None:
+    """
+    Extrai dados históricos de uma ação usando yfinance e calcula médias móveis.
+
+    Args:
+        ticker (str): O símbolo do ticker da ação (ex: "MSFT").
+        period (str): O período dos dados históricos (ex: "6mo", "1y", "max"). O padrão é "6mo".
+        interval (str): O intervalo das barras (ex: "1m", "5m", "1h", "1d", "1wk"). O padrão é "1d".
+
+    Returns:
+        list | None: Uma lista de dicionários contendo os dados históricos
+                     (Date, Open, High, Low, Close, Volume, SMA_20, EMA_20)
+                     ou None se nenhum dado for encontrado ou ocorrer um erro.
+    """
+    hist = get_historical_frame(ticker, period, interval)
+    if hist is None:
         return None
+    # Converte o DataFrame para uma lista de dicionários (um por barra) para serialização JSON
+    return serialization.frame_to_records(hist, interval)
+
+def get_historical_data_batch(tickers: list[str], period: str = "6mo", interval: str = "1d") -> dict[str, list]:
+    """
+    Extrai dados históricos de vários tickers em um único download em lote e calcula
+    SMA/EMA de 20 períodos para todas as séries de uma vez (matriz tickers x barras).
+
+    Args:
+        tickers (list[str]): Os símbolos dos tickers (ex: ["MSFT", "AAPL", "BTC-USD"]).
+        period (str): O período dos dados históricos (ex: "6mo", "1y"). O padrão é "6mo".
+        interval (str): O intervalo das barras (ex: "1d", "5m"). O padrão é "1d".
+
+    Returns:
+        dict[str, list]: Um dicionário ticker -> lista de registros (mesmo formato de get_historical_data).
+                         Tickers sem dados (ou com erro) não aparecem no dicionário.
+    """
+    try:
+        bars_by_ticker = _load_bars_batch(tickers, period, interval)
+    except Exception as e:
+        logger.error("Erro ao extrair dados em lote para os tickers %s: %s", tickers, e)
+        return {}
+
+    symbols = [t for t in tickers if t in bars_by_ticker and not bars_by_ticker[t].empty]
+    if not symbols:
+        return {}
+
+    # Matriz (tickers x barras) com os fechamentos alinhados à direita
+    closes = indicators.pad_series([bars_by_ticker[t]['Close'].to_numpy(dtype=float) for t in symbols])
+    sma_20 = indicators.sma(closes, 20)
+    ema_20 = indicators.ema(closes, 20)
+
+    result = {}
+    for row, ticker in enumerate(symbols):
+        hist = bars_by_ticker[ticker].copy()
+        n = len(hist)
+        hist['SMA_20'] = sma_20[row, -n:]
+        hist['EMA_20'] = ema_20[row, -n:]
+        hist = _finalize_frame(hist)
+        if not hist.empty:
+            result[ticker] = serialization.frame_to_records(hist, interval)
+    return result
 
 # --- Função para Informações da Empresa ---
+
+# Informações de empresas já consultadas, compartilhadas pelos workers do host
+_company_info_cache = shared_cache.SharedCache("company_info", settings.COMPANY_INFO_CACHE_TTL_SECONDS)
+
+
 def get_company_info(ticker: str) -> dict | None:
     """
     Extrai informações básicas da empresa para um dado ticker usando yfinance.
 
+    Com o cache compartilhado ligado, as informações são reaproveitadas por todos os workers do host
+    durante COMPANY_INFO_CACHE_TTL_SECONDS, e só um worker por vez consulta o Yahoo para cada ticker.
+    Se o Yahoo estiver fora do ar, as últimas informações gravadas são servidas mesmo expiradas.
+
     Args:
         ticker (str): O símbolo do ticker da empresa (ex: "MSFT").
 
@@ -71,14 +540,58 @@ def get_company_info(ticker: str) -> dict | None:
                      (como nome, setor, indústria, funcionários, website, resumo)
                      ou None se o ticker for inválido ou as informações não forem encontradas.
     """
+    if not settings.SHARED_CACHE_ENABLED:
+        return _fetch_or_stale(_fetch_company_info, ticker)
+
+    key = ticker.upper()
+    company_info = _company_info_cache.get(key)
+    if company_info is None:
+        with shared_cache.file_lock(f"info:{key}"):
+            # Outro worker pode ter feito a consulta enquanto esperávamos a trava
+            company_info = _company_info_cache.get(key)
+            if company_info is None:
+                metrics.cache_result("company_info", "miss")
+                return _fetch_or_stale(_fetch_company_info, ticker, _company_info_cache)
+
+    metrics.cache_result("company_info", "hit")
+    return company_info
+
+
+def _fetch_or_stale(fetch, ticker: str, cache: shared_cache.SharedCache | None = None):
+    """
+    Chama fetch(ticker) e grava o resultado no cache compartilhado (se houver e não for None).
+    Se a fonte de dados falhar (ver resilience), devolve o valor expirado do cache para o ticker
+    (sem regravá-lo), ou None se não houver.
+    """
+    try:
+        value = fetch(ticker)
+    except resilience.UpstreamError as e:
+        stale = cache.get(ticker.upper(), allow_stale=True) if cache is not None else None
+        logger.warning("Fonte de dados indisponível para %s (%s)%s: %s", ticker, fetch.__name__,
+                       "; servindo dados antigos do cache" if stale is not None else "", e)
+        if stale is not None:
+            metrics.cache_result(cache.namespace, "stale")
+        return stale
+    if cache is not None and value is not None:
+        cache.set(ticker.upper(), value)
+    return value
+
+
+def _fetch_company_info(ticker: str) -> dict | None:
+    """
+    Consulta as informações da empresa na fonte de dados (sem cache).
+
+    Raises:
+        resilience.UpstreamError: Se a fonte falhar, não responder no prazo ou estiver com o circuito aberto.
+    """
     try:
-        stock = yf.Ticker(ticker)
         # O dicionário .info pode ser grande, extraímos campos úteis
-        info = stock.info
+        with metrics.stage("upstream_info"):
+            info = resilience.market_data().call(partial(get_provider().info, ticker))
 
         # yfinance pode retornar um dicionário vazio ou com poucos dados para tickers inválidos ou com problemas
         if not info or info.get('regularMarketPrice') is None:
-             print(f"Informações básicas não encontradas para o ticker: {ticker}")
+             logger.info("Informações básicas não encontradas para o ticker: %s", ticker)
              return None # Indica que o ticker pode ser inválido ou sem dados info
 
 
@@ -94,6 +607,20 @@ def get_company_info(ticker: str) -> dict | None:
             # Campos adicionais úteis, verificar se existem e não são muito longos
             "marketCap": info.get('marketCap'), # Capitalização de mercado
             "country": info.get('country'), # País
+            "currency": info.get('currency'), # Moeda das cotações
+            # Fundamentos e consenso dos analistas (usados no contexto da análise de IA)
+            "trailingPE": info.get('trailingPE'),
+            "forwardPE": info.get('forwardPE'),
+            "dividendYield": info.get('dividendYield'),
+            "beta": info.get('beta'),
+            "fiftyTwoWeekHigh": info.get('fiftyTwoWeekHigh'),
+            "fiftyTwoWeekLow": info.get('fiftyTwoWeekLow'),
+            "recommendationKey": info.get('recommendationKey'),
+            "recommendationMean": info.get('recommendationMean'),
+            "numberOfAnalystOpinions": info.get('numberOfAnalystOpinions'),
+            "targetMeanPrice": info.get('targetMeanPrice'),
+            "targetLowPrice": info.get('targetLowPrice'),
+            "targetHighPrice": info.get('targetHighPrice'),
             # "longBusinessSummary": info.get('longBusinessSummary'), # Resumo longo do negócio (pode ser muito grande)
         }
 
@@ -102,16 +629,99 @@ def get_company_info(ticker: str) -> dict | None:
 
         # Podemos adicionar uma verificação extra se os campos essenciais estiverem faltando
         if not company_info.get("shortName") and not company_info.get("longName"):
-             print(f"Nome da empresa não encontrado para o ticker: {ticker}")
+             logger.info("Nome da empresa não encontrado para o ticker: %s", ticker)
              return None # Considera inválido se nem o nome for encontrado
 
         return company_info
 
+    except resilience.UpstreamError:
+        raise
     except Exception as e:
-        print(f"Erro ao extrair informações da empresa para o ticker {ticker}: {e}")
+        logger.error("Erro ao extrair informações da empresa para o ticker %s: %s", ticker, e)
         # Em uma API real, logar o erro detalhado aqui
         return None
 
+
+# --- Função para Notícias da Empresa ---
+
+# Notícias já consultadas, compartilhadas pelos workers do host
+_company_news_cache = shared_cache.SharedCache("company_news", settings.COMPANY_NEWS_CACHE_TTL_SECONDS)
+
+
+def get_company_news(ticker: str) -> list[dict]:
+    """
+    Notícias recentes de um ticker, da mais nova para a mais antiga.
+
+    Com o cache compartilhado ligado, as notícias são reaproveitadas por todos os workers do host
+    durante COMPANY_NEWS_CACHE_TTL_SECONDS (e servidas expiradas com o Yahoo fora do ar, como em get_company_info).
+
+    Args:
+        ticker (str): O símbolo do ticker (ex: "MSFT").
+
+    Returns:
+        list[dict]: As notícias, com 'title', 'publisher', 'published' (ISO 8601, UTC), 'url' e 'summary'.
+                    Lista vazia se não houver notícias ou ocorrer um erro.
+    """
+    if not settings.SHARED_CACHE_ENABLED:
+        return _fetch_or_stale(_fetch_company_news, ticker) or []
+
+    key = ticker.upper()
+    news = _company_news_cache.get(key)
+    if news is None:
+        with shared_cache.file_lock(f"news:{key}"):
+            news = _company_news_cache.get(key)
+            if news is None:
+                metrics.cache_result("company_news", "miss")
+                # Erros não são gravados: a próxima consulta tenta de novo
+                return _fetch_or_stale(_fetch_company_news, ticker, _company_news_cache) or []
+
+    metrics.cache_result("company_news", "hit")
+    return news
+
+
+def _news_item(item: dict) -> dict | None:
+    """
+    Normaliza uma notícia do yfinance (formato atual, com 'content', ou o antigo, plano).
+    """
+    content = item.get("content") or item
+    title = content.get("title")
+    if not title:
+        return None
+
+    provider = content.get("provider")
+    published = content.get("pubDate") or content.get("providerPublishTime")
+    if isinstance(published, (int, float)):
+        published = pd.Timestamp(published, unit="s", tz="UTC").isoformat()
+    elif published:
+        published = pd.Timestamp(published)
+        published = (published.tz_localize("UTC") if published.tzinfo is None else published.tz_convert("UTC")).isoformat()
+    return {
+        "title": title,
+        "publisher": provider.get("displayName") if isinstance(provider, dict) else content.get("publisher"),
+        "published": published,
+        "url": (content.get("canonicalUrl") or {}).get("url") or content.get("link"),
+        "summary": content.get("summary") or None,
+    }
+
+
+def _fetch_company_news(ticker: str) -> list[dict] | None:
+    """
+    Consulta as notícias na fonte de dados (sem cache). Devolve None em caso de erro.
+
+    Raises:
+        resilience.UpstreamError: Se a fonte falhar, não responder no prazo ou estiver com o circuito aberto.
+    """
+    try:
+        with metrics.stage("upstream_news"):
+            raw_news = resilience.market_data().call(partial(get_provider().news, ticker))
+        news = [n for n in (_news_item(item) for item in raw_news if isinstance(item, dict)) if n is not None]
+        return sorted(news, key=lambda n: n["published"] or "", reverse=True)
+    except resilience.UpstreamError:
+        raise
+    except Exception as e:
+        logger.error("Erro ao extrair notícias para o ticker %s: %s", ticker, e)
+        return None
+
 if __name__ == "__main__":
     import asyncio
 
@@ -0,0 +1,141 @@
+# backend/src/utils/compression.py
+#
+# Compressão das respostas (brotli ou gzip, conforme o Accept-Encoding do cliente).
+# O brotli é opcional (pacote "brotli"): sem ele, só gzip é oferecido.
+
+import asyncio
+import gzip
+
+# Métricas de duração das etapas
+from src.utils import metrics
+# Importa as configurações (tamanho mínimo e níveis de compressão)
+from src.config.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types comprimidos (JSON e texto; o Arrow já é binário compacto)
+_COMPRESSIBLE = ("application/json", "text/")
+# Corpos maiores que isso são comprimidos fora do event loop
+_THREAD_MIN_BYTES = 256 * 1024
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE) or media_type.endswith("+json")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """
+    Escolhe a codificação pelo Accept-Encoding: "br" (se disponível), depois "gzip"; None sem nenhuma aceita.
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in (("br",) if brotli is not None else ()) + ("gzip",):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Comprime o corpo com a codificação escolhida ("br" ou "gzip").
+    """
+    with metrics.stage("compression"):
+        if encoding == "br":
+            return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime respostas JSON/texto com corpo completo a partir de COMPRESSION_MIN_BYTES.
+
+    Respostas em streaming (Server-Sent Events) passam sem compressão, para que cada pedaço chegue
+    ao cliente assim que é produzido. Como o corpo comprimido é outra representação, uma ETag forte
+    passa a ser fraca (W/), como faz o nginx; as requisições condicionais continuam valendo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = choose_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            headers = {name.lower(): value for name, value in start_message.get("headers", ())}
+            compressible = (_is_compressible(headers.get(b"content-type", b"").decode("latin-1"))
+                            and b"content-encoding" not in headers)
+            body = message.get("body", b"")
+            passthrough = True
+            if not compressible or message.get("more_body", False) or len(body) < settings.COMPRESSION_MIN_BYTES:
+                if compressible:
+                    start_message["headers"] = _with_vary(start_message.get("headers", []))
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= _THREAD_MIN_BYTES:
+                body = await asyncio.to_thread(compress, body, encoding)
+            else:
+                body = compress(body, encoding)
+
+            response_headers = []
+            for name, value in start_message.get("headers", ()):
+                if name.lower() == b"content-length":
+                    continue
+                if name.lower() == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value
+                response_headers.append((name, value))
+            response_headers.append((b"content-encoding", encoding.encode("latin-1")))
+            response_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            start_message["headers"] = _with_vary(response_headers)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def _with_vary(headers: list) -> list:
+    """
+    Acrescenta Accept-Encoding ao Vary (caches intermediários guardam uma versão por codificação).
+    """
+    headers = list(headers)
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
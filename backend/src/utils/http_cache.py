@@ -0,0 +1,89 @@
+# backend/src/utils/http_cache.py
+#
+# Cache HTTP das rotas de leitura: ETags, requisições condicionais (If-None-Match -> 304) e
+# Cache-Control conforme o horário do pregão. Um gráfico atualizado sem mudança nos dados custa
+# só os cabeçalhos, sem serializar nem transferir o corpo.
+
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+from fastapi.responses import Response
+
+# Horário do pregão (define por quanto tempo o cliente pode reaproveitar a resposta)
+from src.utils import market_hours
+# Importa as configurações (TTLs do cache OHLCV e limites do Cache-Control)
+from src.config.config import settings
+
+# pandas é carregado sob demanda: este módulo é importado pelas rotas na inicialização
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _etag(digest: "hashlib.blake2b") -> str:
+    return f'"{digest.hexdigest()}"'
+
+
+def frame_etag(df: "pd.DataFrame", *parts: str) -> str:
+    """
+    ETag forte de uma série histórica: hash do conteúdo de todas as barras (a última, ainda em
+    formação, inclusive), dos nomes das colunas e de 'parts' (ex: intervalo e formato da resposta,
+    que mudam a representação). Custa uma passada vetorizada sobre as colunas, bem menos que serializar.
+    """
+    import pandas as pd
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\x1f".join(map(str, (*parts, *df.columns))).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return _etag(digest)
+
+
+def json_etag(payload) -> str:
+    """
+    ETag forte de um corpo JSON (chaves ordenadas, para não depender da ordem de inserção).
+    """
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return _etag(hashlib.blake2b(encoded, digest_size=16))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Indica se o cabeçalho If-None-Match contém a ETag. A comparação é fraca, como manda a RFC 9110
+    para If-None-Match: W/"x" equivale a "x" (a compressão enfraquece as ETags, ver compression.py).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _cache_control(max_age: float) -> str:
+    return f"public, max-age={max(int(max_age), 0)}"
+
+
+def bars_cache_control(ticker: str, interval: str) -> str:
+    """
+    Cache-Control de uma série histórica. Com o pregão aberto (ou para cripto), a resposta vale pelo
+    TTL do cache OHLCV do intervalo: antes disso o servidor não buscaria barras novas. Com o pregão
+    fechado as barras não mudam até a abertura, limitado a HTTP_CACHE_MAX_AGE_CLOSED_SECONDS.
+    """
+    ttl = settings.OHLCV_CACHE_TTL_SECONDS.get(interval, settings.OHLCV_CACHE_DEFAULT_TTL_SECONDS)
+    if market_hours.trades_24h(ticker) or market_hours.is_market_open():
+        return _cache_control(ttl)
+    return _cache_control(max(ttl, min(market_hours.seconds_until_open(), settings.HTTP_CACHE_MAX_AGE_CLOSED_SECONDS)))
+
+
+def info_cache_control() -> str:
+    """
+    Cache-Control das informações da empresa (mudam no máximo uma vez por dia, exceto o valor de mercado).
+    """
+    return _cache_control(settings.HTTP_CACHE_INFO_MAX_AGE_SECONDS)
+
+
+def not_modified(headers: dict) -> Response:
+    """
+    Resposta 304 (sem corpo) com os cabeçalhos de cache da representação atual.
+    """
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,74 @@
+# backend/src/utils/logging_config.py
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+# Importa as configurações (nível e formato dos logs)
+from src.config.config import settings
+
+# Atributos padrão de um LogRecord (o que sobrar veio de 'extra' e entra no JSON)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Thread que escreve os registros enfileirados (None enquanto o logging não foi configurado)
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Um objeto JSON por linha: instante, nível, logger, mensagem e os campos passados em 'extra'
+    (ex: logger.info("Cache OHLCV", extra={"ticker": "AAPL", "result": "hit"})).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging() -> None:
+    """
+    Configura os logs da aplicação (loggers "src.*") sem escrita síncrona no caminho das requisições:
+    cada chamada apenas enfileira o registro (QueueHandler) e uma thread dedicada (QueueListener)
+    formata e escreve no stdout. Chamadas repetidas não têm efeito.
+
+    O nível vem de LOG_LEVEL e o formato de LOG_FORMAT ("text" ou "json").
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+    logger = logging.getLogger("src")
+    logger.setLevel(settings.LOG_LEVEL)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    # Sem propagar para o logger raiz (evita linhas duplicadas se o uvicorn ou outro código o configurar)
+    logger.propagate = False
+
+
+def shutdown_logging() -> None:
+    """
+    Escreve os registros ainda na fila e encerra a thread de escrita.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
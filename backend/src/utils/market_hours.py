@@ -0,0 +1,100 @@
+# backend/src/utils/market_hours.py
+#
+# Horário do pregão (bolsa americana por padrão: 9:30-16:00 em Nova York, segunda a sexta).
+# Feriados não são considerados: nesses dias o mercado é tratado como aberto, o que só encurta caches.
+
+import re
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+# Importa as configurações (fuso e horário do pregão)
+from src.config.config import settings
+
+# Pares de cripto do Yahoo (ex: "BTC-USD"), negociados 24/7
+_CRYPTO_PATTERN = re.compile(r"^[A-Z0-9]+-(USD|USDT|EUR|GBP|BRL|JPY)$")
+
+
+def _session() -> tuple[ZoneInfo, time, time]:
+    zone = ZoneInfo(settings.MARKET_TIMEZONE)
+    return zone, time.fromisoformat(settings.MARKET_OPEN_TIME), time.fromisoformat(settings.MARKET_CLOSE_TIME)
+
+
+def trades_24h(ticker: str) -> bool:
+    """
+    Indica se o ticker negocia sem pausa (cripto), sem depender do horário do pregão.
+    """
+    return bool(_CRYPTO_PATTERN.match(ticker.upper()))
+
+
+def is_market_open(now: datetime | None = None) -> bool:
+    """
+    Indica se o pregão está aberto no instante informado (padrão: agora).
+    """
+    zone, open_at, close_at = _session()
+    local = (now or datetime.now(zone)).astimezone(zone)
+    return local.weekday() < 5 and open_at <= local.time() < close_at
+
+
+def seconds_until_open(now: datetime | None = None) -> float:
+    """
+    Segundos até a próxima abertura do pregão (0 com o pregão aberto).
+    """
+    zone, open_at, _ = _session()
+    local = (now or datetime.now(zone)).astimezone(zone)
+    if is_market_open(local):
+        return 0.0
+
+    day = local.date()
+    if local.time() >= open_at:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return (datetime.combine(day, open_at, tzinfo=zone) - local).total_seconds()
+
+
+def last_close(now: datetime | None = None) -> datetime:
+    """
+    Último fechamento do pregão até o instante informado (padrão: agora).
+    """
+    zone, _, close_at = _session()
+    local = (now or datetime.now(zone)).astimezone(zone)
+    day = local.date()
+    if local.time() < close_at:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return datetime.combine(day, close_at, tzinfo=zone)
+
+
+def closed_since(fetched_at: float, ticker: str, now: datetime | None = None) -> bool:
+    """
+    Indica se dados do ticker obtidos em 'fetched_at' (timestamp Unix) ainda são os mais recentes porque o
+    pregão fechou antes disso e não abriu mais (ex: barras buscadas após o fechamento, consultadas na
+    manhã seguinte antes da abertura). Cripto nunca fecha.
+    """
+    if trades_24h(ticker) or is_market_open(now):
+        return False
+    return fetched_at >= last_close(now).timestamp()
+
+
+def next_weekday_time(times: list[str], now: datetime | None = None) -> datetime:
+    """
+    Próximo instante, de segunda a sexta, em um dos horários 'times' ("HH:MM", no fuso da bolsa).
+
+    Raises:
+        ValueError: Se a lista estiver vazia ou algum horário for inválido.
+    """
+    if not times:
+        raise ValueError("Nenhum horário informado")
+    zone = ZoneInfo(settings.MARKET_TIMEZONE)
+    local = (now or datetime.now(zone)).astimezone(zone)
+    at_times = sorted(time.fromisoformat(t) for t in times)
+
+    day = local.date()
+    while True:
+        if day.weekday() < 5:
+            for at in at_times:
+                candidate = datetime.combine(day, at, tzinfo=zone)
+                if candidate > local:
+                    return candidate
+        day += timedelta(days=1)
@@ -0,0 +1,276 @@
+# backend/src/utils/metrics.py
+#
+# Métricas no formato de texto do Prometheus (exposição 0.0.4), sem dependências além do FastAPI.
+# Contadores, medidores e histogramas com rótulos, seguros para uso a partir de várias threads
+# (o pool de threads dos dados e o event loop). A rota /metrics devolve render().
+#
+# Métricas da aplicação (definidas no fim do módulo):
+#   - daytrade_stage_duration_seconds{stage}: duração de cada etapa (busca no Yahoo, indicadores,
+#     serialização, compressão, execução do agente de IA...), para separar onde o tempo de uma requisição foi gasto;
+#   - daytrade_cache_requests_total{cache,result}: consultas aos caches (hit, miss...), de onde sai a taxa de acerto;
+#   - daytrade_http_requests_in_flight{method,route}: requisições em andamento por rota (MetricsRoute);
+#   - daytrade_http_request_duration_seconds{method,route,status}: duração total das requisições.
+#
+# As métricas das chamadas externas (tentativas, hedge, novas tentativas e estado dos disjuntores) ficam em
+# resilience.
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+
+# Limites dos histogramas de duração (em segundos): de 0,5ms (serialização) a 1min (agentes de IA)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """
+    Base das métricas: nome, ajuda, rótulos e os valores por combinação de rótulos.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Rótulos de {self.name} devem ser {self.labelnames}, recebidos {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: tuple[str, ...], value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """
+    Contador que só cresce (ex: consultas ao cache).
+    """
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Medidor que sobe e desce (ex: requisições em andamento).
+    """
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    Histograma cumulativo (contagens por limite superior, soma e total), como o do Prometheus.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            # Primeiro limite >= valor (o último é +Inf)
+            state["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Mede a duração do bloco (inclusive quando ele termina com exceção).
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_sample(self, key, state) -> list[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, state["counts"]):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+# Métricas registradas (na ordem em que aparecem em /metrics)
+_registry: list[_Metric] = []
+
+
+def register(metric: _Metric) -> _Metric:
+    _registry.append(metric)
+    return metric
+
+
+def render() -> str:
+    """
+    Todas as métricas no formato de texto do Prometheus.
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Media type da exposição em texto do Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --- Métricas da aplicação ---
+
+STAGE_SECONDS = register(Histogram(
+    "daytrade_stage_duration_seconds",
+    "Duração de cada etapa do processamento (upstream_fetch, upstream_info, upstream_news, resample, indicators, "
+    "serialization, json_encode, compression, ai_context, llm_agent, llm_completion).",
+    ("stage",),
+))
+
+CACHE_REQUESTS = register(Counter(
+    "daytrade_cache_requests_total",
+    "Consultas aos caches por resultado (hit, miss; no cache OHLCV também refresh e derived; stale quando "
+    "dados expirados são servidos com a fonte externa fora do ar).",
+    ("cache", "result"),
+))
+
+HTTP_IN_FLIGHT = register(Gauge(
+    "daytrade_http_requests_in_flight",
+    "Requisições HTTP em andamento por rota.",
+    ("method", "route"),
+))
+
+HTTP_REQUEST_SECONDS = register(Histogram(
+    "daytrade_http_request_duration_seconds",
+    "Duração total das requisições HTTP por rota e status.",
+    ("method", "route", "status"),
+))
+
+
+def stage(name: str):
+    """
+    Mede a duração de uma etapa do processamento. Uso: with metrics.stage("indicators"): ...
+    """
+    return STAGE_SECONDS.time(stage=name)
+
+
+def cache_result(cache: str, result: str) -> None:
+    """
+    Registra o resultado de uma consulta a um cache (ex: cache_result("ohlcv", "hit")).
+    """
+    CACHE_REQUESTS.inc(cache=cache, result=result)
+
+
+def _route_path(scope: dict) -> str:
+    """
+    O caminho da rota que atendeu a requisição (ex: "/api/v1/stocks/data/{ticker}"), para que os
+    rótulos não variem com o ticker. O roteador grava a rota no escopo; sem ela, "unmatched".
+    """
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class MetricsRoute(APIRoute):
+    """
+    Rota que conta as requisições em andamento (uso: APIRouter(route_class=metrics.MetricsRoute)).
+    Respostas em streaming deixam de contar quando o handler devolve a resposta, antes do fim do envio.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def handler_with_metrics(request):
+            HTTP_IN_FLIGHT.inc(method=request.method, route=route)
+            try:
+                return await handler(request)
+            finally:
+                HTTP_IN_FLIGHT.dec(method=request.method, route=route)
+
+        return handler_with_metrics
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede a duração total de cada requisição HTTP por rota e status.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=scope["method"],
+                                         route=_route_path(scope), status=str(status))
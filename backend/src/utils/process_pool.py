@@ -0,0 +1,45 @@
+# backend/src/utils/process_pool.py
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Importa as configurações (número de processos)
+from src.config.config import settings
+
+# Pool de processos compartilhado pelos cálculos pesados em CPU (backtesting, screener), criado no primeiro uso
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Devolve o pool de processos. Usa "spawn": o processo da API tem threads (event loop,
+    pool de workers), e um fork no meio delas pode herdar locks travados.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.PROCESS_POOL_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+async def run_in_process(fn, *args, **kwargs):
+    """
+    Executa uma função (de nível de módulo, com argumentos serializáveis) em outro processo,
+    sem bloquear o event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), functools.partial(fn, *args, **kwargs))
+
+
+async def shutdown() -> None:
+    """
+    Encerra o pool de processos (usado no encerramento da aplicação).
+    """
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
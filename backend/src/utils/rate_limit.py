@@ -0,0 +1,36 @@
+# backend/src/utils/rate_limit.py
+
+import time
+
+
+class TokenBucket:
+    """
+    Limitador de taxa "token bucket".
+
+    Acumula até 'capacity' fichas, repostas à taxa de 'rate_per_second'. try_acquire() consome uma
+    ficha sem esperar ou informa quanto falta para a próxima (quem chama decide se espera ou recusa).
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def try_acquire(self) -> float:
+        """
+        Tenta consumir uma ficha sem esperar.
+
+        Returns:
+            float: 0 se a ficha foi consumida; senão, os segundos até a próxima ficha ficar disponível.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_second
@@ -0,0 +1,389 @@
+# backend/src/utils/resilience.py
+#
+# Camada de resiliência das chamadas externas (Yahoo via yfinance e os modelos da Groq):
+#   - prazo por tentativa e prazo total da chamada;
+#   - novas tentativas com espera exponencial aleatória ("full jitter");
+#   - requisição duplicada (hedge) quando a primeira passa do percentil alto das latências recentes:
+#     vale a resposta que chegar primeiro, cortando a cauda da latência;
+#   - disjuntor (circuit breaker): após falhas seguidas, as chamadas são recusadas na hora durante
+#     CIRCUIT_RESET_SECONDS e os chamadores servem os dados antigos do cache; depois, uma chamada de
+#     teste decide se o circuito fecha.
+#
+# Chamadas síncronas (yfinance) rodam em um pool de threads próprio: uma tentativa que estoura o prazo
+# não pode ser interrompida e segue ocupando a sua thread até terminar (o resultado é descartado).
+# Chamadas assíncronas (Groq) são canceladas.
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable
+
+# Métricas das chamadas externas
+from src.utils import metrics
+# Importa as configurações (prazos, tentativas, hedge e disjuntor)
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latências registradas por fonte (base do percentil do hedge) e mínimo para usá-las
+_LATENCY_SAMPLES = 200
+_MIN_LATENCY_SAMPLES = 20
+
+UPSTREAM_CALLS = metrics.register(metrics.Counter(
+    "daytrade_upstream_calls_total",
+    "Tentativas de chamadas externas por resultado (ok, error, timeout) e chamadas recusadas (rejected).",
+    ("upstream", "result"),
+))
+UPSTREAM_HEDGES = metrics.register(metrics.Counter(
+    "daytrade_upstream_hedged_requests_total",
+    "Requisições duplicadas disparadas por demora da primeira.",
+    ("upstream",),
+))
+UPSTREAM_RETRIES = metrics.register(metrics.Counter(
+    "daytrade_upstream_retries_total",
+    "Novas tentativas após falha ou estouro de prazo.",
+    ("upstream",),
+))
+CIRCUIT_STATE = metrics.register(metrics.Gauge(
+    "daytrade_circuit_state",
+    "Estado do disjuntor por fonte: 0 fechado, 1 em teste (meio aberto), 2 aberto.",
+    ("upstream",),
+))
+
+
+class UpstreamError(RuntimeError):
+    """
+    Falha de uma chamada externa depois de esgotados o prazo e as tentativas.
+    """
+
+
+class UpstreamTimeout(UpstreamError, TimeoutError):
+    """
+    A chamada externa não respondeu dentro do prazo.
+    """
+
+
+class CircuitOpenError(UpstreamError):
+    """
+    A chamada foi recusada sem ser feita: o disjuntor da fonte está aberto.
+    """
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por fonte externa: abre após 'failure_threshold' falhas seguidas e, passados
+    'reset_seconds', deixa passar uma única chamada de teste (meio aberto). Sucesso fecha o
+    circuito; falha o reabre por mais 'reset_seconds'.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning("Disjuntor de %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        CIRCUIT_STATE.set(self._STATE_VALUES[state], upstream=self.name)
+
+    def allow(self) -> bool:
+        """
+        Indica se uma chamada pode ser feita agora (no estado meio aberto, só a chamada de teste).
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._set_state(self.CLOSED)
+
+    def release_probe(self) -> None:
+        """
+        Libera a chamada de teste sem resultado (ex: cancelada porque o cliente desconectou).
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+class Upstream:
+    """
+    Uma fonte externa com a sua política (prazos, tentativas, hedge), o seu disjuntor e as
+    latências recentes das tentativas bem-sucedidas.
+    """
+
+    def __init__(self, name: str, deadline: float, attempt_timeout: float, retries: int, hedge_after: float):
+        self.name = name
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.retries = retries
+        self.hedge_after = hedge_after
+        self.breaker = CircuitBreaker(name, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+    def hedge_delay(self) -> float | None:
+        """
+        Espera antes da requisição duplicada: o percentil UPSTREAM_HEDGE_QUANTILE das latências recentes
+        (ou hedge_after, enquanto houver poucas amostras). None com o hedge desligado.
+        """
+        if self.hedge_after <= 0:
+            return None
+        samples = sorted(self._latencies)
+        if len(samples) < _MIN_LATENCY_SAMPLES:
+            return self.hedge_after
+        return samples[min(int(len(samples) * settings.UPSTREAM_HEDGE_QUANTILE), len(samples) - 1)]
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow():
+            UPSTREAM_CALLS.inc(upstream=self.name, result="rejected")
+            raise CircuitOpenError(f"{self.name} indisponível (circuito aberto)")
+
+    def _record(self, result: str, latency: float | None = None) -> None:
+        UPSTREAM_CALLS.inc(upstream=self.name, result=result)
+        if result == "ok":
+            if latency is not None:
+                self._latencies.append(latency)
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def _backoff(self, attempt: int, remaining: float) -> float | None:
+        """
+        Espera antes da tentativa 'attempt' (a partir de 1), ou None se não houver mais tentativas ou prazo.
+        """
+        if attempt > self.retries:
+            return None
+        delay = random.uniform(0, min(settings.UPSTREAM_RETRY_MAX_SECONDS,
+                                      settings.UPSTREAM_RETRY_BASE_SECONDS * 2 ** (attempt - 1)))
+        if delay >= remaining:
+            return None
+        UPSTREAM_RETRIES.inc(upstream=self.name)
+        return delay
+
+    def call(self, fn: Callable[[], Any], *, hedge: bool = True, attempt_timeout: float | None = None) -> Any:
+        """
+        Executa fn() (síncrona, ex: uma consulta ao yfinance) com prazo, novas tentativas, hedge e disjuntor.
+
+        Args:
+            fn (Callable[[], Any]): A chamada, sem argumentos (use functools.partial).
+            hedge (bool): Permite a requisição duplicada (desligue para chamadas caras, ex: lotes grandes).
+            attempt_timeout (float | None): Prazo de cada tentativa. O padrão é o da fonte.
+
+        Returns:
+            Any: O resultado da primeira tentativa bem-sucedida.
+
+        Raises:
+            CircuitOpenError: Se o disjuntor estiver aberto.
+            UpstreamTimeout: Se o prazo se esgotar.
+            UpstreamError: Se todas as tentativas falharem (a última exceção fica em __cause__).
+        """
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._check_circuit()
+            timeout = min(attempt_timeout or self.attempt_timeout, deadline - time.monotonic())
+            try:
+                return self._attempt(fn, timeout, self.hedge_delay() if hedge else None)
+            except Exception as e:
+                attempt += 1
+                delay = self._backoff(attempt, deadline - time.monotonic())
+                if delay is None:
+                    if isinstance(e, UpstreamError):
+                        raise
+                    raise UpstreamError(f"{self.name}: {e}") from e
+                logger.info("Chamada a %s falhou (%s); nova tentativa em %.2fs", self.name, e, delay)
+                time.sleep(delay)
+
+    def _attempt(self, fn: Callable[[], Any], timeout: float, hedge_delay: float | None) -> Any:
+        started = time.monotonic()
+        pending = {_executor.submit(fn)}
+        hedged = hedge_delay is None or hedge_delay >= timeout
+        error = None
+
+        while pending:
+            now = time.monotonic()
+            wait_for = started + timeout - now
+            if not hedged:
+                wait_for = min(wait_for, started + hedge_delay - now)
+            done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    self._record("ok", time.monotonic() - started)
+                    return future.result()
+                error = future.exception()
+
+            if pending and time.monotonic() - started >= timeout:
+                break
+            if pending and not hedged and time.monotonic() - started >= hedge_delay:
+                # A primeira requisição está na cauda: dispara uma segunda e fica com a que chegar antes
+                hedged = True
+                UPSTREAM_HEDGES.inc(upstream=self.name)
+                pending.add(_executor.submit(fn))
+
+        if error is not None and not pending:
+            self._record("error")
+            raise error
+        self._record("timeout")
+        raise UpstreamTimeout(f"{self.name}: sem resposta em {timeout:.1f}s")
+
+    async def call_async(self, factory: Callable[[], Awaitable[Any]], *, hedge: bool = True) -> Any:
+        """
+        Versão assíncrona de call: factory() cria a corrotina de cada tentativa (ex: uma execução do
+        time de agentes). Tentativas que estouram o prazo ou perdem a corrida do hedge são canceladas.
+
+        Raises:
+            CircuitOpenError, UpstreamTimeout, UpstreamError: Como em call.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        attempt = 0
+        while True:
+            self._check_circuit()
+            timeout = min(self.attempt_timeout, deadline - loop.time())
+            try:
+                return await self._attempt_async(factory, timeout, self.hedge_delay() if hedge else None)
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except Exception as e:
+                attempt += 1
+                delay = self._backoff(attempt, deadline - loop.time())
+                if delay is None:
+                    if isinstance(e, UpstreamError):
+                        raise
+                    raise UpstreamError(f"{self.name}: {e}") from e
+                logger.info("Chamada a %s falhou (%s); nova tentativa em %.2fs", self.name, e, delay)
+                await asyncio.sleep(delay)
+
+    async def _attempt_async(self, factory: Callable[[], Awaitable[Any]], timeout: float,
+                             hedge_delay: float | None) -> Any:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        pending = {asyncio.ensure_future(factory())}
+        hedged = hedge_delay is None or hedge_delay >= timeout
+        error = None
+
+        try:
+            while pending:
+                wait_for = started + timeout - loop.time()
+                if not hedged:
+                    wait_for = min(wait_for, started + hedge_delay - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=max(wait_for, 0),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        self._record("ok", loop.time() - started)
+                        return task.result()
+                    error = task.exception()
+
+                if pending and loop.time() - started >= timeout:
+                    break
+                if pending and not hedged and loop.time() - started >= hedge_delay:
+                    hedged = True
+                    UPSTREAM_HEDGES.inc(upstream=self.name)
+                    pending.add(asyncio.ensure_future(factory()))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if error is not None and not pending:
+            self._record("error")
+            raise error
+        self._record("timeout")
+        raise UpstreamTimeout(f"{self.name}: sem resposta em {timeout:.1f}s")
+
+    @contextmanager
+    def guard(self):
+        """
+        Protege uma chamada que não pode ser repetida nem duplicada (ex: um stream já enviado em parte ao
+        cliente): só passa pelo disjuntor e registra o resultado.
+
+        Uso:
+            with resilience.llm(model_id).guard():
+                async for chunk in stream: ...
+
+        Raises:
+            CircuitOpenError: Se o disjuntor estiver aberto.
+        """
+        self._check_circuit()
+        try:
+            yield
+        except Exception:
+            self._record("error")
+            raise
+        except BaseException:
+            # Cancelamento ou fim antecipado do stream pelo consumidor: não conta como falha da fonte
+            self.breaker.release_probe()
+            raise
+        # A duração de um stream não entra nas latências (base do hedge das chamadas completas)
+        self._record("ok")
+
+
+# Threads das chamadas síncronas às fontes externas
+_executor = ThreadPoolExecutor(max_workers=settings.UPSTREAM_MAX_WORKERS, thread_name_prefix="upstream")
+
+# Fontes por nome (criadas no primeiro uso)
+_upstreams: dict[str, Upstream] = {}
+_upstreams_lock = threading.Lock()
+
+
+def _get(name: str, factory: Callable[[], Upstream]) -> Upstream:
+    with _upstreams_lock:
+        upstream = _upstreams.get(name)
+        if upstream is None:
+            upstream = _upstreams[name] = factory()
+        return upstream
+
+
+def market_data() -> Upstream:
+    """
+    A fonte de dados de mercado (Yahoo, ou as fixtures do modo replay).
+    """
+    return _get("market_data", lambda: Upstream(
+        "market_data", settings.MARKET_DATA_DEADLINE_SECONDS, settings.MARKET_DATA_ATTEMPT_TIMEOUT_SECONDS,
+        settings.MARKET_DATA_RETRIES, settings.MARKET_DATA_HEDGE_AFTER_SECONDS,
+    ))
+
+
+def llm(model_id: str) -> Upstream:
+    """
+    Um modelo de IA. Cada modelo tem o próprio disjuntor: limites de taxa e erros (ex: um model_id
+    inválido) de um modelo não bloqueiam os demais.
+    """
+    name = f"llm:{model_id}"
+    return _get(name, lambda: Upstream(
+        name, settings.AI_DEADLINE_SECONDS, settings.AI_ATTEMPT_TIMEOUT_SECONDS,
+        settings.AI_RETRIES, settings.AI_HEDGE_AFTER_SECONDS,
+    ))
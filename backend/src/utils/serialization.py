@@ -0,0 +1,134 @@
+# backend/src/utils/serialization.py
+
+import json
+from typing import TYPE_CHECKING
+
+from fastapi.responses import JSONResponse, Response
+
+# Métricas de duração das etapas (conversão do DataFrame e codificação JSON)
+from src.utils import metrics
+
+# pandas/pyarrow são carregados sob demanda: este módulo é importado pelas rotas na inicialização
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Formatos de resposta suportados para séries históricas e seus media types
+FORMAT_MEDIA_TYPES = {
+    "records": "application/json",                          # lista de objetos (um por barra) - padrão
+    "columns": "application/vnd.daytrade.columns+json",     # um array por coluna
+    "arrow": "application/vnd.apache.arrow.stream",         # Arrow IPC (stream), binário
+}
+DEFAULT_FORMAT = "records"
+
+
+def negotiate_format(format_param: str | None, accept: str | None) -> str:
+    """
+    Escolhe o formato da resposta: o parâmetro 'format' tem prioridade; sem ele, usa o cabeçalho Accept.
+
+    Args:
+        format_param (str | None): Valor do parâmetro de query 'format' ("records", "columns" ou "arrow").
+        accept (str | None): Valor do cabeçalho HTTP Accept.
+
+    Returns:
+        str: O formato escolhido. Formatos desconhecidos caem no padrão ("records").
+    """
+    if format_param in FORMAT_MEDIA_TYPES:
+        return format_param
+
+    if accept:
+        # Percorre os media types do Accept na ordem enviada pelo cliente (ignorando parâmetros como q=)
+        for media_range in accept.split(","):
+            media_type = media_range.split(";")[0].strip().lower()
+            for fmt, fmt_media_type in FORMAT_MEDIA_TYPES.items():
+                if media_type == fmt_media_type:
+                    return fmt
+
+    return DEFAULT_FORMAT
+
+
+def date_format_for(interval: str) -> str:
+    """
+    Formato de data usado nas respostas JSON: com hora para barras intradiárias, só a data nos demais.
+    """
+    return '%Y-%m-%d %H:%M' if interval.endswith(('m', 'h')) else '%Y-%m-%d'
+
+
+def _with_string_dates(df: "pd.DataFrame", interval: str) -> "pd.DataFrame":
+    """
+    Devolve uma cópia rasa do DataFrame com a coluna 'Date' convertida para string.
+    """
+    df = df.copy(deep=False)
+    df['Date'] = df['Date'].dt.strftime(date_format_for(interval))
+    return df
+
+
+def frame_to_records(df: "pd.DataFrame", interval: str) -> list:
+    """
+    Converte o DataFrame em uma lista de dicionários (um por barra) - o formato histórico da API.
+    """
+    return _with_string_dates(df, interval).to_dict(orient='records')
+
+
+def frame_to_columns(df: "pd.DataFrame", interval: str) -> dict:
+    """
+    Converte o DataFrame em um dicionário coluna -> lista de valores, sem criar objetos por linha.
+    """
+    df = _with_string_dates(df, interval)
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if series.hasnans:
+            # JSON não tem NaN: valores ausentes viram null
+            columns[name] = series.astype(object).where(series.notna(), None).tolist()
+        else:
+            columns[name] = series.tolist()
+    return columns
+
+
+def frame_to_arrow(df: "pd.DataFrame") -> bytes:
+    """
+    Serializa o DataFrame em Arrow IPC (formato stream) direto dos arrays das colunas.
+    A coluna 'Date' segue como timestamp nativo (com fuso), sem conversão para string.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_response(df: "pd.DataFrame", interval: str, fmt: str, key: str = "historical_data") -> Response:
+    """
+    Monta a resposta HTTP de uma série histórica no formato pedido.
+
+    As respostas JSON são serializadas aqui mesmo (json.dumps sobre listas nativas), evitando
+    que o FastAPI passe cada registro pelo jsonable_encoder genérico.
+
+    Args:
+        df (pd.DataFrame): A série histórica (coluna 'Date' como datetime).
+        interval (str): O intervalo das barras (define o formato das datas em JSON).
+        fmt (str): "records", "columns" ou "arrow".
+        key (str): Chave do envelope JSON. O padrão é "historical_data".
+
+    Returns:
+        Response: A resposta pronta para ser devolvida pela rota.
+    """
+    if fmt == "arrow":
+        with metrics.stage("serialization"):
+            content = frame_to_arrow(df)
+        return Response(content=content, media_type=FORMAT_MEDIA_TYPES["arrow"])
+
+    if fmt == "columns":
+        with metrics.stage("serialization"):
+            payload = {key: frame_to_columns(df, interval)}
+        with metrics.stage("json_encode"):
+            content = json.dumps(payload)
+        return Response(content=content, media_type=FORMAT_MEDIA_TYPES["columns"])
+
+    with metrics.stage("serialization"):
+        payload = {key: frame_to_records(df, interval)}
+    # JSONResponse codifica o corpo no construtor
+    with metrics.stage("json_encode"):
+        return JSONResponse(content=payload)
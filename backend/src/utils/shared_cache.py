@@ -0,0 +1,211 @@
+# backend/src/utils/shared_cache.py
+#
+# Cache compartilhado entre os workers do uvicorn de um mesmo host (SHARED_CACHE_DIR, disco local):
+#   - SharedCache: chave -> valor JSON com expiração, em um SQLite em modo WAL (leituras concorrentes
+#     entre processos). Usado para as informações de empresas e as análises de IA;
+#   - FileLock / file_lock / async_file_lock: trava entre processos (fcntl no Linux/macOS, msvcrt no
+#     Windows), para que só um worker atualize uma chave enquanto os demais esperam e leem o resultado.
+# As barras OHLCV ficam em arquivos Arrow mapeados em memória, lidos sem cópia (ver ohlcv_cache).
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Hashable
+
+# Importa as configurações (diretório e tempo máximo de espera pelas travas)
+from src.config.config import settings
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+# Intervalo entre tentativas de obter uma trava ocupada (em segundos)
+_LOCK_POLL_SECONDS = 0.05
+# Gravações entre limpezas das entradas expiradas do SQLite
+_PURGE_EVERY_WRITES = 500
+
+
+class FileLock:
+    """
+    Trava exclusiva entre processos (e entre threads), baseada em um arquivo em SHARED_CACHE_DIR/locks.
+    Não é reentrante: a mesma thread não deve pedir de novo uma trava que já detém.
+    """
+
+    def __init__(self, name: str):
+        safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", name)[:80]
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+        self.path = os.path.join(settings.SHARED_CACHE_DIR, "locks", f"{safe_name}.{digest}.lock")
+        self._file = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Obtém a trava, esperando no máximo 'timeout' segundos (padrão: SHARED_CACHE_LOCK_TIMEOUT_SECONDS).
+
+        Returns:
+            bool: True se a trava foi obtida; False se o tempo acabou (o chamador segue sem exclusividade).
+        """
+        timeout = settings.SHARED_CACHE_LOCK_TIMEOUT_SECONDS if timeout is None else timeout
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a+b")
+        deadline = time.monotonic() + timeout
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                self._file.close()
+                self._file = None
+                return False
+            time.sleep(_LOCK_POLL_SECONDS)
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+@contextmanager
+def file_lock(name: str, timeout: float | None = None):
+    """
+    Executa o bloco com a trava 'name' entre processos. Uso: with file_lock("ohlcv:AAPL:1d"): ...
+    Se a trava não for obtida a tempo (ex: um worker travado), o bloco roda assim mesmo.
+    """
+    lock = FileLock(name)
+    acquired = lock.acquire(timeout)
+    if not acquired:
+        logger.warning("Trava %s não obtida a tempo; seguindo sem exclusividade", name)
+    try:
+        yield acquired
+    finally:
+        lock.release()
+
+
+@asynccontextmanager
+async def async_file_lock(name: str, timeout: float | None = None):
+    """
+    Versão assíncrona de file_lock: a espera pela trava roda em uma thread, sem bloquear o event loop.
+    """
+    lock = FileLock(name)
+    acquired = await asyncio.to_thread(lock.acquire, timeout)
+    if not acquired:
+        logger.warning("Trava %s não obtida a tempo; seguindo sem exclusividade", name)
+    try:
+        yield acquired
+    finally:
+        lock.release()
+
+
+class SharedCache:
+    """
+    Cache chave -> valor (serializável em JSON) com expiração, compartilhado pelos processos do host.
+
+    Mesma interface de get/set do TTLCache. Cada thread (e cada processo) usa a própria conexão ao
+    SQLite; erros de leitura ou gravação são registrados e tratados como falta no cache.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float, path: str | None = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.path = path or os.path.join(settings.SHARED_CACHE_DIR, "cache.sqlite3")
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Conexões não atravessam fork (ex: pool de processos): cada processo abre a sua
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=settings.SHARED_CACHE_LOCK_TIMEOUT_SECONDS,
+                                     isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return key if isinstance(key, str) else repr(key)
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Any | None:
+        """
+        Retorna o valor da chave, ou None se ela não existir ou tiver expirado.
+        Com 'allow_stale', valores expirados há até STALE_MAX_AGE_SECONDS também são devolvidos
+        (usado quando a fonte externa está fora do ar, ver resilience).
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, self._key(key)),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Erro ao ler o cache compartilhado (%s): %s", self.namespace, e)
+            return None
+        if row is None:
+            return None
+        if row[1] <= time.time() - (settings.STALE_MAX_AGE_SECONDS if allow_stale else 0):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        """
+        Grava o valor da chave, com o TTL padrão do cache ou o informado.
+        """
+        expires_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, self._key(key), json.dumps(value, default=str), expires_at),
+            )
+            self._writes += 1
+            if self._writes % _PURGE_EVERY_WRITES == 0:
+                # Valores expirados ficam guardados por STALE_MAX_AGE_SECONDS como reserva (get(allow_stale=True))
+                connection.execute("DELETE FROM entries WHERE expires_at <= ?",
+                                   (time.time() - settings.STALE_MAX_AGE_SECONDS,))
+        except sqlite3.Error as e:
+            logger.error("Erro ao gravar no cache compartilhado (%s): %s", self.namespace, e)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a chave, se existir.
+        """
+        try:
+            self._connection().execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (self.namespace, self._key(key))
+            )
+        except sqlite3.Error as e:
+            logger.error("Erro ao remover do cache compartilhado (%s): %s", self.namespace, e)
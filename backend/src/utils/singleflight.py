@@ -0,0 +1,44 @@
+# backend/src/utils/singleflight.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas assíncronas concorrentes com a mesma chave em uma única execução.
+
+    Enquanto uma execução para a chave estiver em andamento, novas chamadas aguardam
+    o mesmo resultado (ou a mesma exceção) em vez de disparar outra chamada upstream.
+    """
+
+    def __init__(self):
+        # Tarefas em andamento, indexadas pela chave da chamada
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa fn() uma única vez por chave entre chamadas concorrentes e devolve o resultado compartilhado.
+
+        Args:
+            key (Hashable): Chave que identifica chamadas equivalentes (ex: ("history", "AAPL", "6mo")).
+            fn (Callable[[], Awaitable[Any]]): Função que cria a corrotina a ser executada.
+
+        Returns:
+            Any: O resultado de fn(), compartilhado por todos os chamadores da mesma chave.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            # A execução roda em uma Task própria: se o primeiro chamador for cancelado
+            # (ex: cliente desconectou), os demais continuam recebendo o resultado.
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """
+        Retorna quantas chaves estão com execução em andamento.
+        """
+        return len(self._inflight)
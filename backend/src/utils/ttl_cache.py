@@ -0,0 +1,97 @@
+# backend/src/utils/ttl_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Cache em memória com expiração (TTL) e descarte LRU, opcionalmente espelhado em disco.
+
+    Com 'disk_dir' definido, cada entrada também é gravada como um arquivo JSON, de modo que
+    os valores sobrevivem a reinícios do processo (os valores precisam ser serializáveis em JSON).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, disk_dir: str | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        # chave -> (instante de expiração, valor), da menos para a mais recentemente usada
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Retorna o valor da chave, ou None se ela não existir ou tiver expirado.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        if not self.disk_dir:
+            return None
+
+        # Falta em memória: tenta o espelho em disco (ex: após reinício do processo)
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if stored.get("expires_at", 0) <= now:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        self._store(key, stored["value"], stored["expires_at"])
+        return stored["value"]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        """
+        Grava o valor da chave, com o TTL padrão do cache ou o informado.
+        """
+        expires_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        self._store(key, value, expires_at)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"key": repr(key), "expires_at": expires_at, "value": value}, f)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError) as e:
+                logger.error("Erro ao gravar entrada do cache em disco (%s): %s", key, e)
+
+    def _store(self, key: Hashable, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            # Descarta as entradas menos recentemente usadas acima do limite
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
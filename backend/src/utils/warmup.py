@@ -0,0 +1,57 @@
+# backend/src/utils/warmup.py
+
+import asyncio
+import importlib
+import logging
+import time
+
+# Importa as configurações (pré-carga de módulos e modelos a pré-aquecer)
+from src.config.config import settings
+# Pré-aquecimento dos clientes Groq e dos times de agentes
+from src.tools.phi_agent_setup import is_ai_configured, warm_up_agents
+
+logger = logging.getLogger(__name__)
+
+# Módulos pesados carregados sob demanda pelas rotas (a importação de main.py não os carrega)
+DATA_MODULES = (
+    "src.tools.yfinance_tool",      # yfinance, pandas, NumPy
+    "src.tools.indicators",
+    "pyarrow",                      # cache OHLCV e respostas Arrow
+)
+AI_MODULES = (
+    "groq",
+    "phi.agent",
+    "phi.model.groq",
+    "phi.tools.yfinance",
+    "phi.tools.duckduckgo",
+)
+
+
+def preload_modules(modules: tuple[str, ...]) -> float:
+    """
+    Importa os módulos informados (falhas são apenas registradas).
+
+    Returns:
+        float: O tempo gasto, em segundos.
+    """
+    started = time.perf_counter()
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.error("Erro ao pré-carregar o módulo %s: %s", name, e)
+    return time.perf_counter() - started
+
+
+async def warm_up() -> None:
+    """
+    Aquecimento executado em segundo plano após a inicialização: importa as dependências pesadas
+    fora do event loop (a API já responde enquanto isso) e pré-aquece os modelos de AI_WARMUP_MODELS.
+    """
+    if settings.STARTUP_PRELOAD_MODULES:
+        modules = DATA_MODULES + (AI_MODULES if is_ai_configured() and settings.AI_PROVIDER != "stub" else ())
+        elapsed = await asyncio.to_thread(preload_modules, modules)
+        logger.info("Módulos pré-carregados em %.2fs", elapsed)
+
+    if settings.AI_WARMUP_MODELS:
+        await warm_up_agents(settings.AI_WARMUP_MODELS)
@@ -0,0 +1,20 @@
+# backend/tests/conftest.py
+#
+# As configurações são lidas na importação de src.config: o ambiente dos testes (caches em um diretório
+# temporário, dados de mercado e IA sem rede) precisa ser definido antes de qualquer import de src.
+
+import os
+import sys
+import tempfile
+
+_work_dir = tempfile.mkdtemp(prefix="daytrade-tests-")
+os.environ.update(
+    MARKET_DATA_PROVIDER="replay",
+    MARKET_DATA_REPLAY_DIR=os.path.join(_work_dir, "fixtures"),
+    AI_PROVIDER="stub",
+    OHLCV_CACHE_DIR=os.path.join(_work_dir, "ohlcv"),
+    SHARED_CACHE_DIR=os.path.join(_work_dir, "shared"),
+    LOG_LEVEL="WARNING",
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,78 @@
+# backend/tests/test_ai_model_limits.py
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config.config import settings
+from src.routers import stock_routes
+from src.services import ai_model_limits, ai_service
+
+MODEL = settings.AI_MODELS[0]
+
+
+@pytest.fixture
+def limits(monkeypatch) -> ai_model_limits.ModelLimits:
+    # Limites novos por teste: uma execução por vez e duas fichas
+    fresh = ai_model_limits.ModelLimits(MODEL)
+    fresh.concurrency = 1
+    fresh.bucket.capacity = fresh.bucket._tokens = 2
+    monkeypatch.setitem(ai_model_limits._limits, MODEL, fresh)
+    return fresh
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(stock_routes.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_model_slot_enforces_concurrency_and_rate(limits, monkeypatch):
+    released = []
+    monkeypatch.setattr(ai_model_limits, "_release_listeners", [lambda: released.append(limits.running)])
+
+    with ai_model_limits.model_slot(MODEL):
+        assert limits.running == 1
+        with pytest.raises(ai_model_limits.ModelBusyError):
+            with ai_model_limits.model_slot(MODEL):
+                pass
+    assert limits.running == 0 and released == [0]
+
+    with ai_model_limits.model_slot(MODEL):
+        pass
+    # As duas fichas já foram usadas: a recusa informa quando a próxima chega
+    with pytest.raises(ai_model_limits.ModelBusyError) as busy:
+        with ai_model_limits.model_slot(MODEL):
+            pass
+    assert 0 < busy.value.retry_after <= 1 / limits.bucket.rate_per_second
+    assert limits.running == 0
+
+
+def test_analyze_returns_429_when_model_is_busy(limits, client):
+    limits.running = limits.concurrency
+    response = client.post("/api/v1/stocks/analyze/BUSY1", json={"model_id": MODEL, "mode": "agents"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_stream_returns_429_when_model_is_busy(limits, client):
+    limits.bucket._tokens = 0
+    response = client.get("/api/v1/stocks/analyze/BUSY2/stream", params={"model_id": MODEL, "mode": "agents"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_stream_holds_the_slot_until_the_end(limits):
+    async def consume():
+        running = []
+        async for _ in ai_service.stream_ai_analysis("SLOT", MODEL, "agents"):
+            running.append(limits.running)
+        return running
+
+    running = asyncio.run(consume())
+    assert running and set(running) == {1}
+    assert limits.running == 0
@@ -0,0 +1,82 @@
+# backend/tests/test_ai_stream.py
+
+import asyncio
+import json
+import random
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config.config import settings
+from src.routers import stock_routes
+from src.services import ai_service
+
+RAW_RESPONSES = [
+    "",
+    "Resumo simples sem logs.",
+    "  \n\nRunning:\n - get_analyst_recommendations(symbol=MSFT)\n\nRecomendação: compra.\n",
+    "transfer_task_to_finance_ai_agent(task=...)\nRunning: get_news\n\n| Data | Fonte |\n|---|---|\n",
+    "Texto antes Running: tool(x)\n\nTexto depois\ntransfer_task_to_finance_ai_agent\nfim\n",
+    "Início\nRunning: bloco que nunca termina\ntransfer_task_to_finance_ai_agent x\nresto",
+    "Running:Running:\n\n\n\nRunnin",
+    "transfer_task_to_finance_ai_agen",
+]
+
+
+def _split(text: str, rng: random.Random) -> list[str]:
+    cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(0, 8)))) if len(text) > 1 else []
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_stream_cleaner_matches_regex_for_any_split():
+    rng = random.Random(11)
+    for raw in RAW_RESPONSES:
+        expected = ai_service._clean_analysis(raw)
+        for _ in range(200):
+            cleaner = ai_service._StreamCleaner()
+            chunks = _split(raw, rng)
+            streamed = "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.finish()
+            assert streamed == expected, chunks
+        # Um caractere por vez
+        cleaner = ai_service._StreamCleaner()
+        assert "".join(cleaner.feed(c) for c in raw) + cleaner.finish() == expected
+
+
+def _failing_stream(monkeypatch):
+    async def stream(ticker, model_id, raw_parts):
+        raw_parts.append("Parte da análise")
+        yield "Parte da análise"
+        raise RuntimeError("conexão perdida")
+
+    monkeypatch.setattr(ai_service, "_stream_agents", stream)
+
+
+def test_stream_failure_after_partial_text_raises(monkeypatch):
+    _failing_stream(monkeypatch)
+
+    async def consume():
+        pieces = []
+        try:
+            async for piece in ai_service.stream_ai_analysis("MSFT", settings.AI_MODELS[0], "agents"):
+                pieces.append(piece)
+        except ai_service.AnalysisStreamError as e:
+            return pieces, str(e)
+        return pieces, None
+
+    pieces, error = asyncio.run(consume())
+    assert pieces == ["Parte da análise"]
+    assert "conexão perdida" in error
+
+
+def test_stream_route_sends_error_event(monkeypatch):
+    _failing_stream(monkeypatch)
+    app = FastAPI()
+    app.include_router(stock_routes.router)
+
+    with TestClient(app) as client:
+        response = client.get("/api/v1/stocks/analyze/MSFT/stream", params={"model_id": settings.AI_MODELS[0], "mode": "agents"})
+
+    events = [block.split("\n", 1) for block in response.text.strip().split("\n\n")]
+    assert [name for name, _ in events] == ["event: chunk", "event: error"]
+    assert json.loads(events[0][1].removeprefix("data: ")) == {"text": "Parte da análise"}
+    assert "conexão perdida" in json.loads(events[1][1].removeprefix("data: "))["detail"]
@@ -0,0 +1,25 @@
+# backend/tests/test_backtesting.py
+
+import numpy as np
+import pandas as pd
+
+from src.tools import backtesting
+
+
+def test_ema_cross_waits_for_the_slow_average():
+    # Alta desde a primeira barra: sem aquecimento a EMA rápida já estaria acima da lenta na barra 1
+    close = np.linspace(100.0, 200.0, 120)
+    combos = [{"fast": 5, "slow": 30}, {"fast": 10, "slow": 50}]
+    position = backtesting.positions(close, close, close, "ema_cross", combos)
+
+    for row, combo in zip(position, combos):
+        assert not row[:combo["slow"] - 1].any()
+        assert row[combo["slow"] - 1:].all()
+
+
+def test_ema_cross_matches_pandas_after_warmup():
+    close = 100 + np.cumsum(np.random.default_rng(5).normal(0, 1, 300))
+    fast = pd.Series(close).ewm(span=12, adjust=False, min_periods=12).mean()
+    slow = pd.Series(close).ewm(span=26, adjust=False, min_periods=26).mean()
+    position = backtesting.positions(close, close, close, "ema_cross", [{"fast": 12, "slow": 26}])
+    np.testing.assert_array_equal(position[0], (fast > slow).to_numpy(dtype=float))
@@ -0,0 +1,70 @@
+# backend/tests/test_downsampling.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tools import downsampling
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    return pd.DataFrame({
+        "Date": pd.date_range("2026-01-02 09:30", periods=rows, freq="1min", tz="America/New_York"),
+        "Open": close + rng.normal(0, 0.3, rows),
+        "High": close + rng.uniform(0.1, 2, rows),
+        "Low": close - rng.uniform(0.1, 2, rows),
+        "Close": close,
+        "Volume": rng.integers(100, 1_000, rows).astype(float),
+        "SMA_20": pd.Series(close).rolling(20).mean(),
+    })
+
+
+@pytest.mark.parametrize("rows, points", [(1_000, 100), (1_001, 3), (5_000, 777), (150, 149)])
+def test_lttb_keeps_endpoints_and_returns_requested_points(rows, points):
+    frame = _frame(rows)
+    result = downsampling.downsample(frame, points, "lttb")
+
+    assert len(result) == points
+    pd.testing.assert_series_equal(result.iloc[0], frame.iloc[0], check_names=False)
+    pd.testing.assert_series_equal(result.iloc[-1], frame.iloc[-1], check_names=False)
+    # Linhas reais, em ordem cronológica e sem repetição
+    assert result["Date"].is_monotonic_increasing and result["Date"].is_unique
+    assert result["Date"].isin(frame["Date"]).all()
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(1_000)
+    y[[137, 512, 901]] = [50, -40, 30]
+    indices = downsampling.lttb_indices(np.arange(1_000), y, 50)
+    assert {137, 512, 901} <= set(indices)
+
+
+@pytest.mark.parametrize("rows, points", [(1_000, 100), (1_003, 100), (250, 7)])
+def test_ohlc_buckets_preserve_extremes_and_volume(rows, points):
+    frame = _frame(rows)
+    result = downsampling.downsample(frame, points, "ohlc")
+    assert len(result) == points
+
+    starts = np.linspace(0, rows, points, endpoint=False).astype(np.int64)
+    for bucket, (start, end) in enumerate(zip(starts, list(starts[1:]) + [rows])):
+        bars = frame.iloc[start:end]
+        row = result.iloc[bucket]
+        assert row["Date"] == bars["Date"].iloc[0]
+        assert row["Open"] == bars["Open"].iloc[0]
+        assert row["High"] == bars["High"].max()
+        assert row["Low"] == bars["Low"].min()
+        assert row["Close"] == bars["Close"].iloc[-1]
+        assert row["Volume"] == pytest.approx(bars["Volume"].sum())
+
+    assert result["High"].max() == frame["High"].max() and result["Low"].min() == frame["Low"].min()
+    assert result["Volume"].sum() == pytest.approx(frame["Volume"].sum())
+
+
+def test_downsample_returns_short_series_unchanged():
+    frame = _frame(50)
+    assert downsampling.downsample(frame, 50, "ohlc") is frame
+    assert downsampling.downsample(frame, None, "lttb") is frame
+    with pytest.raises(ValueError):
+        downsampling.downsample(frame, 10, "mean")
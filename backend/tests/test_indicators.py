@@ -0,0 +1,134 @@
+# backend/tests/test_indicators.py
+#
+# O motor vetorizado (src/tools/indicators.py) comparado com implementações diretas em pandas.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tools import indicators
+
+
+@pytest.fixture
+def bars() -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    index = pd.date_range("2026-03-02 09:30", periods=300, freq="5min", tz="America/New_York")
+    close = 100 + np.cumsum(rng.normal(0, 0.5, len(index)))
+    high = close + rng.uniform(0, 1, len(index))
+    low = close - rng.uniform(0, 1, len(index))
+    open_ = close + rng.normal(0, 0.2, len(index))
+    volume = rng.integers(1_000, 10_000, len(index)).astype(float)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def _wilder(series: pd.Series, window: int) -> pd.Series:
+    return series.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+
+
+def _assert_series(actual: np.ndarray, expected: pd.Series) -> None:
+    np.testing.assert_allclose(actual, expected.to_numpy(dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_sma_and_ema_match_pandas(bars):
+    close = bars["Close"]
+    for window in (1, 5, 20, 299, 300):
+        _assert_series(indicators.sma(close.to_numpy(), window), close.rolling(window).mean())
+        _assert_series(indicators.ema(close.to_numpy(), window), close.ewm(span=window, adjust=False).mean())
+    assert np.isnan(indicators.sma(close.to_numpy(), 301)).all()
+
+
+def test_rolling_extremes_and_std_match_pandas(bars):
+    close = bars["Close"]
+    _assert_series(indicators.rolling_max(close.to_numpy(), 14), close.rolling(14).max())
+    _assert_series(indicators.rolling_min(close.to_numpy(), 14), close.rolling(14).min())
+    _assert_series(indicators.rolling_std(close.to_numpy(), 20), close.rolling(20).std(ddof=0))
+
+
+def test_rsi_matches_wilder_smoothing(bars):
+    close = bars["Close"]
+    delta = close.diff()
+    gain = _wilder(delta.clip(lower=0), 14)
+    loss = _wilder(-delta.clip(upper=0), 14)
+    _assert_series(indicators.rsi(close.to_numpy(), 14), 100 - 100 / (1 + gain / loss))
+
+
+def test_rsi_without_losses_is_100():
+    close = np.arange(1.0, 40.0)
+    out = indicators.rsi(close, 14)
+    assert np.isnan(out[:14]).all()
+    assert (out[14:] == 100.0).all()
+
+
+def test_macd_matches_pandas(bars):
+    close = bars["Close"]
+    line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = line.ewm(span=9, adjust=False).mean()
+    actual = indicators.macd(close.to_numpy(), 12, 26, 9)
+    for values, expected in zip(actual, (line, signal, line - signal)):
+        _assert_series(values, expected)
+
+
+def test_bollinger_matches_pandas(bars):
+    close = bars["Close"]
+    middle = close.rolling(20).mean()
+    deviation = close.rolling(20).std(ddof=0)
+    actual = indicators.bollinger(close.to_numpy(), 20, 2.5)
+    for values, expected in zip(actual, (middle + 2.5 * deviation, middle, middle - 2.5 * deviation)):
+        _assert_series(values, expected)
+
+
+def test_atr_matches_pandas(bars):
+    prev_close = bars["Close"].shift()
+    true_range = pd.concat([bars["High"] - bars["Low"], (bars["High"] - prev_close).abs(),
+                            (bars["Low"] - prev_close).abs()], axis=1).max(axis=1)
+    actual = indicators.atr(*(bars[c].to_numpy() for c in ("High", "Low", "Close")), 14)
+    _assert_series(actual, _wilder(true_range, 14))
+
+
+def test_vwap_restarts_each_session(bars):
+    typical = (bars["High"] + bars["Low"] + bars["Close"]) / 3
+    sessions = bars.index.normalize()
+    expected = ((typical * bars["Volume"]).groupby(sessions).cumsum()
+                / bars["Volume"].groupby(sessions).cumsum())
+    actual = indicators.vwap(*(bars[c].to_numpy() for c in ("High", "Low", "Close", "Volume")), sessions.asi8)
+    _assert_series(actual, expected)
+    # O primeiro valor de cada sessão é o preço típico da primeira barra
+    first = np.r_[True, sessions[1:] != sessions[:-1]]
+    _assert_series(actual[first], typical[first])
+
+
+def test_obv_matches_pandas(bars):
+    direction = np.sign(bars["Close"].diff().fillna(0))
+    expected = (direction * bars["Volume"]).cumsum()
+    _assert_series(indicators.obv(bars["Close"].to_numpy(), bars["Volume"].to_numpy()), expected)
+
+
+def test_padded_matrix_matches_each_series(bars):
+    # Séries de tamanhos diferentes alinhadas à direita com NaN à esquerda (screener e /data/batch)
+    series = [bars["Close"].to_numpy(), bars["Close"].to_numpy()[-120:] * 2, bars["Open"].to_numpy()[-15:]]
+    matrix = indicators.pad_series(series)
+    assert matrix.shape == (3, 300)
+    assert np.isnan(matrix[1, :180]).all() and np.isnan(matrix[2, :285]).all()
+
+    for window in (10, 20):
+        sma_matrix = indicators.sma(matrix, window)
+        ema_matrix = indicators.ema(matrix, window)
+        for row, values in enumerate(series):
+            n = len(values)
+            _assert_series(sma_matrix[row, -n:], pd.Series(values).rolling(window).mean())
+            _assert_series(ema_matrix[row, -n:], pd.Series(values).ewm(span=window, adjust=False).mean())
+            assert np.isnan(sma_matrix[row, :-n]).all() and np.isnan(ema_matrix[row, :-n]).all()
+
+    # Série mais curta que a janela: sem nenhum valor de SMA
+    assert np.isnan(indicators.sma(matrix, 20)[2]).all()
+
+
+def test_compute_builds_requested_columns(bars):
+    specs = indicators.parse_specs("sma_10,rsi_14,macd,bbands_20_2,atr,vwap,obv")
+    frame = indicators.compute(bars, specs, intraday=True)
+    assert frame.index.equals(bars.index)
+    assert list(frame.columns) == [c for spec in specs for c in indicators.column_names(*spec)]
+    _assert_series(frame["SMA_10"].to_numpy(), bars["Close"].rolling(10).mean())
+    # Em barras diárias cada barra é a própria sessão do VWAP: o valor é o preço típico
+    daily = indicators.compute(bars, indicators.parse_specs("vwap"), intraday=False)
+    _assert_series(daily["VWAP"].to_numpy(), (bars["High"] + bars["Low"] + bars["Close"]) / 3)
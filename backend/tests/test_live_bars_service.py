@@ -0,0 +1,28 @@
+# backend/tests/test_live_bars_service.py
+
+import asyncio
+
+import pytest
+
+from src.services import live_bars_service
+from src.utils import market_hours
+
+
+@pytest.mark.parametrize("ticker, market_open, refresh", [
+    ("AAPL", True, True),
+    ("AAPL", False, False),
+    ("BTC-USD", False, True),
+])
+def test_poll_forces_refresh_only_while_bars_can_change(monkeypatch, ticker, market_open, refresh):
+    calls = []
+
+    async def fetch_live_frame(*args):
+        calls.append(args)
+        return None
+
+    monkeypatch.setattr(live_bars_service, "fetch_live_frame", fetch_live_frame)
+    monkeypatch.setattr(market_hours, "is_market_open", lambda now=None: market_open)
+
+    poller = live_bars_service._TickerPoller(ticker, "1m")
+    asyncio.run(poller._poll())
+    assert calls[0][0] == ticker and calls[0][-1] is refresh
@@ -0,0 +1,83 @@
+# backend/tests/test_ohlcv_derivation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tools import market_data_providers, ohlcv_cache, yfinance_tool
+
+
+class FakeProvider(market_data_providers.MarketDataProvider):
+    """
+    Barras sintéticas de 1m e 5m (30 dias corridos, 24h por dia) e registro das chamadas.
+    """
+
+    def __init__(self):
+        end = pd.Timestamp.now(tz="UTC").floor("5min")
+        self.bars = {interval: self._bars(pd.date_range(end - pd.Timedelta(days=30), end, freq=freq))
+                     for interval, freq in (("1m", "1min"), ("5m", "5min"))}
+        self.calls = []
+
+    @staticmethod
+    def _bars(index: pd.DatetimeIndex) -> pd.DataFrame:
+        close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.1, len(index)))
+        return pd.DataFrame({"Open": close, "High": close + 0.05, "Low": close - 0.05, "Close": close,
+                             "Volume": np.full(len(index), 1000.0)}, index=index.rename("Datetime"))
+
+    def history(self, ticker, interval, period=None, start=None):
+        self.calls.append((interval, period, start))
+        bars = self.bars[interval]
+        if start is not None:
+            return bars[bars.index >= pd.Timestamp(start)]
+        return ohlcv_cache.slice_period(bars, period)
+
+    def download(self, tickers, interval, period=None, start=None):
+        return {t: self.history(t, interval, period, start) for t in tickers}
+
+    def info(self, ticker):
+        return {}
+
+    def news(self, ticker):
+        return []
+
+
+@pytest.fixture
+def provider():
+    fake = FakeProvider()
+    market_data_providers.set_provider(fake)
+    yield fake
+    market_data_providers.set_provider(None)
+
+
+def test_refresh_does_not_replace_longer_cache_with_derived_bars(provider):
+    ticker = "DERIV"
+    month = yfinance_tool.get_price_bars(ticker, "1mo", "5m")
+    yfinance_tool.get_price_bars(ticker, "5d", "1m")
+    before = ohlcv_cache.read(ticker, "5m")
+
+    # Pedido curto com refresh (como o do streaming ao vivo de 5m): busca incremental das barras de 5m
+    provider.calls.clear()
+    yfinance_tool.get_historical_frame(ticker, "5d", "5m", refresh=True)
+    assert [(interval, period) for interval, period, _ in provider.calls] == [("5m", None)]
+
+    bars, meta = ohlcv_cache.read(ticker, "5m")
+    assert "derived_from" not in meta
+    assert meta["covered_from"] == before[1]["covered_from"]
+    assert len(bars) >= len(before[0])
+
+    # O período longo continua servido do cache, sem novo download completo
+    provider.calls.clear()
+    again = yfinance_tool.get_price_bars(ticker, "1mo", "5m")
+    assert not [call for call in provider.calls if call[1] is not None]
+    assert len(again) >= len(month)
+
+
+def test_derives_when_no_downloaded_cache_exists(provider):
+    ticker = "DERIV2"
+    yfinance_tool.get_price_bars(ticker, "5d", "1m")
+
+    provider.calls.clear()
+    bars = yfinance_tool.get_price_bars(ticker, "5d", "5m")
+    assert bars is not None and not bars.empty
+    assert not [call for call in provider.calls if call[0] == "5m"]
+    assert ohlcv_cache.read(ticker, "5m")[1]["derived_from"] == "1m"
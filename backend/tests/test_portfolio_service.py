@@ -0,0 +1,47 @@
+# backend/tests/test_portfolio_service.py
+
+import numpy as np
+import pandas as pd
+
+from src.services import portfolio_service
+
+WINDOW = 20
+
+
+def _returns(rows: int, columns: list[str]) -> pd.DataFrame:
+    index = pd.date_range("2026-01-02", periods=rows, freq="B", tz="America/New_York")
+    values = np.random.default_rng(7).normal(0, 0.01, (rows, len(columns)))
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def _assert_window(returns: pd.DataFrame) -> None:
+    covariance = portfolio_service._window_covariance(returns, WINDOW, "1y", "1d")
+    np.testing.assert_allclose(covariance, np.cov(returns.tail(WINDOW).T), rtol=1e-9, atol=1e-15)
+
+
+def test_window_covariance_matches_numpy_across_updates():
+    full = _returns(120, ["AAA", "BBB", "^IDX"])
+
+    # Estado novo e barras novas somadas ao acumulador
+    _assert_window(full.iloc[:100])
+    _assert_window(full.iloc[:103])
+
+    # Barra em formação revista: o mesmo pregão com outro retorno
+    revised = full.iloc[:103].copy()
+    revised.iloc[-1] = [0.03, -0.02, 0.01]
+    _assert_window(revised)
+
+    # O pregão seguinte chega e a barra revista volta ao valor de fechamento
+    _assert_window(full.iloc[:104])
+
+    # Retornos anteriores ajustados (ex: dividendos): a janela é recalculada
+    adjusted = full.iloc[:110].copy()
+    adjusted.iloc[:-1, 0] *= 0.97
+    _assert_window(adjusted)
+
+
+def test_window_covariance_is_keyed_by_period():
+    returns = _returns(80, ["CCC", "DDD"])
+    portfolio_service._window_covariance(returns, WINDOW, "1y", "1d")
+    assert portfolio_service._trackers.get((("CCC", "DDD"), WINDOW, "1y", "1d")) is not None
+    _assert_window(returns)
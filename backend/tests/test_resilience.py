@@ -0,0 +1,201 @@
+# backend/tests/test_resilience.py
+
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+
+from src.config.config import settings
+from src.utils import resilience
+
+
+class _Clock:
+    """
+    Relógio controlado pelo teste no lugar de time.monotonic (só no módulo resilience).
+    """
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(resilience, "time", types.SimpleNamespace(monotonic=fake, sleep=time.sleep))
+    return fake
+
+
+def _upstream(name: str, threshold: int = 2, hedge_after: float = 0.0) -> resilience.Upstream:
+    upstream = resilience.Upstream(name, deadline=5.0, attempt_timeout=5.0, retries=0, hedge_after=hedge_after)
+    upstream.breaker = resilience.CircuitBreaker(name, threshold, reset_seconds=30.0)
+    return upstream
+
+
+def test_circuit_opens_at_threshold_and_probes_after_reset(clock):
+    upstream = _upstream("test-breaker", threshold=2)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError("falha")
+
+    for _ in range(2):
+        with pytest.raises(resilience.UpstreamError):
+            upstream.call(failing, hedge=False)
+    assert upstream.breaker.state == upstream.breaker.OPEN
+
+    # Recusada sem chamar a fonte
+    with pytest.raises(resilience.CircuitOpenError):
+        upstream.call(failing, hedge=False)
+    assert len(calls) == 2
+
+    clock.now += 29.9
+    with pytest.raises(resilience.CircuitOpenError):
+        upstream.call(failing, hedge=False)
+
+    # Passado o reset: uma única chamada de teste, que fecha o circuito se der certo
+    clock.now += 0.1
+    assert upstream.call(lambda: "ok", hedge=False) == "ok"
+    assert upstream.breaker.state == upstream.breaker.CLOSED
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = resilience.CircuitBreaker("test-probe", failure_threshold=1, reset_seconds=10.0)
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN and not breaker.allow()
+
+
+def test_cancelled_probe_is_released(clock):
+    upstream = _upstream("test-cancel", threshold=1)
+    upstream.breaker.record_failure()
+    clock.now += 30.0
+
+    async def run():
+        started = asyncio.Event()
+
+        async def never_finishes():
+            started.set()
+            await asyncio.Event().wait()
+
+        task = asyncio.create_task(upstream.call_async(never_finishes, hedge=False))
+        await started.wait()
+        assert upstream.breaker.state == upstream.breaker.HALF_OPEN
+        # A chamada de teste está em andamento: as demais são recusadas
+        with pytest.raises(resilience.CircuitOpenError):
+            await upstream.call_async(never_finishes, hedge=False)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    # O cancelamento não conta como falha e libera a vaga da chamada de teste
+    assert upstream.breaker.state == upstream.breaker.HALF_OPEN
+    assert upstream.breaker.allow()
+
+
+def test_guard_releases_probe_when_the_stream_is_closed_early(clock):
+    upstream = _upstream("test-guard", threshold=1)
+    upstream.breaker.record_failure()
+    clock.now += 30.0
+
+    async def consume():
+        async def stream():
+            with upstream.guard():
+                yield "a"
+                yield "b"
+
+        pieces = stream()
+        assert await anext(pieces) == "a"
+        await pieces.aclose()
+
+    asyncio.run(consume())
+    assert upstream.breaker.state == upstream.breaker.HALF_OPEN
+    assert upstream.breaker.allow()
+
+
+def test_hedge_delay_uses_recent_latencies():
+    upstream = _upstream("test-delay", hedge_after=0.5)
+    assert upstream.hedge_delay() == 0.5
+    upstream._latencies.extend(i / 100 for i in range(1, 101))
+    expected = sorted(upstream._latencies)[int(100 * settings.UPSTREAM_HEDGE_QUANTILE)]
+    assert upstream.hedge_delay() == expected
+    assert _upstream("test-no-hedge", hedge_after=0.0).hedge_delay() is None
+
+
+def test_hedge_fires_after_delay_and_the_fastest_success_wins():
+    upstream = _upstream("test-hedge-async", hedge_after=0.05)
+    attempts = []
+
+    async def run():
+        first_cancelled = asyncio.Event()
+
+        async def attempt():
+            attempts.append(asyncio.get_running_loop().time())
+            if len(attempts) == 1:
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    first_cancelled.set()
+                    raise
+            return "hedge"
+
+        result = await upstream.call_async(attempt)
+        await asyncio.wait_for(first_cancelled.wait(), 1)
+        return result
+
+    assert asyncio.run(run()) == "hedge"
+    assert len(attempts) == 2
+    # A segunda requisição só sai depois da espera do hedge
+    assert attempts[1] - attempts[0] >= 0.05
+
+
+def test_failed_hedge_does_not_win_over_a_later_success():
+    upstream = _upstream("test-hedge-error", hedge_after=0.01)
+
+    async def run():
+        release_first = asyncio.Event()
+        attempts = []
+
+        async def attempt():
+            attempts.append(1)
+            if len(attempts) == 1:
+                await release_first.wait()
+                return "first"
+            release_first.set()
+            raise ConnectionError("hedge falhou")
+
+        return await upstream.call_async(attempt)
+
+    assert asyncio.run(run()) == "first"
+    assert upstream.breaker.state == upstream.breaker.CLOSED
+
+
+def test_sync_hedge_returns_the_first_completed_call():
+    upstream = _upstream("test-hedge-sync", hedge_after=0.05)
+    release_first = threading.Event()
+    attempts = []
+    lock = threading.Lock()
+
+    def attempt():
+        with lock:
+            attempts.append(1)
+            number = len(attempts)
+        if number == 1:
+            release_first.wait(5)
+            return "first"
+        return "hedge"
+
+    try:
+        assert upstream.call(attempt) == "hedge"
+    finally:
+        release_first.set()
+    assert len(attempts) == 2
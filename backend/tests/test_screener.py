@@ -0,0 +1,66 @@
+# backend/tests/test_screener.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tools import screener, screener_specs
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("close.real > 1", "Construção não permitida"),
+    ("close[0] > 1", "Construção não permitida"),
+    ("lambda: close", "Construção não permitida"),
+    ("(lambda: 1)() > 0", "Função desconhecida"),
+    ("__import__('os').system('id')", "Função desconhecida"),
+    ("close > 'abc'", "Constante não permitida"),
+    ("close > True", "Constante não permitida"),
+    ("eval(close) > 1", "Função desconhecida"),
+    ("foo > 1", "Nome desconhecido"),
+    ("vwap > close", "Nome desconhecido"),
+    ("avg(volume, n=20) > 1", "Argumentos inválidos"),
+    ("avg(volume) > 1", "Argumentos inválidos"),
+    ("avg(volume, 0) > 1", "número de barras"),
+    ("max(high, 501) > close", "número de barras"),
+    ("prev(close, 2.5) > close", "número de barras"),
+    ("close >", "Erro de sintaxe"),
+    ("", "entre 1 e"),
+    ("close > 1 and " * 100 + "close > 1", "entre 1 e"),
+])
+def test_parse_expression_rejects_constructs_outside_the_grammar(expression, message):
+    with pytest.raises(ValueError, match=message):
+        screener_specs.parse_expression(expression)
+
+
+def test_parse_expression_accepts_the_grammar():
+    tree = screener_specs.parse_expression("close > SMA_20 and volume > 2 × avg(volume, 20) or not rsi_14 < 30")
+    assert screener_specs.referenced_names(tree) == ["close", "SMA_20", "volume", "RSI_14"]
+    assert screener_specs.indicator_specs(tree) == [("sma", (20,)), ("rsi", (14,))]
+    assert screener_specs.resolve_name("macd_signal") == ("indicator", ("macd", (12, 26, 9)), "MACD_SIGNAL_12_26_9")
+
+
+def _bars(close: np.ndarray, volume: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": volume})
+
+
+def test_screen_filters_on_the_latest_bar():
+    flat_volume = np.full(60, 1_000.0)
+    spike_volume = np.r_[flat_volume[:-1], 5_000.0]
+    rising = np.linspace(50, 80, 60)
+    falling = np.linspace(80, 50, 60)
+
+    tickers, matrices = screener.stack_bars({
+        "UPVOL": _bars(rising, spike_volume),     # acima da média e com volume > 2× a média: aprovado
+        "UP": _bars(rising, flat_volume),         # sem pico de volume
+        "DOWN": _bars(falling, spike_volume),     # abaixo da média
+        "SHORT": _bars(rising[-10:], spike_volume[-10:]),  # histórico menor que a janela (NaN à esquerda)
+    })
+    expression = "close > SMA_20 and volume > 2 × avg(volume, 20)"
+    matches = screener.screen(tickers, matrices, expression, rank_by="change(close, 5)")
+
+    assert [m["ticker"] for m in matches] == ["UPVOL"]
+    match = matches[0]
+    assert match["close"] == 80.0
+    assert match["values"]["SMA_20"] == pytest.approx(rising[-20:].mean())
+    assert match["values"]["volume"] == 5_000.0
+    assert match["rank_value"] == pytest.approx(80.0 / rising[-6] - 1.0)
@@ -0,0 +1,26 @@
+# backend/tests/test_warmup_scheduler.py
+
+import asyncio
+
+from src.config.config import settings
+from src.services import warmup_scheduler
+
+
+def _started(monkeypatch, **overrides) -> bool:
+    monkeypatch.setattr(settings, "WARMUP_TICKERS", ["AAPL"])
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+
+    async def start():
+        warmup_scheduler.start()
+        started = warmup_scheduler._task is not None
+        await warmup_scheduler.shutdown()
+        return started
+
+    return asyncio.run(start())
+
+
+def test_start_validates_times_and_models(monkeypatch):
+    assert _started(monkeypatch, WARMUP_ANALYSIS_MODELS=settings.AI_MODELS[:1])
+    assert not _started(monkeypatch, WARMUP_TIMES=["25:00"])
+    assert not _started(monkeypatch, WARMUP_ANALYSIS_MODELS=[settings.AI_MODELS[0], "modelo-inexistente"])
@@ -9,7 +9,11 @@ const API_BASE_URL = 'http://localhost:8000';
 // substitua 'localhost' pelo IP da sua máquina na rede local (ex: 'http://192.168.1.100:8000')
 // Em produção, esta URL seria a URL do seu backend online.
 
+// Número máximo de pontos pedidos para os gráficos (séries maiores são reduzidas no backend)
+const CHART_MAX_POINTS = 1000;
+
 
 export {
-  API_BASE_URL
+  API_BASE_URL,
+  CHART_MAX_POINTS
 };
\ No newline at end of file
@@ -1,7 +1,8 @@
 import React, { useState } from 'react';
 import styles from './StockAnalysisPage.module.css';
 
-import { getHistoricalData, getAIAnalysis, getCompanyInfo } from '../../services/api';
+import { getHistoricalData, streamAIAnalysis, getCompanyInfo } from '../../services/api';
+import { CHART_MAX_POINTS } from '../../constants/config';
 
 import LoadingIndicator from '../../components/LoadingIndicator/LoadingIndicator';
 import AnalysisDisplay from '../../components/AnalysisDisplay/AnalysisDisplay';
@@ -62,7 +63,7 @@ const StockAnalysisPage = () => {
     let aiAnalysisPromise = null;
 
     try {
-        historicalDataPromise = getHistoricalData(ticker);
+        historicalDataPromise = getHistoricalData(ticker, { points: CHART_MAX_POINTS });
 
         companyInfoPromise = getCompanyInfo(ticker);
 
@@ -81,7 +82,8 @@ const StockAnalysisPage = () => {
         }
 
         if (isAIEnabled && selectedModel) {
-             aiAnalysisPromise = getAIAnalysis(ticker, selectedModel);
+             // A análise chega em streaming: o card é atualizado a cada pedaço recebido
+             aiAnalysisPromise = streamAIAnalysis(ticker, selectedModel, (partialText) => setAiAnalysis(partialText));
         } else {
              aiAnalysisPromise = Promise.resolve({ ai_analysis: "Análise de IA desabilitada nas configurações." });
         }
@@ -106,9 +108,15 @@ const StockAnalysisPage = () => {
                  setCompanyInfo(null);
             }
 
+            // Dados e informações prontos: libera a tela enquanto a análise de IA continua chegando
+            setLoading(false);
+
             try {
                 const aiResult = await aiAnalysisPromise;
-                setAiAnalysis(aiResult.ai_analysis);
+                // Falha no meio do stream: mantém o texto parcial e acrescenta o erro ao final
+                setAiAnalysis(aiResult.error
+                    ? `${aiResult.ai_analysis}\n\nErro ao obter análise de IA: ${aiResult.error}`
+                    : aiResult.ai_analysis);
 
             } catch (aiError) {
                  console.error("Erro durante a chamada ou processamento da API de IA:", aiError);
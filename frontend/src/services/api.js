@@ -14,16 +14,18 @@ const api = axios.create({
  * Corresponde ao endpoint GET /api/v1/stocks/data/{ticker}
  *
  * @param {string} ticker O símbolo do ticker da ação.
+ * @param {object} [options] Parâmetros opcionais da consulta: period, interval, start, end,
+ * points (número máximo de pontos, reduzidos no servidor) e downsample ('lttb' ou 'ohlc').
  * @returns {Promise<object|null>} Uma Promise que resolve com um objeto contendo
  * 'historical_data' (array), ou null em caso de erro 404.
  * @throws {Error} Lança um erro se a requisição falhar por outros motivos (rede, servidor 5xx).
  */
-const getHistoricalData = async (ticker) => {
+const getHistoricalData = async (ticker, options = {}) => {
   try {
     const endpoint = `/api/v1/stocks/data/${ticker}`;
-    console.log(`Chamando API (Dados Históricos): ${API_BASE_URL}${endpoint}`);
+    console.log(`Chamando API (Dados Históricos): ${API_BASE_URL}${endpoint}`, options);
 
-    const response = await api.get(endpoint);
+    const response = await api.get(endpoint, { params: options });
 
     console.log("Resposta da API (Dados Históricos) recebida:", response.data);
 
@@ -55,6 +57,42 @@ const getHistoricalData = async (ticker) => {
 };
 
 
+/**
+ * Busca dados históricos de vários tickers em uma única requisição.
+ * Corresponde ao endpoint POST /api/v1/stocks/data/batch
+ *
+ * @param {Array<string>} tickers Os símbolos dos tickers (ex: ["AAPL", "MSFT"]).
+ * @param {string} [period="6mo"] O período dos dados históricos.
+ * @returns {Promise<object>} Uma Promise que resolve com um objeto contendo
+ * 'historical_data' (objeto ticker -> array) e 'not_found' (array de tickers sem dados).
+ * @throws {Error} Lança um erro se a requisição falhar (rede, servidor 4xx/5xx).
+ */
+const getHistoricalDataBatch = async (tickers, period = '6mo') => {
+  try {
+    const endpoint = '/api/v1/stocks/data/batch';
+    console.log(`Chamando API (Dados Históricos em Lote): ${API_BASE_URL}${endpoint} para ${tickers.length} tickers`);
+
+    const response = await api.post(endpoint, { tickers, period });
+
+    console.log("Resposta da API (Dados Históricos em Lote) recebida:", response.data);
+
+    return response.data; // Deve conter { historical_data: {...}, not_found: [...] }
+
+  } catch (error) {
+    console.error("Erro na chamada da API (Dados Históricos em Lote):", error);
+
+    if (error.response) {
+      const errorMessage = error.response.data.detail || `Erro da API (Dados Históricos em Lote): Status ${error.response.status}`;
+      throw new Error(errorMessage);
+    } else if (error.request) {
+      throw new Error("Erro de conexão com o backend ao buscar dados históricos em lote.");
+    } else {
+      throw new Error(`Erro ao processar requisição de dados históricos em lote: ${error.message}`);
+    }
+  }
+};
+
+
 /**
  * Busca a análise de IA para um dado ticker, usando um modelo LLM específico.
  * Corresponde ao endpoint POST /api/v1/stocks/analyze/{ticker}
@@ -104,6 +142,105 @@ const getAIAnalysis = async (ticker, modelId) => {
 };
 
 
+/**
+ * Recebe a análise de IA em streaming (Server-Sent Events), atualizando o texto a cada pedaço.
+ * Corresponde ao endpoint GET /api/v1/stocks/analyze/{ticker}/stream
+ *
+ * @param {string} ticker O símbolo do ticker da ação.
+ * @param {string} modelId O ID do modelo LLM Groq a ser usado.
+ * @param {function(string): void} onText Chamada a cada pedaço recebido, com o texto acumulado até o momento.
+ * @returns {Promise<object>} Uma Promise que resolve, ao final do stream, com um objeto contendo 'ai_analysis' (string)
+ *                            e, se a geração falhou depois de parte do texto chegar, 'error' (string).
+ * @throws {Error} Lança um erro se a conexão com o stream falhar ou se a geração falhar antes de qualquer texto.
+ */
+const streamAIAnalysis = (ticker, modelId, onText) => {
+  if (!modelId) {
+    console.warn("Tentativa de chamar streamAIAnalysis sem modelId.");
+    return Promise.reject(new Error("ID do modelo de IA não especificado."));
+  }
+
+  const endpoint = `/api/v1/stocks/analyze/${ticker}/stream?model_id=${encodeURIComponent(modelId)}`;
+  console.log(`Chamando API (Análise IA em Streaming): ${API_BASE_URL}${endpoint}`);
+
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}${endpoint}`);
+    let text = '';
+
+    source.addEventListener('chunk', (event) => {
+      text += JSON.parse(event.data).text;
+      if (onText) onText(text);
+    });
+
+    source.addEventListener('done', () => {
+      source.close(); // Fecha explicitamente: o EventSource reconectaria sozinho
+      resolve({ ai_analysis: text });
+    });
+
+    // Recebe tanto o evento "error" enviado pelo backend (com data) quanto as falhas de conexão (sem data)
+    source.addEventListener('error', (event) => {
+      source.close();
+      if (event.data) {
+        const detail = JSON.parse(event.data).detail;
+        console.error("Erro na geração da análise de IA:", detail);
+        // Mantém o texto parcial já recebido separado da mensagem de erro
+        if (text) {
+          resolve({ ai_analysis: text, error: detail });
+        } else {
+          reject(new Error(detail));
+        }
+        return;
+      }
+
+      console.error("Erro no stream da API (Análise IA):", event);
+      // Se parte do texto já chegou, entrega o que foi recebido
+      if (text) {
+        resolve({ ai_analysis: text });
+      } else {
+        reject(new Error("Erro de conexão com o backend ao buscar análise de IA."));
+      }
+    });
+  });
+};
+
+
+/**
+ * Abre a conexão WebSocket de barras ao vivo e inscreve os tickers informados.
+ * Corresponde ao endpoint WebSocket /api/v1/stocks/live
+ *
+ * @param {string[]} tickers Os símbolos dos tickers.
+ * @param {object} options { interval: '1m', indicators: 'sma_20,ema_20' } (opcionais).
+ * @param {function(object): void} onMessage Chamada a cada mensagem ("snapshot", "bars" ou "error").
+ * @returns {object} { subscribe(tickers), unsubscribe(tickers), close() } para controlar a conexão.
+ */
+const openLiveBars = (tickers, { interval = '1m', indicators } = {}, onMessage) => {
+  const url = `${API_BASE_URL.replace(/^http/, 'ws')}/api/v1/stocks/live`;
+  console.log(`Conectando (Barras ao Vivo): ${url}`);
+
+  const socket = new WebSocket(url);
+  const send = (message) => {
+    if (socket.readyState === WebSocket.OPEN) {
+      socket.send(JSON.stringify(message));
+    } else {
+      socket.addEventListener('open', () => socket.send(JSON.stringify(message)), { once: true });
+    }
+  };
+
+  socket.onmessage = (event) => {
+    if (onMessage) onMessage(JSON.parse(event.data));
+  };
+  socket.onerror = (error) => {
+    console.error("Erro na conexão de barras ao vivo:", error);
+  };
+
+  const subscribe = (symbols) => send({ action: 'subscribe', tickers: symbols, interval, indicators });
+  const unsubscribe = (symbols) => send({ action: 'unsubscribe', tickers: symbols, interval });
+
+  if (tickers && tickers.length) subscribe(tickers);
+
+  return { subscribe, unsubscribe, close: () => socket.close() };
+};
+
+
 /**
  * Busca informações básicas da empresa para um dado ticker.
  * Corresponde ao endpoint GET /api/v1/stocks/info/{ticker}
@@ -150,9 +287,12 @@ const getCompanyInfo = async (ticker) => {
 };
 
 
-// Exporta as TRES funções
+// Exporta as funções da API
 export {
   getHistoricalData,
+  getHistoricalDataBatch,
   getAIAnalysis,
+  streamAIAnalysis,
+  openLiveBars,
   getCompanyInfo // --- NOVO: Exporta a nova função ---
 };
\ No newline at end of file